@@ -87,6 +87,7 @@ TIER_FILE="$AIX_DIR/tier.yaml"
 MANIFEST_FILE="$AIX_DIR/manifest.json"
 MANIFEST_TOOL="$AIX_FRAMEWORK/scripts/aix-manifest.py"
 GENERATOR="$AIX_FRAMEWORK/scripts/aix-generate.py"
+TIER_TOOL="$AIX_FRAMEWORK/scripts/aix_tier.py"
 SOURCE_ADAPTER_DIR="$AIX_FRAMEWORK/adapters/$ADAPTER_DIR"
 DEST_ADAPTER_DIR="$AIX_DIR/adapters/$ADAPTER_KEY"
 
@@ -121,37 +122,11 @@ if [ -n "$MODEL_SET" ] && [ ! -f "$DEST_ADAPTER_DIR/model-sets/$MODEL_SET.yaml"
     exit 1
 fi
 
-python3 - "$TIER_FILE" "$ADAPTER_KEY" "$MODEL_SET" << 'PY'
-import sys
-from pathlib import Path
-
-try:
-    import yaml
-except Exception as exc:
-    raise SystemExit(f"PyYAML is required to update tier.yaml: {exc}")
-
-tier_file = Path(sys.argv[1])
-adapter = sys.argv[2]
-model_set = sys.argv[3]
-
-data = yaml.safe_load(tier_file.read_text()) or {}
-adapters = data.get("adapters")
-if not isinstance(adapters, dict):
-    adapters = {}
-
-entry = adapters.get(adapter)
-if not isinstance(entry, dict):
-    entry = {}
-
-entry["enabled"] = True
-if model_set:
-    entry["model_set"] = model_set
-
-adapters[adapter] = entry
-data["adapters"] = adapters
-
-tier_file.write_text(yaml.safe_dump(data, sort_keys=False))
-PY
+if [ -n "$MODEL_SET" ]; then
+    python3 "$TIER_TOOL" --file "$TIER_FILE" set-adapter "$ADAPTER_KEY" --model-set "$MODEL_SET"
+else
+    python3 "$TIER_TOOL" --file "$TIER_FILE" set-adapter "$ADAPTER_KEY"
+fi
 
 if [ -f "$MANIFEST_TOOL" ]; then
     python3 "$MANIFEST_TOOL" init \
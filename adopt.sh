@@ -1,6 +1,7 @@
 #!/bin/bash
 # Adopt individual capabilities from higher tiers without full upgrade
-# Usage: ~/tools/aix/adopt.sh <capability-name>
+# Usage: ~/tools/aix/adopt.sh <capability-name> [<capability-name>...]
+#        ~/tools/aix/adopt.sh --tier <n> [--type <type>]
 #        ~/tools/aix/adopt.sh --list
 
 set -e
@@ -8,15 +9,7 @@ set -e
 AIX_FRAMEWORK="${AIX_FRAMEWORK:-$HOME/tools/aix}"
 REPO_ROOT="$(git rev-parse --show-toplevel 2>/dev/null || pwd)"
 AIX_DIR="$REPO_ROOT/.aix"
-TIER_FILE="$AIX_DIR/tier.yaml"
-MANIFEST_TOOL="$AIX_FRAMEWORK/scripts/aix-manifest.py"
-MANIFEST_FILE="$AIX_DIR/manifest.json"
-
-if git -C "$AIX_FRAMEWORK" rev-parse --git-dir > /dev/null 2>&1; then
-    AIX_VERSION="$(git -C "$AIX_FRAMEWORK" rev-parse --short HEAD)"
-else
-    AIX_VERSION="unknown"
-fi
+ADOPT_TOOL="$AIX_FRAMEWORK/scripts/aix-adopt.py"
 
 # Colors
 RED='\033[0;31m'
@@ -31,138 +24,22 @@ if [ ! -d "$AIX_DIR" ]; then
     exit 1
 fi
 
-# Get current tier
-if [ -f "$TIER_FILE" ]; then
-    CURRENT_TIER=$(grep "^tier:" "$TIER_FILE" | cut -d' ' -f2)
-else
-    CURRENT_TIER=0
-fi
-
-# Capability registry (tab-delimited)
+# Capability registry (tab-delimited, compiled and indexed by aix-registry.py)
 # Columns: name  tier  type  subpath  notes
 REGISTRY_FILE="$AIX_FRAMEWORK/registry.tsv"
-declare -a CAPABILITIES=()
-
-load_capabilities() {
-    CAPABILITIES=()
-    if [ -f "$REGISTRY_FILE" ]; then
-        while IFS=$'	' read -r cap_name cap_tier cap_type cap_subpath cap_notes; do
-            if [ -z "$cap_name" ] || [[ "$cap_name" == \#* ]] || [ "$cap_name" = "name" ]; then
-                continue
-            fi
-            CAPABILITIES+=("$cap_name:$cap_tier:$cap_type:$cap_subpath")
-        done < "$REGISTRY_FILE"
-        return 0
-    fi
-
-    # Fallback registry (kept for compatibility)
-    CAPABILITIES=(
-        # Tier 1 - Sprout
-        "test:1:skill:skills/test"
-        "commit:1:skill:skills/commit"
-        "tester:1:role:roles/tester.md"
-        "docs:1:role:roles/docs.md"
-        "architecture-guardrails:1:docs:docs/architecture"
-        "quick-fix:1:workflow:workflows/quick-fix.md"
-        "pre-commit:1:hook:hooks/pre-commit"
-
-        # Tier 2 - Grow
-        "agent-browser:2:skill:skills/agent-browser"
-        "security-audit:2:skill:skills/security-audit"
-        "quality-audit:2:skill:skills/quality-audit"
-        "performance-audit:2:skill:skills/performance-audit"
-        "wrap-up:2:skill:skills/wrap-up"
-        "promote:2:skill:skills/promote"
-        "pr-merged:2:skill:skills/pr-merged"
-        "deploy:2:skill:skills/deploy"
-        "triage:2:role:roles/triage.md"
-        "orchestrator:2:role:roles/orchestrator.md"
-        "feature:2:workflow:workflows/feature.md"
-        "refactor:2:workflow:workflows/refactor.md"
-        "ci-node:2:ci:ci/ci-node.yml"
-        "ci-python:2:ci:ci-python.yml"
-        "ci-go:2:ci:ci-go.yml"
-
-        # Tier 3 - Scale
-        "reflect:3:skill:skills/reflect"
-        "accessibility-audit:3:skill:skills/accessibility-audit"
-        "privacy-audit:3:skill:skills/privacy-audit"
-        "cognitive-audit:3:skill:skills/cognitive-audit"
-        "delight-audit:3:skill:skills/delight-audit"
-        "resilience-audit:3:skill:skills/resilience-audit"
-        "debug:3:role:roles/debug.md"
-        "product-designer:3:role:roles/product-designer.md"
-        "validate-bash:3:hook:hooks/validate-bash.sh"
-        "worktree-setup:3:script:scripts/worktree-setup.sh"
-        "worktree-cleanup:3:script:scripts/worktree-cleanup.sh"
-    )
-}
-
-copy_tree_if_missing() {
-    local src="$1"
-    local dest="$2"
-
-    if [ -f "$src" ]; then
-        if [ ! -f "$dest" ]; then
-            mkdir -p "$(dirname "$dest")"
-            cp "$src" "$dest"
-        fi
-        return 0
-    fi
-
-    if [ -d "$src" ]; then
-        find "$src" -type f | while read -r file; do
-            local rel="${file#$src/}"
-            local target="$dest/$rel"
-            if [ ! -f "$target" ]; then
-                mkdir -p "$(dirname "$target")"
-                cp "$file" "$target"
-            fi
-        done
-        return 0
-    fi
-
-    return 1
-}
-
-init_manifest() {
-    if [ -f "$MANIFEST_TOOL" ]; then
-        python3 "$MANIFEST_TOOL" init \
-            --manifest "$MANIFEST_FILE" \
-            --aix-version "$AIX_VERSION"
-    fi
-}
+REGISTRY_TOOL="$AIX_FRAMEWORK/scripts/aix-registry.py"
 
-record_manifest_file() {
-    local source_path="$1"
-    local dest_path="$2"
-    local capability="$3"
-    if [ -f "$MANIFEST_TOOL" ]; then
-        python3 "$MANIFEST_TOOL" record \
-            --manifest "$MANIFEST_FILE" \
-            --repo-root "$REPO_ROOT" \
-            --framework-root "$AIX_FRAMEWORK" \
-            --source "$source_path" \
-            --dest "$dest_path" \
-            --capability "$capability" \
-            --aix-version "$AIX_VERSION"
-    fi
-}
+if [ ! -f "$REGISTRY_FILE" ] || [ ! -f "$REGISTRY_TOOL" ]; then
+    echo -e "${RED}Error: capability registry not found at $REGISTRY_FILE${NC}"
+    exit 1
+fi
 
-record_manifest_dir() {
-    local source_root="$1"
-    local dest_root="$2"
-    local capability="$3"
-    if [ -f "$MANIFEST_TOOL" ]; then
-        python3 "$MANIFEST_TOOL" record-dir \
-            --manifest "$MANIFEST_FILE" \
-            --repo-root "$REPO_ROOT" \
-            --framework-root "$AIX_FRAMEWORK" \
-            --source-root "$source_root" \
-            --dest-root "$dest_root" \
-            --capability "$capability" \
-            --aix-version "$AIX_VERSION"
-    fi
+# Query the registry; rows are: name  tier  type  subpath  installed(yes|no)
+registry() {
+    python3 "$REGISTRY_TOOL" \
+        --framework-root "$AIX_FRAMEWORK" \
+        --repo-root "$REPO_ROOT" \
+        "$@"
 }
 
 # List available capabilities
@@ -171,10 +48,8 @@ list_capabilities() {
     echo ""
 
     local last_tier=""
-    local cap_name cap_tier cap_type cap_subpath
-    for cap in "${CAPABILITIES[@]}"; do
-        IFS=':' read -r cap_name cap_tier cap_type cap_subpath <<< "$cap"
-
+    local cap_name cap_tier cap_type cap_subpath cap_installed
+    while IFS=$'\t' read -r cap_name cap_tier cap_type cap_subpath cap_installed; do
         # Print tier header
         if [ "$cap_tier" != "$last_tier" ]; then
             case $cap_tier in
@@ -187,254 +62,53 @@ list_capabilities() {
 
         # Check if already adopted
         local status=""
-        if is_adopted "$cap_name"; then
+        if [ "$cap_installed" = "yes" ]; then
             status="${GREEN}[adopted]${NC}"
         fi
 
         printf "  %-25s %-10s %s\n" "$cap_name" "($cap_type)" "$status"
-    done
+    done < <(registry list)
 
     echo ""
-    echo "Usage: $0 <capability-name>"
-    echo "Example: $0 agent-browser"
-}
-
-# Check if capability is already adopted
-is_adopted() {
-    local name="$1"
-    local cap_name cap_tier cap_type cap_subpath
-
-    # Check tier.yaml for adopted list
-    if [ -f "$TIER_FILE" ] && grep -q "^  - $name$" "$TIER_FILE" 2>/dev/null; then
-        return 0
-    fi
-
-    # Check if files exist
-    for cap in "${CAPABILITIES[@]}"; do
-        IFS=':' read -r cap_name cap_tier cap_type cap_subpath <<< "$cap"
-        if [ "$cap_name" = "$name" ]; then
-            case $cap_type in
-                skill)
-                    [ -d "$AIX_DIR/skills/$(basename "$cap_subpath")" ] && return 0
-                    ;;
-                role)
-                    [ -f "$AIX_DIR/roles/$(basename "$cap_subpath")" ] && return 0
-                    ;;
-                workflow)
-                    [ -f "$AIX_DIR/workflows/$(basename "$cap_subpath")" ] && return 0
-                    ;;
-                hook)
-                    [ -f "$AIX_DIR/hooks/$(basename "$cap_subpath")" ] && return 0
-                    ;;
-                ci)
-                    [ -f "$AIX_DIR/ci/$(basename "$cap_subpath")" ] && return 0
-                    ;;
-                script)
-                    [ -f "$AIX_DIR/scripts/$(basename "$cap_subpath")" ] && return 0
-                    ;;
-                docs)
-                    [ -e "$REPO_ROOT/$cap_subpath" ] && return 0
-                    ;;
-            esac
-        fi
-    done
-
-    return 1
-}
-
-# Find capability info
-find_capability() {
-    local name="$1"
-    for cap in "${CAPABILITIES[@]}"; do
-        IFS=':' read -r cap_name tier type subpath <<< "$cap"
-        if [ "$cap_name" = "$name" ]; then
-            echo "$tier:$type:$subpath"
-            return 0
-        fi
-    done
-    return 1
-}
-
-# Get tier name
-get_tier_name() {
-    case $1 in
-        0) echo "seed" ;;
-        1) echo "sprout" ;;
-        2) echo "grow" ;;
-        3) echo "scale" ;;
-        *) echo "unknown" ;;
-    esac
-}
-
-# Adopt a capability
-adopt_capability() {
-    local name="$1"
-
-    # Find capability
-    local info
-    info=$(find_capability "$name") || {
-        echo -e "${RED}Error: Unknown capability '$name'${NC}"
-        echo "Run '$0 --list' to see available capabilities."
-        exit 1
-    }
-
-    local cap_tier cap_type cap_subpath
-    IFS=':' read -r cap_tier cap_type cap_subpath <<< "$info"
-    local tier_name=$(get_tier_name "$cap_tier")
-    local source_dir="$AIX_FRAMEWORK/tiers/$cap_tier-$tier_name"
-    local source_path="$source_dir/$cap_subpath"
-
-    # Check if already adopted
-    if is_adopted "$name"; then
-        echo -e "${YELLOW}Capability '$name' is already adopted.${NC}"
-        exit 0
-    fi
-
-    echo -e "${CYAN}Adopting '$name' from Tier $cap_tier ($tier_name)...${NC}"
-    echo "  Type: $cap_type"
-    echo "  Source: $source_path"
-    echo ""
-
-    # Verify source exists
-    if [ ! -e "$source_path" ]; then
-        echo -e "${RED}Error: Source not found at $source_path${NC}"
-        exit 1
-    fi
-
-    # Copy based on type
-    case $cap_type in
-        skill)
-            local skill_name=$(basename "$cap_subpath")
-            local dest_dir="$AIX_DIR/skills/$skill_name"
-            echo "  Copying skill to $dest_dir..."
-            mkdir -p "$dest_dir"
-            cp -r "$source_path/"* "$dest_dir/"
-            record_manifest_dir "$source_path" "$dest_dir" "$name"
-            echo -e "  ${GREEN}✓ Skill copied${NC}"
-
-            # Symlink is already set up by bootstrap (.claude/skills -> .aix/skills)
-            echo -e "  ${GREEN}✓ Skill available via .claude/skills/${NC}"
-            ;;
-
-        role)
-            local role_file=$(basename "$cap_subpath")
-            local dest_file="$AIX_DIR/roles/$role_file"
-            echo "  Copying role to $dest_file..."
-            cp "$source_path" "$dest_file"
-            record_manifest_file "$source_path" "$dest_file" "$name"
-            echo -e "  ${GREEN}✓ Role copied${NC}"
-
-            # Symlink is already set up by bootstrap (.claude/agents -> .aix/roles)
-            echo -e "  ${GREEN}✓ Role available via .claude/agents/${NC}"
-            ;;
-
-        workflow)
-            local workflow_file=$(basename "$cap_subpath")
-            local dest_file="$AIX_DIR/workflows/$workflow_file"
-            echo "  Copying workflow to $dest_file..."
-            cp "$source_path" "$dest_file"
-            record_manifest_file "$source_path" "$dest_file" "$name"
-            echo -e "  ${GREEN}✓ Workflow copied${NC}"
-            ;;
-
-        hook)
-            local hook_file=$(basename "$cap_subpath")
-            local dest_file="$AIX_DIR/hooks/$hook_file"
-            echo "  Copying hook to $dest_file..."
-            mkdir -p "$AIX_DIR/hooks"
-            cp "$source_path" "$dest_file"
-            chmod +x "$dest_file"
-            record_manifest_file "$source_path" "$dest_file" "$name"
-            echo -e "  ${GREEN}✓ Hook copied${NC}"
-            echo -e "  ${YELLOW}Note: Ensure .claude/settings.json references hooks${NC}"
-            ;;
-
-        ci)
-            local ci_file=$(basename "$cap_subpath")
-            local dest_file="$AIX_DIR/ci/$ci_file"
-            echo "  Copying CI template to $dest_file..."
-            mkdir -p "$AIX_DIR/ci"
-            cp "$source_path" "$dest_file"
-            record_manifest_file "$source_path" "$dest_file" "$name"
-            echo -e "  ${GREEN}✓ CI template copied${NC}"
-            echo -e "  ${YELLOW}Note: Copy to .github/workflows/ to activate${NC}"
-            ;;
-
-        docs)
-            local rel_path="${cap_subpath#docs/}"
-            local dest_dir="$REPO_ROOT/docs/$rel_path"
-            echo "  Copying docs to $dest_dir..."
-            copy_tree_if_missing "$source_path" "$dest_dir"
-            record_manifest_dir "$source_path" "$dest_dir" "$name"
-            echo -e "  ${GREEN}✓ Docs copied${NC}"
-            ;;
-
-        script)
-            local script_file=$(basename "$cap_subpath")
-            local dest_file="$AIX_DIR/scripts/$script_file"
-            echo "  Copying script to $dest_file..."
-            mkdir -p "$AIX_DIR/scripts"
-            cp "$source_path" "$dest_file"
-            chmod +x "$dest_file"
-            record_manifest_file "$source_path" "$dest_file" "$name"
-            echo -e "  ${GREEN}✓ Script copied${NC}"
-            ;;
-    esac
-
-    # Update tier.yaml to track adopted capabilities
-    echo ""
-    echo "  Updating tier.yaml..."
-
-    # Add adopted section if not present
-    if ! grep -q "^adopted:" "$TIER_FILE" 2>/dev/null; then
-        echo "" >> "$TIER_FILE"
-        echo "adopted:" >> "$TIER_FILE"
-    fi
-
-    # Add capability to adopted list
-    echo "  - $name" >> "$TIER_FILE"
-    echo -e "  ${GREEN}✓ Tracked in tier.yaml${NC}"
-
-    echo ""
-    echo -e "${GREEN}✅ Successfully adopted '$name'${NC}"
-
-    # Type-specific post-install notes
-    case $cap_type in
-        skill)
-            echo ""
-            echo "To use this skill:"
-            echo "  /$name"
-            ;;
-        role)
-            echo ""
-            echo "This role is now available for Task tool delegation:"
-            echo "  subagent_type: \"$(basename "$cap_subpath" .md)\""
-            ;;
-    esac
+    echo "Usage: $0 <capability-name> [<capability-name>...]"
+    echo "Example: $0 agent-browser tester"
 }
 
 # Main
-init_manifest
-load_capabilities
 case "${1:-}" in
     --list|-l|list)
         list_capabilities
         ;;
     --help|-h|help|"")
-        echo "Usage: $0 <capability-name>"
+        echo "Usage: $0 <capability-name> [<capability-name>...]"
+        echo "       $0 --tier <n> [--type <type>]"
         echo "       $0 --list"
         echo ""
         echo "Adopt individual capabilities from higher tiers without full upgrade."
+        echo "All requested capabilities are installed as one transaction: the"
+        echo "manifest and tier.yaml are written once, and nothing is left behind"
+        echo "if any copy fails."
         echo ""
         echo "Options:"
-        echo "  --list, -l    List all available capabilities"
-        echo "  --help, -h    Show this help"
+        echo "  --list, -l       List all available capabilities"
+        echo "  --tier <n>       Adopt every capability in tier n"
+        echo "  --type <type>    Restrict --tier to one type (skill, role, ...)"
+        echo "  --dry-run        Show the plan without writing"
+        echo "  --help, -h       Show this help"
         echo ""
         echo "Example:"
-        echo "  $0 agent-browser    # Adopt browser automation skill"
-        echo "  $0 tester           # Adopt tester role"
+        echo "  $0 agent-browser             # Adopt browser automation skill"
+        echo "  $0 tester debug              # Adopt two roles at once"
+        echo "  $0 --tier 2 --type skill     # Adopt every Tier 2 skill"
         ;;
     *)
-        adopt_capability "$1"
+        python3 "$ADOPT_TOOL" \
+            --framework-root "$AIX_FRAMEWORK" \
+            --repo-root "$REPO_ROOT" \
+            "$@" || {
+            echo -e "${RED}Adoption failed; no changes were kept.${NC}"
+            echo "Run '$0 --list' to see available capabilities."
+            exit 1
+        }
         ;;
 esac
@@ -59,7 +59,6 @@ if git -C "$AIX_FRAMEWORK" rev-parse --git-dir > /dev/null 2>&1; then
 else
     AIX_VERSION="unknown"
 fi
-MANIFEST_TOOL="$AIX_FRAMEWORK/scripts/aix-manifest.py"
 
 # Create directories
 mkdir -p "$REPO_ROOT/.aix/skills"
@@ -67,84 +66,13 @@ mkdir -p "$REPO_ROOT/.aix/scripts"
 mkdir -p "$REPO_ROOT/.claude"
 mkdir -p "$REPO_ROOT/docs"
 
-# Copy Tier 0 files
-echo "Copying Tier 0 (Seed) files..."
-cp -r "$AIX_FRAMEWORK/tiers/0-seed/"* "$REPO_ROOT/.aix/"
-if [ -f "$MANIFEST_TOOL" ]; then
-    python3 "$MANIFEST_TOOL" init \
-        --manifest "$REPO_ROOT/.aix/manifest.json" \
-        --aix-version "$AIX_VERSION"
-    python3 "$MANIFEST_TOOL" record-dir \
-        --manifest "$REPO_ROOT/.aix/manifest.json" \
-        --repo-root "$REPO_ROOT" \
-        --framework-root "$AIX_FRAMEWORK" \
-        --source-root "$AIX_FRAMEWORK/tiers/0-seed" \
-        --dest-root "$REPO_ROOT/.aix" \
-        --capability "seed-base" \
-        --aix-version "$AIX_VERSION"
-fi
-
-# Make hooks executable
-if [ -d "$REPO_ROOT/.aix/hooks" ]; then
-    chmod +x "$REPO_ROOT/.aix/hooks/"*.sh 2>/dev/null || true
-fi
-
-# Copy doc templates
-echo "Copying document templates..."
-copy_docs_recursive() {
-    local src_dir="$1"
-    local dest_dir="$2"
-    if [ ! -d "$src_dir" ]; then
-        return 0
-    fi
-    find "$src_dir" -type f | while read -r src; do
-        local rel="${src#$src_dir/}"
-        local dest="$dest_dir/$rel"
-        if [ ! -f "$dest" ]; then
-            mkdir -p "$(dirname "$dest")"
-            cp "$src" "$dest"
-        fi
-    done
-}
-copy_docs_recursive "$AIX_FRAMEWORK/docs/templates" "$REPO_ROOT/docs"
-if [ -f "$MANIFEST_TOOL" ]; then
-    python3 "$MANIFEST_TOOL" record-dir \
-        --manifest "$REPO_ROOT/.aix/manifest.json" \
-        --repo-root "$REPO_ROOT" \
-        --framework-root "$AIX_FRAMEWORK" \
-        --source-root "$AIX_FRAMEWORK/docs/templates" \
-        --dest-root "$REPO_ROOT/docs" \
-        --capability "docs-templates" \
-        --aix-version "$AIX_VERSION"
-fi
-
-# Copy core skills (for upgrades and sync)
-echo "Copying core skills..."
-cp -r "$AIX_FRAMEWORK/skills/"* "$REPO_ROOT/.aix/skills/"
-if [ -f "$MANIFEST_TOOL" ]; then
-    python3 "$MANIFEST_TOOL" record-dir \
-        --manifest "$REPO_ROOT/.aix/manifest.json" \
-        --repo-root "$REPO_ROOT" \
-        --framework-root "$AIX_FRAMEWORK" \
-        --source-root "$AIX_FRAMEWORK/skills" \
-        --dest-root "$REPO_ROOT/.aix/skills" \
-        --capability "core-skills" \
-        --aix-version "$AIX_VERSION"
-fi
-
-# Copy core scripts
-echo "Copying core scripts..."
-cp -r "$AIX_FRAMEWORK/scripts/"* "$REPO_ROOT/.aix/scripts/"
-if [ -f "$MANIFEST_TOOL" ]; then
-    python3 "$MANIFEST_TOOL" record-dir \
-        --manifest "$REPO_ROOT/.aix/manifest.json" \
-        --repo-root "$REPO_ROOT" \
-        --framework-root "$AIX_FRAMEWORK" \
-        --source-root "$AIX_FRAMEWORK/scripts" \
-        --dest-root "$REPO_ROOT/.aix/scripts" \
-        --capability "core-scripts" \
-        --aix-version "$AIX_VERSION"
-fi
+# Copy Tier 0, doc templates (never replacing existing docs), core skills and
+# core scripts from one plan: parallel copies, a single manifest write
+echo "Copying Tier 0 (Seed) files, document templates, core skills and scripts..."
+python3 "$AIX_FRAMEWORK/scripts/aix-install.py" \
+    --framework-root "$AIX_FRAMEWORK" \
+    --repo-root "$REPO_ROOT" \
+    seed
 
 # Select coding assistant adapter
 select_adapter() {
@@ -185,7 +113,7 @@ create_tier_yaml() {
     cat > "$REPO_ROOT/.aix/tier.yaml" << EOF
 tier: 0
 name: seed
-aix_version: $AIX_VERSION
+aix_version: "$AIX_VERSION"
 initialized_at: $(date -I)
 history:
   - tier: 0
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Adopt capabilities from higher tiers in one batched transaction.
+
+Usage:
+    python3 scripts/aix-adopt.py agent-browser tester
+    python3 scripts/aix-adopt.py --tier 2 --type skill
+    python3 scripts/aix-adopt.py --tier 2 --type skill --dry-run --json
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from aix_git import git_root, short_sha
+from aix_install import CopyOp, InstallError, apply_plan, plan_capability
+from aix_registry import Capability, Registry, load_registry, read_adopted
+from aix_tier import TierConfigError, add_adopted, tier_name
+
+# Post-install notes printed per capability type (mirrors the old adopt.sh output)
+TYPE_NOTES = {
+    "skill": "Skill available via the adapter skills directory",
+    "role": "Role available for Task tool delegation",
+    "hook": "Note: Ensure .claude/settings.json references hooks",
+    "ci": "Note: Copy to .github/workflows/ to activate",
+}
+
+
+def _resolve_framework_root(path: Optional[str]) -> Path:
+    if path:
+        return Path(path)
+    env_path = os.environ.get("AIX_FRAMEWORK")
+    if env_path:
+        return Path(env_path)
+    return Path.home() / "tools" / "aix"
+
+
+def select_capabilities(
+    registry: Registry,
+    names: List[str],
+    tier: Optional[int],
+    cap_type: Optional[str],
+) -> List[Capability]:
+    """
+    Resolve requested names and filters to capabilities, in request order.
+
+    Raises:
+        InstallError: If any name is unknown
+    """
+    selected: List[Capability] = []
+    unknown = []
+    for name in names:
+        cap = registry.get(name)
+        if cap is None:
+            unknown.append(name)
+        else:
+            selected.append(cap)
+    if unknown:
+        raise InstallError(f"Unknown capability: {', '.join(unknown)}")
+
+    if tier is not None or cap_type is not None:
+        selected.extend(
+            cap for cap in registry.select(tier=tier, cap_type=cap_type)
+            if cap.type != "adapter"
+        )
+
+    seen = set()
+    unique = []
+    for cap in selected:
+        if cap.name not in seen:
+            seen.add(cap.name)
+            unique.append(cap)
+    return unique
+
+
+def adopt(
+    framework_root: Path,
+    repo_root: Path,
+    names: List[str],
+    tier: Optional[int] = None,
+    cap_type: Optional[str] = None,
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Build and apply one plan for every requested capability.
+
+    Returns:
+        Report with adopted, skipped and planned file counts
+    """
+    aix_dir = repo_root / ".aix"
+    tier_path = aix_dir / "tier.yaml"
+    registry = load_registry(framework_root / "registry.tsv")
+    adopted = read_adopted(tier_path)
+
+    report: Dict[str, Any] = {"adopted": [], "skipped": [], "files": 0, "dry_run": dry_run}
+    ops: List[CopyOp] = []
+    for cap in select_capabilities(registry, names, tier, cap_type):
+        if registry.is_installed(cap, repo_root, adopted):
+            report["skipped"].append(cap.name)
+            continue
+        cap_ops = plan_capability(cap, framework_root, repo_root)
+        ops.extend(cap_ops)
+        report["adopted"].append({
+            "name": cap.name,
+            "tier": cap.tier,
+            "type": cap.type,
+            "source": cap.source_ref,
+            "dest": str(cap.dest_path(repo_root).relative_to(repo_root)),
+            "files": len(cap_ops),
+        })
+    report["files"] = len(ops)
+
+    if dry_run or not report["adopted"]:
+        return report
+
+    tier_text = tier_path.read_text() if tier_path.exists() else ""
+    new_tier_text = add_adopted(tier_text, [item["name"] for item in report["adopted"]])
+    apply_plan(
+        ops,
+        repo_root=repo_root,
+        framework_root=framework_root,
+        aix_version=short_sha(framework_root) or "unknown",
+        extra_writes={tier_path: new_tier_text},
+        workers=workers,
+    )
+    return report
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    for name in report["skipped"]:
+        print(f"Capability '{name}' is already adopted.")
+    verb = "Would adopt" if report["dry_run"] else "Adopted"
+    for item in report["adopted"]:
+        print(f"{verb} '{item['name']}' from Tier {item['tier']} ({tier_name(item['tier'])})")
+        print(f"  Type: {item['type']}")
+        print(f"  Source: {item['source']}")
+        print(f"  Dest: {item['dest']} ({item['files']} file(s))")
+        note = TYPE_NOTES.get(item["type"])
+        if note and not report["dry_run"]:
+            print(f"  {note}")
+    if report["adopted"] and not report["dry_run"]:
+        print("")
+        print(f"✅ Adopted {len(report['adopted'])} capability(ies), {report['files']} file(s); tracked in tier.yaml")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Adopt AIX capabilities in one transaction")
+    parser.add_argument("names", nargs="*", help="Capability names to adopt")
+    parser.add_argument("--tier", type=int, help="Adopt every capability in this tier")
+    parser.add_argument("--type", dest="cap_type", help="Restrict --tier selection to a type")
+    parser.add_argument("--framework-root", help="Path to AIX framework repo")
+    parser.add_argument("--repo-root", help="Target repository root")
+    parser.add_argument("--workers", type=int, help="Parallel copy threads")
+    parser.add_argument("--dry-run", action="store_true", help="Show the plan without writing")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args()
+
+    if not args.names and args.tier is None and args.cap_type is None:
+        parser.error("give capability names or --tier/--type")
+
+    framework_root = _resolve_framework_root(args.framework_root).resolve()
+    repo_root = (Path(args.repo_root) if args.repo_root else git_root()).resolve()
+
+    if not (repo_root / ".aix").is_dir():
+        print("Error: aix not initialized. Run bootstrap.sh first.", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        report = adopt(
+            framework_root,
+            repo_root,
+            args.names,
+            tier=args.tier,
+            cap_type=args.cap_type,
+            dry_run=args.dry_run,
+            workers=args.workers,
+        )
+    except (InstallError, TierConfigError, FileNotFoundError) as e:
+        if args.json:
+            print(json.dumps({"status": "error", "error": str(e)}, indent=2))
+        else:
+            print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        report["status"] = "ok"
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
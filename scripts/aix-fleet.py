@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Run aix-status, aix-sync or aix-generate across many repos in one process.
+
+The framework tree, registry and template hashes are loaded once and shared
+by every repo; repos are processed concurrently by a bounded worker pool.
+status classifies each repo's manifest entries as aix-sync would, without
+writing anything, and reports a capability as outdated only where one of
+its files has an update.
+
+Usage:
+    python3 scripts/aix-fleet.py status ~/src/*
+    python3 scripts/aix-fleet.py sync --repos-file repos.txt --ndjson
+    python3 scripts/aix-fleet.py generate '~/src/svc-*' --workers 8 --json
+"""
+
+import argparse
+import glob
+import importlib.util
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from aix_git import same_revision, short_sha
+from aix_manifest import HashCache
+from aix_registry import load_registry
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Sync statuses that mean upstream has something the repo doesn't
+OUTDATED_STATUSES = {"update_available", "merge_clean", "merge_conflict", "local_missing"}
+
+
+def _load_script(filename: str) -> ModuleType:
+    """Import a sibling CLI script (hyphenated names can't use import)."""
+    module_name = filename[:-3].replace("-", "_") + "_cli"
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _resolve_framework_root(path: Optional[str]) -> Path:
+    if path:
+        return Path(path)
+    env_path = os.environ.get("AIX_FRAMEWORK")
+    if env_path:
+        return Path(env_path)
+    return Path.home() / "tools" / "aix"
+
+
+def expand_repos(patterns: List[str], repos_file: Optional[str]) -> List[Path]:
+    """
+    Expand repo paths, globs and a repos file (one path per line, # comments).
+
+    Returns:
+        Unique resolved repo roots, in first-seen order
+    """
+    candidates = list(patterns)
+    if repos_file:
+        for line in Path(repos_file).read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                candidates.append(line)
+
+    repos: List[Path] = []
+    seen = set()
+    for candidate in candidates:
+        expanded = os.path.expanduser(candidate)
+        matches = sorted(glob.glob(expanded)) if glob.has_magic(expanded) else [expanded]
+        for match in matches:
+            path = Path(match).resolve()
+            if path.is_dir() and str(path) not in seen:
+                seen.add(str(path))
+                repos.append(path)
+    return repos
+
+
+class Fleet:
+    """Shared framework state plus per-repo runners for each command."""
+
+    def __init__(self, framework_root: Path, args: argparse.Namespace) -> None:
+        self.framework_root = framework_root
+        self.args = args
+        self.hashes = HashCache()
+        self.framework_version = short_sha(framework_root) if framework_root.exists() else None
+        registry_path = framework_root / "registry.tsv"
+        if registry_path.exists():
+            load_registry(registry_path)
+        self.status_cli = _load_script("aix-status.py")
+        self.sync_cli = _load_script("aix-sync.py")
+        self.generate_cli = _load_script("aix-generate.py")
+
+    def run_status(self, repo_root: Path) -> Dict[str, Any]:
+        """
+        Status report plus the sync classification of every manifest entry.
+
+        Entries are classified as aix-sync would (nothing is written), and
+        a capability is outdated only if one of its entries is.
+        """
+        report = self.status_cli.status_report(argparse.Namespace(
+            repo_root=str(repo_root),
+            framework_root=str(self.framework_root),
+        ))
+        if report.get("manifest_path") is None or not self.framework_root.exists():
+            return report
+        context = self.sync_cli.sync_context(argparse.Namespace(
+            repo_root=str(repo_root),
+            framework_root=str(self.framework_root),
+            manifest=None,
+            output_dir=None,
+            apply=False,
+        ))
+        context["classify_only"] = True
+        summary: Dict[str, int] = {}
+        outdated = set()
+        for item in self.sync_cli.iter_sync(context, hashes=self.hashes):
+            summary[item["status"]] = summary.get(item["status"], 0) + 1
+            if item["status"] in OUTDATED_STATUSES:
+                outdated.add(item.get("capability") or "(unowned)")
+        report["sync_summary"] = summary
+        report["outdated_capabilities"] = sorted(outdated)
+        return report
+
+    def run_sync(self, repo_root: Path) -> Dict[str, Any]:
+        return self.sync_cli.sync(argparse.Namespace(
+            repo_root=str(repo_root),
+            framework_root=str(self.framework_root),
+            manifest=None,
+            output_dir=None,
+            apply=self.args.apply,
+        ), hashes=self.hashes)
+
+    def run_generate(self, repo_root: Path) -> Dict[str, Any]:
+        results = [
+            self.generate_cli.generate_adapter(
+                repo_root,
+                adapter_name,
+                model_set_name=model_set,
+                dry_run=self.args.dry_run,
+                force=self.args.force,
+            )
+            for adapter_name, model_set in self.generate_cli.resolve_all_adapters(repo_root).items()
+        ]
+        return {"repo_root": str(repo_root), "results": results}
+
+    def run(self, repo_root: Path) -> Dict[str, Any]:
+        """Run the selected command for one repo; errors become records."""
+        record: Dict[str, Any] = {"type": "repo", "repo": str(repo_root)}
+        if not (repo_root / ".aix").is_dir():
+            record.update(status="error", error="aix not initialized")
+            return record
+        try:
+            report = getattr(self, f"run_{self.args.command}")(repo_root)
+        except Exception as e:  # one bad repo must not sink the fleet
+            record.update(status="error", error=f"{type(e).__name__}: {e}")
+            return record
+        record.update(status="ok", report=report)
+        return record
+
+
+def iter_fleet(fleet: Fleet, repos: List[Path], workers: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (input index, record) as each repo finishes."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fleet.run, repo): index for index, repo in enumerate(repos)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+class Aggregate:
+    """Fleet-wide rollup of per-repo records."""
+
+    def __init__(self, command: str, framework_root: Path, framework_version: Optional[str]) -> None:
+        self.command = command
+        self.framework_root = framework_root
+        self.framework_version = framework_version
+        self.repos = 0
+        self.errors: List[Dict[str, str]] = []
+        self.summary: Dict[str, int] = {}
+        self.outdated: Dict[str, List[str]] = {}
+        self.conflicts: List[Dict[str, Any]] = []
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        self.summary[key] = self.summary.get(key, 0) + amount
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.repos += 1
+        repo = record["repo"]
+        if record["status"] != "ok":
+            self.errors.append({"repo": repo, "error": record["error"]})
+            return
+        report = record["report"]
+
+        if self.command == "status":
+            if "outdated_capabilities" in report:
+                outdated = report["outdated_capabilities"]
+            else:
+                # No manifest to classify: fall back to the recorded framework revision
+                version = report.get("aix_version")
+                current = bool(
+                    version and self.framework_version and same_revision(version, self.framework_version)
+                )
+                outdated = [] if current else ["(unknown)"]
+            self._count("outdated" if outdated else "current")
+            for capability in outdated:
+                self.outdated.setdefault(capability, []).append(repo)
+        elif self.command == "sync":
+            for key, value in report["summary"].items():
+                self._count(key, value)
+            for item in report["results"]:
+                capability = item.get("capability") or "(unowned)"
+                if item["status"] in OUTDATED_STATUSES:
+                    repos = self.outdated.setdefault(capability, [])
+                    if not repos or repos[-1] != repo:
+                        repos.append(repo)
+                if item["status"] == "merge_conflict":
+                    self.conflicts.append({
+                        "repo": repo,
+                        "path": item["path"],
+                        "capability": item.get("capability"),
+                        "output": item.get("output"),
+                    })
+        else:
+            for result in report["results"]:
+                self._count(result.get("status", "unknown"))
+                self._count("roles_generated", result.get("roles_generated", 0))
+                self._count("roles_skipped", result.get("roles_skipped", 0))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": "summary",
+            "command": self.command,
+            "framework_root": str(self.framework_root),
+            "framework_version": self.framework_version,
+            "repos": self.repos,
+            "errors": self.errors,
+            "summary": self.summary,
+            "outdated": {name: sorted(repos) for name, repos in sorted(self.outdated.items())},
+            "conflicts": self.conflicts,
+        }
+
+
+def print_text(summary: Dict[str, Any]) -> None:
+    print(f"AIX Fleet {summary['command'].capitalize()} Report")
+    print(f"- Framework: {summary['framework_root']} ({summary['framework_version']})")
+    print(f"- Repos: {summary['repos']}")
+    print(f"- Errors: {len(summary['errors'])}")
+    for error in summary["errors"]:
+        print(f"  - {error['repo']}: {error['error']}")
+    if summary["summary"]:
+        print("Summary:")
+        for key, value in sorted(summary["summary"].items()):
+            print(f"- {key}: {value}")
+    if summary["outdated"]:
+        print("Outdated:")
+        for name, repos in summary["outdated"].items():
+            print(f"- {name}: {len(repos)} repo(s)")
+    if summary["conflicts"]:
+        print("Conflicts:")
+        for conflict in summary["conflicts"]:
+            print(f"- {conflict['repo']}: {conflict['path']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run AIX commands across many repos")
+    parser.add_argument("command", choices=["status", "sync", "generate"])
+    parser.add_argument("repos", nargs="*", help="Repo roots or globs")
+    parser.add_argument("--repos-file", help="File listing repo roots, one per line")
+    parser.add_argument("--framework-root", help="Path to AIX framework repo")
+    parser.add_argument("--workers", type=int, default=min(8, (os.cpu_count() or 1) + 4),
+                        help="Repos processed concurrently")
+    parser.add_argument("--apply", action="store_true", help="sync: apply clean merges")
+    parser.add_argument("--dry-run", action="store_true", help="generate: don't write files")
+    parser.add_argument("--force", action="store_true", help="generate: regenerate unchanged files")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="Output one aggregated JSON report")
+    output.add_argument("--ndjson", action="store_true",
+                        help="Stream one JSON record per repo, then a summary record")
+    args = parser.parse_args()
+
+    repos = expand_repos(args.repos, args.repos_file)
+    if not repos:
+        parser.error("no repos matched")
+
+    framework_root = _resolve_framework_root(args.framework_root).resolve()
+    fleet = Fleet(framework_root, args)
+    aggregate = Aggregate(args.command, framework_root, fleet.framework_version)
+    records: List[Optional[Dict[str, Any]]] = [None] * len(repos)
+
+    for index, record in iter_fleet(fleet, repos, max(1, args.workers)):
+        aggregate.add(record)
+        if args.ndjson:
+            print(json.dumps(record), flush=True)
+        elif args.json:
+            records[index] = record
+
+    summary = aggregate.to_dict()
+    if args.ndjson:
+        print(json.dumps(summary), flush=True)
+    elif args.json:
+        summary["results"] = records
+        print(json.dumps(summary, indent=2))
+    else:
+        print_text(summary)
+
+    if summary["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
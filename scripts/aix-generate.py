@@ -13,14 +13,37 @@ Usage:
     python3 .aix/scripts/aix-generate.py --all
     python3 .aix/scripts/aix-generate.py --adapter claude --dry-run
     python3 .aix/scripts/aix-generate.py --adapter claude --force
+    python3 .aix/scripts/aix-generate.py --all --check
+    python3 .aix/scripts/aix-generate.py --all --footprint
+    python3 .aix/scripts/aix-generate.py --all --footprint --max-growth 5
+    python3 .aix/scripts/aix-generate.py --all --footprint --compare-variants
+    python3 .aix/scripts/aix-generate.py --adapter factory --model-set-matrix
+    python3 .aix/scripts/aix-generate.py --adapter factory --activate-model-set speed
+
+Parsed roles, adapter configs, model sets and rendered outputs are cached
+by content digest in the store shared by every worktree of the repo (see
+aix_cache.py), so a fresh worktree regenerates mostly from cache hits.
+--no-cache bypasses it.
+
+Renders are memoized by exactly the inputs they read (see render_inputs),
+so a role that renders identically for several adapters is rendered once,
+written once and hardlinked into the other adapters' output directories
+(copied when they are on another filesystem).
+
+Adapters with roles.variant: compact get condensed role prompts: sections
+the canonical roles mark optional are dropped, collapse sections keep
+their first paragraph, and shared sections are written once to a shared
+file the roles point to (see aix_compact.py).
 """
 
 import argparse
+import atexit
 import hashlib
 import json
 import os
 import re
-import subprocess
+import shutil
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -31,31 +54,80 @@ except ImportError:
     print("Error: PyYAML is required. Install with: pip install pyyaml")
     exit(1)
 
-
-def _git_root() -> Path:
-    """Get git repository root directory."""
-    result = subprocess.run(
-        ["git", "rev-parse", "--show-toplevel"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode == 0:
-        return Path(result.stdout.strip())
-    return Path.cwd()
-
-
-def _sha256(content: str) -> str:
-    """Compute SHA-256 hash of string content."""
-    return hashlib.sha256(content.encode()).hexdigest()
-
-
-def _sha256_file(path: Path) -> str:
-    """Compute SHA-256 hash of file content."""
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(8192), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+import aix_compact
+import aix_footprint
+from aix_cache import SharedCache, SharedHashCache
+from aix_git import git_root
+from aix_manifest import default_hash_algo, hash_bytes, hash_file
+from aix_mirror import mirror_tree
+from aix_tier import load_tier
+
+# Per-model-set renders for --model-set-matrix, relative to the repo root
+STAGING_ROOT = Path(".aix") / "state" / "model-sets"
+STAGING_RECORD = ".aix-generated.json"
+# Skills catalog written beside each adapter's skills output (see build_skills_catalog)
+SKILLS_CATALOG = "skills-catalog.json"
+CATALOG_FORMAT = 1
+
+# Worktree-shared cache ("store", "hashes"), set up by use_cache()
+_CACHE: Dict[str, Any] = {}
+# Renders by digest of their inputs (see render_inputs), across adapters
+_RENDERS: Dict[str, str] = {}
+# First output written with each content, per repo: (repo root, hash) -> path
+_LINK_SOURCES: Dict[Tuple[str, str], Path] = {}
+
+
+def use_cache(repo_root: Path, read_only: bool = False) -> Optional[SharedCache]:
+    """Route parses, renders and file digests through the repo's shared cache."""
+    store = SharedCache.for_repo(repo_root, read_only=read_only)
+    _CACHE.clear()
+    if store is not None:
+        _CACHE.update(store=store, hashes=SharedHashCache(store))
+    return store
+
+
+def close_cache() -> None:
+    """Publish new file digests and trim the shared cache to its budget."""
+    store = _CACHE.get("store")
+    if store is None:
+        return
+    _CACHE["hashes"].flush()
+    if store.stored:
+        store.prune()
+
+
+def _generator_version() -> str:
+    """Fingerprint of the code that renders outputs (this file and PyYAML)."""
+    if "generator" not in _CACHE:
+        source = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+        _CACHE["generator"] = f"{source}:{yaml.__version__}"
+    return _CACHE["generator"]
+
+
+def _digest(content: str, algo: Optional[str] = None) -> str:
+    """Hash string content (default algorithm: see aix_manifest)."""
+    return hash_bytes(content.encode(), algo)
+
+
+def _digest_file(path: Path, algo: Optional[str] = None) -> str:
+    """Hash file content (default algorithm: see aix_manifest)."""
+    hashes = _CACHE.get("hashes")
+    return hashes.digest(path, algo) if hashes is not None else hash_file(path, algo)
+
+
+def _load_yaml(path: Path) -> Any:
+    """Parse a YAML file, reusing the shared cache's parse of identical content."""
+    content = path.read_bytes()
+    store = _CACHE.get("store")
+    if store is None:
+        return yaml.safe_load(content)
+    key = store.key("yaml", yaml.__version__, hashlib.sha256(content).hexdigest())
+    cached = store.get_json("parsed", key)
+    if isinstance(cached, dict) and "value" in cached:
+        return cached["value"]
+    value = yaml.safe_load(content)
+    store.put_json("parsed", key, {"value": value})
+    return value
 
 
 def load_adapter_config(adapter_path: Path) -> Dict[str, Any]:
@@ -76,7 +148,7 @@ def load_adapter_config(adapter_path: Path) -> Dict[str, Any]:
     if not config_path.exists():
         raise FileNotFoundError(f"Adapter config not found: {config_path}")
 
-    config = yaml.safe_load(config_path.read_text())
+    config = _load_yaml(config_path)
 
     # Validate required fields
     required = ["adapter", "version"]
@@ -84,6 +156,10 @@ def load_adapter_config(adapter_path: Path) -> Dict[str, Any]:
         if field not in config:
             raise ValueError(f"Missing required field in adapter config: {field}")
 
+    variant = (config.get("roles") or {}).get("variant", "full")
+    if variant not in aix_compact.VARIANTS:
+        raise ValueError(f"Unknown roles.variant in adapter config: {variant}")
+
     return config
 
 
@@ -105,7 +181,7 @@ def load_model_set(adapter_path: Path, model_set_name: str) -> Dict[str, Any]:
     if not model_set_path.exists():
         raise FileNotFoundError(f"Model set not found: {model_set_path}")
 
-    return yaml.safe_load(model_set_path.read_text())
+    return _load_yaml(model_set_path)
 
 
 def resolve_model_for_role(role_name: str, model_set: Dict[str, Any]) -> Dict[str, Any]:
@@ -156,6 +232,13 @@ def parse_role_file(role_path: Path) -> Tuple[Dict[str, Any], str]:
         ValueError: If file format is invalid
     """
     content = role_path.read_text()
+    store = _CACHE.get("store")
+    key = ""
+    if store is not None:
+        key = store.key("role", yaml.__version__, hashlib.sha256(content.encode()).hexdigest())
+        cached = store.get_json("parsed", key)
+        if isinstance(cached, dict) and "frontmatter" in cached:
+            return cached["frontmatter"], cached["body"]
 
     # Match YAML frontmatter between --- markers (with optional leading HTML comments)
     pattern = r'^(?:<!--.*?-->\s*\n)*---\s*\n(.*?)\n---\s*\n(.*)$'
@@ -174,6 +257,8 @@ def parse_role_file(role_path: Path) -> Tuple[Dict[str, Any], str]:
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML frontmatter in {role_path}: {e}")
 
+    if store is not None:
+        store.put_json("parsed", key, {"frontmatter": frontmatter, "body": body})
     return frontmatter, body
 
 
@@ -382,17 +467,206 @@ def create_skills_symlink(output_dir: Path, skills_source: Path) -> None:
     output_dir.symlink_to(rel_path)
 
 
-def compute_content_hash(content: str) -> str:
+def setup_skills(
+    repo_root: Path,
+    adapter_config: Dict[str, Any],
+    record: Dict[str, Any],
+    dry_run: bool = False,
+    force: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Expose .aix/skills at the adapter's skills output per skills.strategy.
+
+    "symlink" links the whole directory; "mirror" keeps a hardlink mirror
+    for tools that don't follow symlinks, updating only the skills that
+    changed since the mirror recorded in the adapter's manifest entry.
+
+    Returns:
+        The mirror report (see aix_mirror.mirror_tree), or None
+    """
+    strategy = adapter_config.get("skills", {}).get("strategy")
+    skills_output = adapter_config.get("output", {}).get("skills")
+    if not skills_output:
+        return None
+    skills_source = repo_root / ".aix" / "skills"
+    if strategy == "mirror":
+        return mirror_tree(
+            skills_source, repo_root / skills_output, record.get("skills_mirror"), dry_run=dry_run, force=force
+        )
+    if strategy == "symlink" and not dry_run:
+        mirrored = (record.get("skills_mirror") or {}).get("units") or {}
+        target = repo_root / skills_output
+        if mirrored and target.is_dir() and not target.is_symlink():
+            # Switching back from mirror: drop the mirrored skills so the directory can become a link
+            for name in mirrored:
+                if (target / name).is_dir():
+                    shutil.rmtree(target / name)
+                elif (target / name).exists():
+                    (target / name).unlink()
+        create_skills_symlink(target, skills_source)
+    return None
+
+
+def catalog_path(repo_root: Path, adapter_config: Dict[str, Any]) -> Optional[Path]:
+    """Where an adapter's skills catalog goes: output.skills_catalog, else beside output.skills."""
+    output_config = adapter_config.get("output", {})
+    if output_config.get("skills_catalog"):
+        return repo_root / output_config["skills_catalog"]
+    if output_config.get("skills"):
+        return (repo_root / output_config["skills"]).parent / SKILLS_CATALOG
+    return None
+
+
+def skill_signatures(skills_dir: Path) -> Dict[str, List[int]]:
+    """Map each skill directory holding a SKILL.md to that file's [size, mtime_ns]."""
+    signatures: Dict[str, List[int]] = {}
+    if skills_dir.is_dir():
+        for skill_md in sorted(skills_dir.glob("*/SKILL.md")):
+            stat = skill_md.stat()
+            signatures[skill_md.parent.name] = [stat.st_size, stat.st_mtime_ns]
+    return signatures
+
+
+def _skill_tiers(manifest: Dict[str, Any]) -> Dict[str, Optional[int]]:
+    """Tier each installed skill came from, by its manifest source (None for core and local skills)."""
+    tiers: Dict[str, Optional[int]] = {}
+    for entry in manifest.get("files", []):
+        path = entry.get("path", "")
+        if path.startswith(".aix/skills/") and path.endswith("/SKILL.md"):
+            match = re.match(r"tiers/(\d+)-", entry.get("source", ""))
+            tiers[Path(path).parent.name] = int(match.group(1)) if match else None
+    return tiers
+
+
+def build_skills_catalog(
+    repo_root: Path,
+    adapter_config: Dict[str, Any],
+    manifest: Dict[str, Any],
+    record: Dict[str, Any],
+    dry_run: bool = False,
+    force: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Write the adapter's skills catalog: one file listing every skill's name,
+    description, path (under the adapter's skills output), tier and
+    SKILL.md hash, so tools can discover skills without parsing each one.
+
+    Built incrementally: SKILL.md files whose [size, mtime_ns] match the
+    signatures recorded in the adapter's manifest entry keep their catalog
+    entry, and nothing is read at all when no SKILL.md changed. The file
+    itself holds no timestamps, so it is identical across worktrees.
+
+    Returns:
+        Report with path, skills, parsed, written and the new record, or
+        None if the adapter has no skills output
+    """
+    path = catalog_path(repo_root, adapter_config)
+    skills_output = adapter_config.get("output", {}).get("skills")
+    if path is None or not skills_output:
+        return None
+    rel_path = str(path.relative_to(repo_root))
+    algo = default_hash_algo()
+    signatures = skill_signatures(repo_root / ".aix" / "skills")
+    previous = record.get("skills_catalog") or {}
+    report: Dict[str, Any] = {"path": rel_path, "skills": previous.get("skills", 0), "parsed": 0, "written": False}
+    report["record"] = {"path": rel_path, "hash_algo": algo, "signatures": signatures, "skills": report["skills"]}
+    if (
+        not force
+        and previous.get("path") == rel_path
+        and previous.get("hash_algo") == algo
+        and previous.get("signatures") == signatures
+        and path.exists()
+    ):
+        return report
+
+    existing: Dict[str, Dict[str, Any]] = {}
+    old_content = None
+    try:
+        old_content = path.read_text()
+        catalog = json.loads(old_content)
+        if catalog.get("format") == CATALOG_FORMAT and catalog.get("hash_algo") == algo:
+            existing = {Path(entry["path"]).parent.name: entry for entry in catalog.get("skills", [])}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        existing = {}
+    old_signatures = previous.get("signatures") or {}
+    tiers = _skill_tiers(manifest)
+
+    skills = []
+    for name, signature in signatures.items():
+        entry = existing.get(name)
+        if force or entry is None or old_signatures.get(name) != signature:
+            skill_md = repo_root / ".aix" / "skills" / name / "SKILL.md"
+            try:
+                frontmatter, _ = parse_role_file(skill_md)
+            except ValueError:
+                continue  # Skip skills without valid frontmatter
+            report["parsed"] += 1
+            entry = {
+                "name": str(frontmatter.get("name") or name),
+                "description": str(frontmatter.get("description") or "").strip(),
+                "path": f"{skills_output}/{name}/SKILL.md",
+                "tier": tiers.get(name),
+                "hash": _digest_file(skill_md, algo),
+            }
+        skills.append(entry)
+    report["skills"] = report["record"]["skills"] = len(skills)
+
+    content = json.dumps({"format": CATALOG_FORMAT, "hash_algo": algo, "skills": skills}, indent=2) + "\n"
+    if content != old_content and not dry_run:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(content)
+        os.replace(tmp_path, path)
+        report["written"] = True
+    return report
+
+
+def catalog_drift(repo_root: Path, adapter_config: Dict[str, Any], record: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Report a skills catalog that is missing or older than some SKILL.md."""
+    path = catalog_path(repo_root, adapter_config)
+    if path is None or not adapter_config.get("output", {}).get("skills"):
+        return []
+    rel_path = str(path.relative_to(repo_root))
+    if not path.exists():
+        return [{"path": rel_path, "reason": "missing"}]
+    previous = record.get("skills_catalog") or {}
+    if previous.get("signatures") != skill_signatures(repo_root / ".aix" / "skills"):
+        return [{"path": rel_path, "reason": "stale"}]
+    return []
+
+
+def skills_drift(repo_root: Path, adapter_config: Dict[str, Any], record: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Report a missing skills symlink, or mirrored skills out of date with .aix/skills."""
+    strategy = adapter_config.get("skills", {}).get("strategy")
+    skills_output = adapter_config.get("output", {}).get("skills")
+    if not skills_output:
+        return []
+    if strategy == "symlink":
+        return [] if (repo_root / skills_output).is_symlink() else [{"path": skills_output, "reason": "missing"}]
+    if strategy != "mirror":
+        return []
+    if not (repo_root / skills_output).is_dir() or (repo_root / skills_output).is_symlink():
+        return [{"path": skills_output, "reason": "missing"}]
+    plan = mirror_tree(repo_root / ".aix" / "skills", repo_root / skills_output, record.get("skills_mirror"), dry_run=True)
+    return [
+        {"path": f"{skills_output}/{name}", "reason": reason}
+        for reason, key in (("missing", "added"), ("stale", "updated"), ("orphaned", "removed"))
+        for name in plan[key]
+    ]
+
+
+def compute_content_hash(content: str, algo: Optional[str] = None) -> str:
     """
-    Compute SHA-256 hash of content.
+    Compute hash of content.
 
     Args:
         content: String content to hash
+        algo: Hash algorithm (default: aix_manifest default)
 
     Returns:
-        Hex string of SHA-256 hash
+        Hex digest
     """
-    return _sha256(content)
+    return _digest(content, algo)
 
 
 def load_manifest(manifest_path: Path) -> Dict[str, Any]:
@@ -409,7 +683,8 @@ def load_manifest(manifest_path: Path) -> Dict[str, Any]:
 def update_manifest(
     manifest_path: Path,
     adapter_name: str,
-    generation_info: Dict[str, Any]
+    generation_info: Dict[str, Any],
+    section: str = "generated",
 ) -> None:
     """
     Update manifest.json with generation metadata.
@@ -418,15 +693,16 @@ def update_manifest(
         manifest_path: Path to manifest.json
         adapter_name: Name of adapter that was generated
         generation_info: Dict with generation metadata
+        section: Manifest section keyed by adapter ("generated" or "footprint")
     """
     manifest = load_manifest(manifest_path)
 
-    # Initialize generated section if not present
-    if "generated" not in manifest:
-        manifest["generated"] = {}
+    # Initialize section if not present
+    if section not in manifest:
+        manifest[section] = {}
 
     # Update adapter entry
-    manifest["generated"][adapter_name] = generation_info
+    manifest[section][adapter_name] = generation_info
 
     # Write back to file
     manifest_path.parent.mkdir(parents=True, exist_ok=True)
@@ -441,50 +717,810 @@ def get_enabled_adapters(repo_root: Path) -> Dict[str, Optional[str]]:
         Dict mapping adapter name to model set name
         Empty dict if tier.yaml doesn't exist or has no adapters section
     """
-    tier_path = repo_root / ".aix" / "tier.yaml"
-    if not tier_path.exists():
-        return {}
+    return load_tier(repo_root / ".aix" / "tier.yaml").enabled_adapters
+
+
+def resolve_all_adapters(repo_root: Path) -> Dict[str, Optional[str]]:
+    """
+    Resolve the adapters --all generates for a repo.
+
+    Uses the enabled adapters from tier.yaml, or every installed adapter
+    when tier.yaml has no adapter config.
+
+    Returns:
+        Dict mapping adapter names to their model_set (or None for default)
+    """
+    adapters = get_enabled_adapters(repo_root)
+    if not adapters:
+        adapters_dir = repo_root / ".aix" / "adapters"
+        if adapters_dir.exists():
+            for adapter_dir in adapters_dir.iterdir():
+                if adapter_dir.is_dir() and not adapter_dir.name.startswith("_"):
+                    adapters[adapter_dir.name] = None
+    return adapters
+
+
+def render_role(
+    role_file: Path,
+    adapter_config: Dict[str, Any],
+    model_set: Optional[Dict[str, Any]],
+    model_set_name: Optional[str],
+) -> Optional[str]:
+    """
+    Render one role for an adapter.
+
+    Returns:
+        Output content, or None if the role file is invalid (skipped)
+    """
+    # Parse role file
+    try:
+        frontmatter, body = parse_role_file(role_file)
+    except ValueError:
+        return None  # Skip invalid role files
+
+    # Resolve model for this role
+    model_config = {}
+    if model_set:
+        model_config = resolve_model_for_role(role_file.stem, model_set)
+
+    return render_parsed(role_file.stem, frontmatter, body, adapter_config, model_config, model_set_name)
+
+
+def shared_ref(adapter_config: Dict[str, Any]) -> Optional[str]:
+    """Repo-relative path compact roles point shared sections at (roles.shared, else <agents dir>-shared.md)."""
+    roles_config = adapter_config.get("roles", {})
+    if roles_config.get("shared"):
+        return str(roles_config["shared"])
+    output_config = adapter_config.get("output", {})
+    for key in ["agents", "droids", "agent"]:
+        if key in output_config:
+            return f"{str(output_config[key]).rstrip('/')}-shared.md"
+    return None
+
+
+def prepare_body(body: str, adapter_config: Dict[str, Any]) -> str:
+    """Role body for the adapter's roles.variant: markers removed, condensed if compact."""
+    if adapter_config.get("roles", {}).get("variant", "full") == "compact":
+        return aix_compact.compact(body, shared_ref(adapter_config))[0]
+    return aix_compact.strip_markers(body)
+
+
+def render_shared(roles_dir: Path, adapter_config: Dict[str, Any]) -> Optional[str]:
+    """
+    Render the shared file of a compact adapter.
+
+    Returns:
+        Content, or None if the adapter isn't compact or no role marks a
+        section shared
+    """
+    roles_config = adapter_config.get("roles", {})
+    ref = shared_ref(adapter_config)
+    if roles_config.get("variant", "full") != "compact" or ref is None:
+        return None
+    sections: List[Tuple[str, str]] = []
+    for role_file in list_role_files(roles_dir):
+        try:
+            _, body = parse_role_file(role_file)
+        except ValueError:
+            continue
+        sections.extend(aix_compact.compact(body, ref)[1])
+    content = aix_compact.shared_document(sections)
+    if content is not None and roles_config.get("format", "markdown") == "json":
+        content = replace_tool_names_in_body(content, adapter_config)
+    return content
+
+
+def render_inputs(
+    role_name: str,
+    frontmatter: Dict[str, Any],
+    body: str,
+    adapter_config: Dict[str, Any],
+    model_config: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Collect exactly what rendering a role reads from its inputs.
+
+    Adapters whose inputs agree render byte-identical output, e.g. claude
+    and factory agents for a role with no model mapping whose tools map to
+    the same names, so this is the key renders are memoized by.
+    """
+    role_format = adapter_config.get("roles", {}).get("format", "markdown")
+    model = {key: model_config[key] for key in ("model", "reasoningEffort") if key in model_config}
+    tools = frontmatter.get("tools") or frontmatter.get("allowed_tools")
+    if role_format == "json":
+        tools = tools or []
+        return {
+            "format": role_format,
+            "name": role_name,
+            "description": frontmatter.get("description"),
+            "tools": map_tool_names(tools, adapter_config) if isinstance(tools, list) else None,
+            "tool_renames": [[k, v] for k, v in adapter_config.get("tools", {}).items() if k != v],
+            "model": model,
+            "body": body,
+        }
+    return {
+        "format": role_format,
+        "frontmatter": {key: frontmatter[key] for key in ("name", "description") if key in frontmatter},
+        "opencode": adapter_config.get("adapter", "") == "opencode",
+        "tools": map_tool_names(tools, adapter_config) if tools and isinstance(tools, list) else None,
+        "model": model,
+        "body": body,
+    }
+
+
+def render_parsed(
+    role_name: str,
+    frontmatter: Dict[str, Any],
+    body: str,
+    adapter_config: Dict[str, Any],
+    model_config: Dict[str, Any],
+    model_set_name: Optional[str],
+) -> str:
+    """
+    Render an already parsed role with a resolved model config.
+
+    Renders are memoized in process and in the shared cache by their
+    inputs, so identical outputs across adapters are rendered once.
+    """
+    body = prepare_body(body, adapter_config)
+    try:
+        inputs = json.dumps(render_inputs(role_name, frontmatter, body, adapter_config, model_config), sort_keys=True)
+        memo_key: Optional[str] = hashlib.sha256(inputs.encode()).hexdigest()
+    except (TypeError, ValueError):
+        memo_key = None
+    if memo_key is not None and memo_key in _RENDERS:
+        return _RENDERS[memo_key]
+
+    store = _CACHE.get("store")
+    key = None
+    if store is not None and memo_key is not None:
+        key = store.key("render", _generator_version(), memo_key)
+        cached = store.get_bytes("render", key)
+        if cached is not None:
+            _RENDERS[memo_key] = cached.decode()
+            return _RENDERS[memo_key]
+
+    # Generate output content (JSON for kiro, markdown for others)
+    role_format = adapter_config.get("roles", {}).get("format", "markdown")
+    if role_format == "json":
+        content = generate_json_agent(
+            role_name,
+            frontmatter,
+            body,
+            adapter_config,
+            model_config,
+            model_set_name or "default",
+        )
+    else:
+        content = generate_output_file(
+            role_name,
+            frontmatter,
+            body,
+            adapter_config,
+            model_config,
+            model_set_name or "default",
+        )
+    if key is not None:
+        store.put_bytes("render", key, content.encode())
+    if memo_key is not None:
+        _RENDERS[memo_key] = content
+    return content
+
+
+def write_output(repo_root: Path, path: Path, content: str, content_hash: str) -> bool:
+    """
+    Write a generated file, hardlinking it to an identical output when possible.
+
+    Files are replaced rather than rewritten in place, so regenerating one
+    path never changes the outputs linked to it.
 
-    # Simple YAML parsing for tier.yaml
-    content = tier_path.read_text()
-    adapters: Dict[str, Optional[str]] = {}
-    in_adapters = False
-    adapter_name: Optional[str] = None
+    Returns:
+        True if the file was hardlinked instead of written
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    # A leftover temp file may itself be a link; never write through it
+    if tmp_path.exists():
+        tmp_path.unlink()
+    source = _LINK_SOURCES.get((str(repo_root), content_hash))
+    if source is not None and source != path:
+        try:
+            os.link(source, tmp_path)
+            os.replace(tmp_path, path)
+            return True
+        except OSError:
+            # Different filesystem or no link support: write a copy instead
+            if tmp_path.exists():
+                tmp_path.unlink()
+    tmp_path.write_text(content)
+    os.replace(tmp_path, path)
+    _LINK_SOURCES[(str(repo_root), content_hash)] = path
+    return False
+
+
+def links_to_roles(output_dir: Path, roles_dir: Path) -> bool:
+    """True if output_dir resolves to (or into) the canonical roles directory."""
+    roles = roles_dir.resolve()
+    resolved = output_dir.resolve()
+    return resolved == roles or roles in resolved.parents
+
+
+def served_by_link(output_path: Path, content: str) -> bool:
+    """
+    True if a role read through a link to .aix/roles already is content.
+
+    Marker lines (aix_compact) are HTML comments the agent never acts on,
+    so a canonical file that differs from the render only by them counts.
+    """
+    try:
+        return aix_compact.strip_markers(output_path.read_text()) == content
+    except OSError:
+        return False
+
+
+def role_output_path(role_file: Path, adapter_config: Dict[str, Any], output_dir: Path) -> Path:
+    """Output path of a role for an adapter."""
+    filename_template = adapter_config.get("roles", {}).get("filename", "{name}.md")
+    return output_dir / filename_template.format(name=role_file.stem)
+
+
+def agent_output_dir(repo_root: Path, adapter_config: Dict[str, Any]) -> Optional[Path]:
+    """Directory an adapter writes agents/droids to, or None if unconfigured."""
+    output_config = adapter_config.get("output", {})
+    for key in ["agents", "droids", "agent"]:
+        if key in output_config:
+            return repo_root / output_config[key]
+    return None
+
+
+def resolve_model_set(
+    adapter_path: Path,
+    adapter_config: Dict[str, Any],
+    model_set_name: Optional[str],
+    algo: Optional[str] = None,
+) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Resolve the model set an adapter generates with.
+
+    Returns:
+        (model_set_name, model_set, model_set_hash)
+
+    Raises:
+        FileNotFoundError: If the model set doesn't exist
+    """
+    model_sets_config = adapter_config.get("model_sets", {})
+    if model_set_name is None and model_sets_config.get("enabled"):
+        # Use default from adapter config (if one is configured)
+        model_set_name = model_sets_config.get("default") or None
+
+    if not (model_sets_config.get("enabled") and model_set_name):
+        return model_set_name, None, None
+    model_set = load_model_set(adapter_path, model_set_name)
+    model_set_hash = _digest_file(adapter_path / "model-sets" / f"{model_set_name}.yaml", algo)
+    return model_set_name, model_set, model_set_hash
+
+
+def list_role_files(roles_dir: Path) -> List[Path]:
+    return sorted(f for f in roles_dir.glob("*.md") if f.name != "_index.md")
+
+
+def check_adapter(
+    repo_root: Path,
+    adapter_name: str,
+    model_set_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Check an adapter's generated outputs against the manifest, writing nothing.
+
+    Inputs (adapter.yaml, model set, each role) are fingerprinted and
+    compared with the `generated` record from the last run. Only outputs
+    whose inputs changed - or that have no record - are rendered; the rest
+    are verified by hashing the committed output.
+
+    Returns:
+        Dict with check report; status is "clean", "drift" or "error"
+    """
+    aix_dir = repo_root / ".aix"
+    adapter_path = aix_dir / "adapters" / adapter_name
+
+    manifest = load_manifest(aix_dir / "manifest.json")
+    record = (manifest.get("generated") or {}).get(adapter_name) or {}
+    recorded_outputs = record.get("outputs") or {}
+    drifted: List[Dict[str, str]] = []
+
+    # An activated model set (--activate-model-set) is what's on disk
+    if record.get("staging"):
+        model_set_name = record.get("model_set")
+
+    # Fingerprints are compared in the algorithm they were recorded with
+    algo = record.get("hash_algo", "sha256") if record else default_hash_algo()
+
+    try:
+        adapter_config = load_adapter_config(adapter_path)
+        model_set_name, model_set, model_set_hash = resolve_model_set(
+            adapter_path, adapter_config, model_set_name, algo
+        )
+    except (FileNotFoundError, ValueError) as e:
+        return {"adapter": adapter_name, "status": "error", "error": str(e)}
+
+    def relative(path: Path) -> str:
+        return str(path.relative_to(repo_root))
+
+    drifted.extend(catalog_drift(repo_root, adapter_config, record))
+    if not adapter_config.get("roles", {}).get("enabled", True):
+        drifted.extend(skills_drift(repo_root, adapter_config, record))
+        return {
+            "adapter": adapter_name,
+            "status": "drift" if drifted else "clean",
+            "model_set": None,
+            "checked": 0,
+            "rendered": 0,
+            "drifted": drifted,
+            "orphaned": [],
+        }
+
+    output_dir = agent_output_dir(repo_root, adapter_config)
+    if output_dir is None:
+        return {"adapter": adapter_name, "status": "error", "error": "No agent output directory configured"}
+
+    # A changed adapter config or model set invalidates every fingerprint
+    config_fresh = (
+        record.get("adapter_config_hash") == _digest_file(adapter_path / "adapter.yaml", algo)
+        and record.get("model_set") == model_set_name
+        and record.get("model_set_hash") == model_set_hash
+    )
+
+    # The bootstrap layout links the agents dir to .aix/roles (see generate_adapter)
+    linked_roles = links_to_roles(output_dir, aix_dir / "roles")
+
+    checked = 0
+    rendered = 0
+    seen = set()
+    if adapter_config.get("skills", {}).get("strategy") == "mirror":
+        drifted.extend(skills_drift(repo_root, adapter_config, record))
+    for role_file in list_role_files(aix_dir / "roles"):
+        output_path = role_output_path(role_file, adapter_config, output_dir)
+        rel = relative(output_path)
+        seen.add(rel)
+        entry = recorded_outputs.get(rel)
+        checked += 1
+
+        if config_fresh and entry and entry.get("source_hash") == _digest_file(role_file, algo):
+            # Inputs unchanged: the committed output must still be what was generated
+            if not output_path.exists():
+                drifted.append({"path": rel, "reason": "missing"})
+            elif _digest_file(output_path, algo) != entry.get("hash"):
+                drifted.append({"path": rel, "reason": "modified"})
+            continue
+
+        content = render_role(role_file, adapter_config, model_set, model_set_name)
+        rendered += 1
+        if content is None:
+            continue
+        if not output_path.exists():
+            drifted.append({"path": rel, "reason": "missing"})
+        elif linked_roles:
+            if not served_by_link(output_path, content):
+                drifted.append({"path": rel, "reason": "stale"})
+        elif _digest_file(output_path, algo) != compute_content_hash(content, algo):
+            drifted.append({"path": rel, "reason": "stale"})
+
+    shared_content = render_shared(aix_dir / "roles", adapter_config)
+    if shared_content is not None:
+        shared_path = repo_root / str(shared_ref(adapter_config))
+        rel = relative(shared_path)
+        seen.add(rel)
+        checked += 1
+        rendered += 1
+        if not shared_path.exists():
+            drifted.append({"path": rel, "reason": "missing"})
+        elif _digest_file(shared_path, algo) != compute_content_hash(shared_content, algo):
+            drifted.append({"path": rel, "reason": "stale"})
+
+    # Outputs of removed roles aren't deleted by generate; report, don't fail
+    orphaned = sorted(
+        rel for rel in recorded_outputs
+        if rel not in seen and (repo_root / rel).exists()
+    )
+
+    return {
+        "adapter": adapter_name,
+        "status": "drift" if drifted else "clean",
+        "model_set": model_set_name,
+        "checked": checked,
+        "rendered": rendered,
+        "drifted": drifted,
+        "orphaned": orphaned,
+    }
+
+
+def footprint_adapter(
+    repo_root: Path,
+    adapter_name: str,
+    model_set_name: Optional[str] = None,
+    record: bool = True,
+    compare_variants: bool = False,
+) -> Dict[str, Any]:
+    """
+    Measure the prompt footprint of an adapter's generated roles.
 
-    for line in content.splitlines():
-        line = line.rstrip()
+    Roles are rendered in memory; outputs on disk are not touched. Sizes
+    are compared with the footprint recorded by the previous run and, if
+    record is True, the new footprint replaces it in the manifest. With
+    compare_variants, every role is also rendered as each roles.variant.
 
-        if line.startswith("adapters:"):
-            in_adapters = True
+    Returns:
+        Dict with footprint report
+    """
+    aix_dir = repo_root / ".aix"
+    adapter_path = aix_dir / "adapters" / adapter_name
+
+    try:
+        adapter_config = load_adapter_config(adapter_path)
+        model_set_name, model_set, _ = resolve_model_set(adapter_path, adapter_config, model_set_name)
+    except (FileNotFoundError, ValueError) as e:
+        return {"adapter": adapter_name, "status": "error", "error": str(e)}
+
+    if not adapter_config.get("roles", {}).get("enabled", True):
+        return {"adapter": adapter_name, "status": "skipped", "reason": "roles disabled"}
+
+    role_format = adapter_config.get("roles", {}).get("format", "markdown")
+    manifest_path = aix_dir / "manifest.json"
+    previous = (load_manifest(manifest_path).get("footprint") or {}).get(adapter_name) or {}
+    previous_roles = previous.get("roles") or {}
+
+    roles: Dict[str, Dict[str, Any]] = {}
+    prompts: Dict[str, str] = {}
+    for role_file in list_role_files(aix_dir / "roles"):
+        content = render_role(role_file, adapter_config, model_set, model_set_name)
+        if content is None:
             continue
+        role_name = role_file.stem
+        metrics = aix_footprint.measure(content, role_format)
+        metrics["tokens_delta"] = aix_footprint.delta(
+            metrics["tokens"], (previous_roles.get(role_name) or {}).get("tokens")
+        )
+        roles[role_name] = metrics
+        prompts[role_name] = aix_footprint.split_prompt(content, role_format)[1]
+
+    total = {
+        "bytes": sum(m["bytes"] for m in roles.values()),
+        "tokens": sum(m["tokens"] for m in roles.values()),
+        "overhead_tokens": sum(m["overhead_tokens"] for m in roles.values()),
+    }
+    previous_tokens = (previous.get("total") or {}).get("tokens")
+    total["tokens_delta"] = aix_footprint.delta(total["tokens"], previous_tokens)
+    growth = aix_footprint.growth_percent(total["tokens"], previous_tokens)
+
+    if record:
+        update_manifest(manifest_path, adapter_name, {
+            "recorded": datetime.utcnow().isoformat() + "Z",
+            "model_set": model_set_name,
+            "total": {"bytes": total["bytes"], "tokens": total["tokens"]},
+            "roles": {
+                name: {"bytes": m["bytes"], "tokens": m["tokens"]} for name, m in roles.items()
+            },
+        }, section="footprint")
+
+    result = {
+        "adapter": adapter_name,
+        "status": "measured",
+        "model_set": model_set_name,
+        "variant": adapter_config.get("roles", {}).get("variant", "full"),
+        "total": total,
+        "growth_percent": growth,
+        "previous_recorded": previous.get("recorded"),
+        "roles": roles,
+        "duplicates": aix_footprint.find_duplicates(prompts),
+    }
+    if compare_variants:
+        result["variants"] = compare_role_variants(aix_dir / "roles", adapter_config, model_set, model_set_name)
+    return result
 
-        if in_adapters:
-            # End of adapters section
-            if line and not line.startswith(" "):
-                break
 
-            # Parse adapter entry: "  claude:"
-            if line.strip().endswith(":") and not line.strip().startswith("#"):
-                adapter_name = line.strip()[:-1]
-                adapters[adapter_name] = None
+def compare_role_variants(
+    roles_dir: Path,
+    adapter_config: Dict[str, Any],
+    model_set: Optional[Dict[str, Any]],
+    model_set_name: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Size every role under each roles.variant.
+
+    The compact total includes the shared file its roles point to, since
+    an agent that follows the pointer pays for it.
+
+    Returns:
+        Dict with per-variant totals, per-role sizes and savings relative
+        to the full variant
+    """
+    role_format = adapter_config.get("roles", {}).get("format", "markdown")
+    report: Dict[str, Any] = {"totals": {}, "roles": {}, "shared": None}
+    for variant in aix_compact.VARIANTS:
+        config = dict(adapter_config, roles=dict(adapter_config.get("roles", {}), variant=variant))
+        total = {"bytes": 0, "tokens": 0}
+        for role_file in list_role_files(roles_dir):
+            content = render_role(role_file, config, model_set, model_set_name)
+            if content is None:
                 continue
+            metrics = aix_footprint.measure(content, role_format)
+            report["roles"].setdefault(role_file.stem, {})[variant] = {
+                "bytes": metrics["bytes"], "tokens": metrics["tokens"]
+            }
+            total["bytes"] += metrics["bytes"]
+            total["tokens"] += metrics["tokens"]
+        shared = render_shared(roles_dir, config)
+        if shared is not None:
+            metrics = aix_footprint.measure(shared, "markdown")
+            report["shared"] = {"path": shared_ref(config), "bytes": metrics["bytes"], "tokens": metrics["tokens"]}
+            total["bytes"] += metrics["bytes"]
+            total["tokens"] += metrics["tokens"]
+        report["totals"][variant] = total
+
+    full = report["totals"]["full"]
+    for variant, total in report["totals"].items():
+        total["savings_tokens"] = full["tokens"] - total["tokens"]
+        total["savings_percent"] = (
+            round(100.0 * total["savings_tokens"] / full["tokens"], 1) if full["tokens"] else 0.0
+        )
+    return report
 
-            # Parse enabled field: "    enabled: true"
-            if "enabled:" in line:
-                parts = line.split("enabled:")
-                if len(parts) == 2:
-                    enabled = parts[1].strip().lower() == "true"
-                    # If disabled, remove from dict
-                    if not enabled and adapter_name and adapter_name in adapters:
-                        del adapters[adapter_name]
-
-            # Parse model_set field: "    model_set: default"
-            if "model_set:" in line:
-                parts = line.split("model_set:")
-                if len(parts) == 2 and adapter_name and adapter_name in adapters:
-                    adapters[adapter_name] = parts[1].strip()
 
-    return adapters
+def list_model_sets(adapter_path: Path) -> List[str]:
+    return sorted(p.stem for p in (adapter_path / "model-sets").glob("*.yaml"))
+
+
+def staging_dir(repo_root: Path, adapter_name: str, model_set_name: str) -> Path:
+    return repo_root / STAGING_ROOT / adapter_name / model_set_name
+
+
+def parse_roles(roles_dir: Path) -> List[Tuple[Path, Dict[str, Any], str, str]]:
+    """
+    Parse every role once.
+
+    Returns:
+        (role file, frontmatter, body, source hash) per valid role
+    """
+    parsed = []
+    for role_file in list_role_files(roles_dir):
+        try:
+            frontmatter, body = parse_role_file(role_file)
+        except ValueError:
+            continue  # Skip invalid role files
+        parsed.append((role_file, frontmatter, body, _digest_file(role_file)))
+    return parsed
+
+
+def _replace_dir(directory: Path, files: Dict[str, str]) -> None:
+    """Write files into a fresh sibling directory, then swap it in."""
+    tmp = directory.with_name(f".{directory.name}.{os.getpid()}.tmp")
+    old = directory.with_name(f".{directory.name}.{os.getpid()}.old")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for name, content in files.items():
+        (tmp / name).write_text(content)
+    if directory.exists():
+        directory.rename(old)
+    tmp.rename(directory)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def stage_model_set(
+    repo_root: Path,
+    adapter_name: str,
+    adapter_config: Dict[str, Any],
+    model_set_name: str,
+    parsed_roles: List[Tuple[Path, Dict[str, Any], str, str]],
+    write: bool = True,
+) -> Dict[str, Any]:
+    """
+    Render an adapter's roles for one model set into its staging directory.
+
+    A staged set whose inputs are unchanged since it was rendered is left
+    as is.
+
+    Returns:
+        Dict with the staging record, per-role model configs and whether
+        the set was rendered ("staged") or reused ("unchanged")
+    """
+    adapter_path = repo_root / ".aix" / "adapters" / adapter_name
+    model_set = load_model_set(adapter_path, model_set_name)
+    directory = staging_dir(repo_root, adapter_name, model_set_name)
+    record: Dict[str, Any] = {
+        "adapter": adapter_name,
+        "model_set": model_set_name,
+        "hash_algo": default_hash_algo(),
+        "model_set_hash": _digest_file(adapter_path / "model-sets" / f"{model_set_name}.yaml"),
+        "adapter_config_hash": _digest_file(adapter_path / "adapter.yaml"),
+    }
+
+    models = {}
+    sources = {}
+    for role_file, _, _, source_hash in parsed_roles:
+        models[role_file.stem] = resolve_model_for_role(role_file.stem, model_set)
+        filename = role_output_path(role_file, adapter_config, Path()).name
+        sources[filename] = (str(role_file.relative_to(repo_root)), source_hash)
+
+    try:
+        previous = json.loads((directory / STAGING_RECORD).read_text())
+    except (OSError, ValueError):
+        previous = {}
+    fresh = all(previous.get(key) == value for key, value in record.items()) and {
+        name: (entry.get("source"), entry.get("source_hash"))
+        for name, entry in (previous.get("outputs") or {}).items()
+    } == sources
+    if fresh:
+        return {"status": "unchanged", "record": previous, "models": models}
+    if not write:
+        return {"status": "stale" if previous else "missing", "record": None, "models": models}
+
+    files = {}
+    outputs = {}
+    for role_file, frontmatter, body, source_hash in parsed_roles:
+        content = render_parsed(
+            role_file.stem, frontmatter, body, adapter_config, models[role_file.stem], model_set_name
+        )
+        filename = role_output_path(role_file, adapter_config, Path()).name
+        files[filename] = content
+        outputs[filename] = {
+            "source": sources[filename][0],
+            "source_hash": source_hash,
+            "hash": compute_content_hash(content),
+        }
+    record["staged"] = datetime.utcnow().isoformat() + "Z"
+    record["outputs"] = outputs
+    files[STAGING_RECORD] = json.dumps(record, indent=2) + "\n"
+    _replace_dir(directory, files)
+    return {"status": "staged", "record": record, "models": models}
+
+
+def matrix_adapter(repo_root: Path, adapter_name: str, write: bool = True) -> Dict[str, Any]:
+    """
+    Resolve and stage every model set of an adapter in one pass.
+
+    Roles and the adapter config are parsed once and rendered per set into
+    .aix/state/model-sets/<adapter>/<set>/. With write=False only the
+    role -> model table is produced.
+
+    Returns:
+        Dict with matrix report
+    """
+    aix_dir = repo_root / ".aix"
+    adapter_path = aix_dir / "adapters" / adapter_name
+
+    try:
+        adapter_config = load_adapter_config(adapter_path)
+    except (FileNotFoundError, ValueError) as e:
+        return {"adapter": adapter_name, "status": "error", "error": str(e)}
+
+    if not adapter_config.get("roles", {}).get("enabled", True):
+        return {"adapter": adapter_name, "status": "skipped", "reason": "roles disabled"}
+    model_sets = list_model_sets(adapter_path)
+    if not adapter_config.get("model_sets", {}).get("enabled") or not model_sets:
+        return {"adapter": adapter_name, "status": "skipped", "reason": "no model sets"}
+
+    parsed_roles = parse_roles(aix_dir / "roles")
+    sets: Dict[str, Dict[str, Any]] = {}
+    try:
+        for model_set_name in model_sets:
+            staged = stage_model_set(
+                repo_root, adapter_name, adapter_config, model_set_name, parsed_roles, write=write
+            )
+            sets[model_set_name] = {"status": staged["status"], "models": staged["models"]}
+    except (OSError, yaml.YAMLError) as e:
+        return {"adapter": adapter_name, "status": "error", "error": str(e)}
+
+    return {
+        "adapter": adapter_name,
+        "status": "staged" if write else "resolved",
+        "staging": str(STAGING_ROOT / adapter_name),
+        "roles": [role_file.stem for role_file, _, _, _ in parsed_roles],
+        "sets": sets,
+    }
+
+
+def activate_model_set(
+    repo_root: Path, adapter_name: str, model_set_name: str, force: bool = False
+) -> Dict[str, Any]:
+    """
+    Point an adapter's agent output directory at a staged model set.
+
+    The output directory becomes a symlink into the staging area, so
+    switching sets is a link swap. A real output directory is only
+    replaced if it holds nothing but files aix generated there, unmodified
+    since (force discards local edits to them). The set is (re)staged
+    first if its inputs changed.
+
+    Args:
+        repo_root: Repository root path
+        adapter_name: Name of adapter to activate
+        model_set_name: Model set to point the output directory at
+        force: If True, replace generated files even if edited locally
+
+    Returns:
+        Dict with activation report
+    """
+    aix_dir = repo_root / ".aix"
+    adapter_path = aix_dir / "adapters" / adapter_name
+    manifest_path = aix_dir / "manifest.json"
+
+    def failed(message: str) -> Dict[str, Any]:
+        return {"adapter": adapter_name, "status": "error", "error": message}
+
+    try:
+        adapter_config = load_adapter_config(adapter_path)
+        output_dir = agent_output_dir(repo_root, adapter_config)
+        if output_dir is None:
+            return failed("No agent output directory configured")
+        staged = stage_model_set(
+            repo_root, adapter_name, adapter_config, model_set_name, parse_roles(aix_dir / "roles")
+        )
+    except (FileNotFoundError, ValueError, OSError, yaml.YAMLError) as e:
+        return failed(str(e))
+
+    target = staging_dir(repo_root, adapter_name, model_set_name)
+    staging_root = (repo_root / STAGING_ROOT).resolve()
+    generated = (load_manifest(manifest_path).get("generated") or {}).get(adapter_name) or {}
+
+    if output_dir.is_symlink():
+        current = output_dir.resolve()
+        if current != staging_root and staging_root not in current.parents:
+            return failed(f"{output_dir.relative_to(repo_root)} is a symlink to {current}; not replacing it")
+    elif output_dir.exists():
+        recorded = set(generated.get("files") or [])
+        entries = list(output_dir.iterdir())
+        foreign = [str(e.relative_to(repo_root)) for e in entries if str(e.relative_to(repo_root)) not in recorded]
+        if foreign:
+            return failed(
+                f"{output_dir.relative_to(repo_root)} has files aix did not generate: {', '.join(sorted(foreign))}"
+            )
+        if not force:
+            algo = generated.get("hash_algo", "sha256")
+            outputs = generated.get("outputs") or {}
+            modified = [
+                rel for rel in (str(e.relative_to(repo_root)) for e in entries)
+                if rel not in outputs or _digest_file(repo_root / rel, algo) != outputs[rel].get("hash")
+            ]
+            if modified:
+                return failed(
+                    f"{output_dir.relative_to(repo_root)} has locally modified files: {', '.join(sorted(modified))}"
+                    " (use --force to discard them)"
+                )
+        for entry in entries:
+            entry.unlink()
+        output_dir.rmdir()
+
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+    link = output_dir.with_name(f".{output_dir.name}.{os.getpid()}.link")
+    link.symlink_to(os.path.relpath(target, output_dir.parent))
+    os.replace(link, output_dir)
+
+    record = staged["record"]
+    outputs = {
+        str((output_dir / filename).relative_to(repo_root)): entry
+        for filename, entry in record["outputs"].items()
+    }
+    update_manifest(manifest_path, adapter_name, {
+        "last_generated": datetime.utcnow().isoformat() + "Z",
+        "model_set": model_set_name,
+        "hash_algo": record["hash_algo"],
+        "model_set_hash": record["model_set_hash"],
+        "adapter_config_hash": record["adapter_config_hash"],
+        "files": sorted(outputs),
+        "outputs": outputs,
+        "staging": str(target.relative_to(repo_root)),
+        # Skills don't depend on the model set; keep their records for --check and the next run
+        **{key: generated[key] for key in ("skills_mirror", "skills_catalog") if key in generated},
+    })
+
+    return {
+        "adapter": adapter_name,
+        "status": "activated",
+        "model_set": model_set_name,
+        "restaged": staged["status"] == "staged",
+        "output": str(output_dir.relative_to(repo_root)),
+        "target": str(target.relative_to(repo_root)),
+    }
 
 
 def generate_adapter(
@@ -522,50 +1558,39 @@ def generate_adapter(
             "error": str(e),
         }
 
-    # Determine model set to use
-    if model_set_name is None:
-        # Use default from adapter config (if one is configured)
-        model_sets_config = adapter_config.get("model_sets", {})
-        if model_sets_config.get("enabled"):
-            default_set = model_sets_config.get("default")
-            if default_set:
-                model_set_name = default_set
-
-    # Load model set (if adapter uses model sets and a set is specified)
-    model_set = None
-    model_set_hash = None
-    if adapter_config.get("model_sets", {}).get("enabled") and model_set_name:
-        try:
-            model_set = load_model_set(adapter_path, model_set_name)
-            model_set_file = adapter_path / "model-sets" / f"{model_set_name}.yaml"
-            model_set_hash = _sha256_file(model_set_file)
-        except FileNotFoundError as e:
-            return {
-                "adapter": adapter_name,
-                "status": "error",
-                "error": str(e),
-            }
+    # Determine and load model set (if adapter uses model sets)
+    try:
+        model_set_name, model_set, model_set_hash = resolve_model_set(
+            adapter_path, adapter_config, model_set_name
+        )
+    except FileNotFoundError as e:
+        return {
+            "adapter": adapter_name,
+            "status": "error",
+            "error": str(e),
+        }
 
     # Get output directories from adapter config
     output_config = adapter_config.get("output", {})
 
-    # Setup skills symlink if configured
+    # Setup skills symlink (or mirror) if configured
     skills_config = adapter_config.get("skills", {})
-    if skills_config.get("strategy") == "symlink":
-        skills_output_key = "skills"
-        if skills_output_key in output_config:
-            skills_output = repo_root / output_config[skills_output_key]
-            skills_source = aix_dir / "skills"
-
-            if not dry_run:
-                create_skills_symlink(skills_output, skills_source)
+    manifest = load_manifest(manifest_path)
+    previous = (manifest.get("generated") or {}).get(adapter_name) or {}
+    skills_mirror = setup_skills(repo_root, adapter_config, previous, dry_run=dry_run, force=force)
+    skills_catalog = build_skills_catalog(repo_root, adapter_config, manifest, previous, dry_run=dry_run, force=force)
+    mirror_info = {"skills_mirror": skills_mirror.pop("record")} if skills_mirror is not None else {}
+    if skills_catalog is not None:
+        mirror_info["skills_catalog"] = skills_catalog.pop("record")
 
     # If adapter has roles disabled (skills-only), skip role generation
     if not adapter_config.get("roles", {}).get("enabled", True):
         generation_info = {
             "last_generated": datetime.utcnow().isoformat() + "Z",
             "skills_symlink": str(output_config.get("skills", "")),
-            "adapter_config_hash": _sha256_file(adapter_path / "adapter.yaml"),
+            "hash_algo": default_hash_algo(),
+            "adapter_config_hash": _digest_file(adapter_path / "adapter.yaml"),
+            **mirror_info,
         }
 
         if not dry_run:
@@ -576,97 +1601,120 @@ def generate_adapter(
             "status": "success",
             "model_set": None,
             "roles_generated": 0,
-            "skills_symlink_created": True,
+            "skills_symlink_created": skills_config.get("strategy") == "symlink",
+            "skills_mirror": skills_mirror,
+            "skills_catalog": skills_catalog,
             "dry_run": dry_run,
         }
 
     # Get output directory for agents/droids
-    agent_output_key = None
-    for key in ["agents", "droids", "agent"]:
-        if key in output_config:
-            agent_output_key = key
-            break
-
-    if agent_output_key is None:
+    output_dir = agent_output_dir(repo_root, adapter_config)
+    if output_dir is None:
         return {
             "adapter": adapter_name,
             "status": "error",
             "error": "No agent output directory configured",
         }
 
-    output_dir = repo_root / output_config[agent_output_key]
+    # An activated model set links the output dir into staging; writing
+    # through the link would overwrite that staged set
+    if not dry_run and output_dir.is_symlink():
+        staging_root = (repo_root / STAGING_ROOT).resolve()
+        if staging_root in output_dir.resolve().parents:
+            output_dir.unlink()
 
-    # Find all role files
-    role_files = [f for f in roles_dir.glob("*.md") if f.name != "_index.md"]
+    renders = [
+        (role_file, render_role(role_file, adapter_config, model_set, model_set_name))
+        for role_file in list_role_files(roles_dir)
+    ]
+
+    # The bootstrap layout links the agents dir to .aix/roles. Writing
+    # through that link would rewrite the canonical roles, so the link is
+    # kept only while it already serves every render; otherwise it becomes
+    # a real directory.
+    linked_roles = links_to_roles(output_dir, roles_dir)
+    if linked_roles and not all(
+        served_by_link(role_output_path(role_file, adapter_config, output_dir), content)
+        for role_file, content in renders if content is not None
+    ):
+        if not output_dir.is_symlink():
+            return {
+                "adapter": adapter_name,
+                "status": "error",
+                "error": f"{output_dir.relative_to(repo_root)} resolves into {roles_dir.relative_to(repo_root)}; "
+                         "not writing over the canonical roles",
+            }
+        if not dry_run:
+            output_dir.unlink()
+        linked_roles = False
 
     # Generate output for each role
     generated_files = []
     skipped_files = []
+    linked_files = []
+    # Input/output fingerprints per output file, for --check
+    outputs: Dict[str, Dict[str, str]] = {}
 
-    for role_file in role_files:
-        role_name = role_file.stem
-
-        # Parse role file
-        try:
-            frontmatter, body = parse_role_file(role_file)
-        except ValueError as e:
-            continue  # Skip invalid role files
-
-        # Resolve model for this role
-        model_config = {}
-        if model_set:
-            model_config = resolve_model_for_role(role_name, model_set)
-
-        # Generate output content (JSON for kiro, markdown for others)
-        role_format = adapter_config.get("roles", {}).get("format", "markdown")
-        if role_format == "json":
-            output_content = generate_json_agent(
-                role_name,
-                frontmatter,
-                body,
-                adapter_config,
-                model_config,
-                model_set_name or "default",
-            )
-        else:
-            output_content = generate_output_file(
-                role_name,
-                frontmatter,
-                body,
-                adapter_config,
-                model_config,
-                model_set_name or "default",
-            )
+    for role_file, output_content in renders:
+        if output_content is None:
+            continue
 
         # Compute hash
         content_hash = compute_content_hash(output_content)
 
         # Build output path
-        filename_template = adapter_config.get("roles", {}).get("filename", "{name}.md")
-        filename = filename_template.format(name=role_name)
-        output_path = output_dir / filename
+        output_path = role_output_path(role_file, adapter_config, output_dir)
+        outputs[str(output_path.relative_to(repo_root))] = {
+            "source": str(role_file.relative_to(repo_root)),
+            "source_hash": _digest_file(role_file),
+            "hash": content_hash,
+        }
+
+        if linked_roles:
+            # Served by the link: record what's on disk so --check can verify it
+            outputs[str(output_path.relative_to(repo_root))]["hash"] = _digest_file(output_path)
+            skipped_files.append(str(output_path.relative_to(repo_root)))
+            continue
 
         # Check if we should skip (hash-based)
         skip = False
         if not force and output_path.exists():
-            existing_hash = _sha256_file(output_path)
+            existing_hash = _digest_file(output_path)
             if existing_hash == content_hash:
                 skip = True
                 skipped_files.append(str(output_path.relative_to(repo_root)))
+                # An unchanged output can still be the link source for other adapters
+                _LINK_SOURCES.setdefault((str(repo_root), content_hash), output_path)
 
         if not skip:
-            if not dry_run:
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                output_path.write_text(output_content)
+            if not dry_run and write_output(repo_root, output_path, output_content, content_hash):
+                linked_files.append(str(output_path.relative_to(repo_root)))
             generated_files.append(str(output_path.relative_to(repo_root)))
 
+    # Sections compact roles moved out (aix:shared markers) go to one shared file
+    shared_content = render_shared(roles_dir, adapter_config)
+    if shared_content is not None:
+        shared_path = repo_root / str(shared_ref(adapter_config))
+        rel = str(shared_path.relative_to(repo_root))
+        content_hash = compute_content_hash(shared_content)
+        outputs[rel] = {"source": str(roles_dir.relative_to(repo_root)), "hash": content_hash}
+        if not force and shared_path.exists() and _digest_file(shared_path) == content_hash:
+            skipped_files.append(rel)
+        else:
+            if not dry_run:
+                write_output(repo_root, shared_path, shared_content, content_hash)
+            generated_files.append(rel)
+
     # Update manifest
     generation_info = {
         "last_generated": datetime.utcnow().isoformat() + "Z",
         "model_set": model_set_name,
+        "hash_algo": default_hash_algo(),
         "model_set_hash": model_set_hash,
-        "adapter_config_hash": _sha256_file(adapter_path / "adapter.yaml"),
+        "adapter_config_hash": _digest_file(adapter_path / "adapter.yaml"),
         "files": generated_files + skipped_files,
+        "outputs": outputs,
+        **mirror_info,
     }
 
     if not dry_run:
@@ -678,13 +1726,265 @@ def generate_adapter(
         "model_set": model_set_name,
         "roles_generated": len(generated_files),
         "roles_skipped": len(skipped_files),
+        "roles_linked": len(linked_files),
         "skills_symlink_created": skills_config.get("strategy") == "symlink",
+        "skills_mirror": skills_mirror,
+        "skills_catalog": skills_catalog,
         "dry_run": dry_run,
         "generated_files": generated_files,
         "skipped_files": skipped_files,
+        "linked_files": linked_files,
     }
 
 
+def run_check(
+    repo_root: Path,
+    adapters: Dict[str, Optional[str]],
+    as_json: bool = False,
+    ndjson: bool = False,
+) -> int:
+    """
+    Check adapters for drift without writing anything.
+
+    Returns:
+        Exit code: 0 if every output is current, 1 otherwise
+    """
+    results = []
+    drifted = 0
+    errors = 0
+    for adapter_name, model_set in adapters.items():
+        result = check_adapter(repo_root, adapter_name, model_set_name=model_set)
+        drifted += len(result.get("drifted", []))
+        errors += result["status"] == "error"
+        if ndjson:
+            print(json.dumps({"type": "check", **result}), flush=True)
+        else:
+            results.append(result)
+
+    exit_code = 1 if drifted or errors else 0
+    if ndjson:
+        print(json.dumps({
+            "type": "summary",
+            "repo_root": str(repo_root),
+            "check": True,
+            "drifted": drifted,
+            "errors": errors,
+        }), flush=True)
+        return exit_code
+
+    if as_json:
+        print(json.dumps({"results": results, "drifted": drifted, "errors": errors}, indent=2))
+        return exit_code
+
+    print("AIX Generate Check")
+    print(f"- Repo: {repo_root}")
+    print()
+    for result in results:
+        print(f"Adapter: {result['adapter']}")
+        print(f"  Status: {result['status']}")
+        if result["status"] == "error":
+            print(f"  Error: {result['error']}")
+            print()
+            continue
+        if result.get("model_set"):
+            print(f"  Model Set: {result['model_set']}")
+        print(f"  Outputs Checked: {result['checked']} ({result['rendered']} rendered)")
+        if result["drifted"]:
+            print("  Drifted Files:")
+            for item in result["drifted"]:
+                print(f"    - {item['path']} ({item['reason']})")
+        if result["orphaned"]:
+            print("  Orphaned Files (role removed):")
+            for path in result["orphaned"]:
+                print(f"    - {path}")
+        print()
+
+    if drifted:
+        print(f"{drifted} generated file(s) out of date. Run: python3 .aix/scripts/aix-generate.py --all")
+    return exit_code
+
+
+def _model_label(model_config: Dict[str, Any]) -> str:
+    if not model_config:
+        return "-"
+    label = str(model_config.get("model", "-"))
+    if model_config.get("reasoningEffort"):
+        label += f"/{model_config['reasoningEffort']}"
+    return label
+
+
+def run_matrix(
+    repo_root: Path,
+    adapters: Dict[str, Optional[str]],
+    write: bool = True,
+    as_json: bool = False,
+    ndjson: bool = False,
+) -> int:
+    """
+    Resolve (and stage) every model set per adapter and print the matrix.
+
+    Returns:
+        Exit code: 1 if any adapter errored
+    """
+    results = []
+    errors = 0
+    for adapter_name in adapters:
+        result = matrix_adapter(repo_root, adapter_name, write=write)
+        errors += result["status"] == "error"
+        if ndjson:
+            print(json.dumps({"type": "matrix", **result}), flush=True)
+        else:
+            results.append(result)
+
+    if ndjson:
+        print(json.dumps({
+            "type": "summary",
+            "repo_root": str(repo_root),
+            "matrix": True,
+            "staged": write,
+            "errors": errors,
+        }), flush=True)
+        return 1 if errors else 0
+
+    if as_json:
+        print(json.dumps({"results": results, "staged": write}, indent=2))
+        return 1 if errors else 0
+
+    print("AIX Model Set Matrix")
+    print(f"- Repo: {repo_root}")
+    print(f"- Staged: {write}")
+    print()
+    for result in results:
+        print(f"Adapter: {result['adapter']}")
+        if result["status"] in ("error", "skipped"):
+            print(f"  Status: {result['status']}")
+            print(f"  {'Error' if result['status'] == 'error' else 'Reason'}: "
+                  f"{result.get('error') or result.get('reason')}")
+            print()
+            continue
+        sets = result["sets"]
+        if write:
+            print(f"  Staging: {result['staging']}")
+        print("  Sets: " + ", ".join(f"{name} ({info['status']})" for name, info in sets.items()))
+        rows = [["Role", *sets]]
+        for role in result["roles"]:
+            rows.append([role, *(_model_label(info["models"].get(role, {})) for info in sets.values())])
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        for row in rows:
+            print("  " + "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+        print()
+    return 1 if errors else 0
+
+
+def _signed(value: Optional[int]) -> str:
+    return "new" if value is None else f"{value:+,}"
+
+
+def run_footprint(
+    repo_root: Path,
+    adapters: Dict[str, Optional[str]],
+    record: bool = True,
+    max_growth: Optional[float] = None,
+    as_json: bool = False,
+    ndjson: bool = False,
+    compare_variants: bool = False,
+) -> int:
+    """
+    Report prompt footprint per adapter and role.
+
+    Returns:
+        Exit code: 1 if an adapter errored or grew more than max_growth percent
+    """
+    results = []
+    failed = 0
+    for adapter_name, model_set in adapters.items():
+        result = footprint_adapter(
+            repo_root, adapter_name, model_set_name=model_set, record=record, compare_variants=compare_variants
+        )
+        growth = result.get("growth_percent")
+        result["over_budget"] = max_growth is not None and growth is not None and growth > max_growth
+        failed += result["status"] == "error" or result["over_budget"]
+        if ndjson:
+            print(json.dumps({"type": "footprint", **result}), flush=True)
+        else:
+            results.append(result)
+
+    exit_code = 1 if failed else 0
+    if ndjson:
+        print(json.dumps({
+            "type": "summary",
+            "repo_root": str(repo_root),
+            "footprint": True,
+            "recorded": record,
+            "failed": failed,
+        }), flush=True)
+        return exit_code
+
+    if as_json:
+        print(json.dumps({"results": results, "recorded": record}, indent=2))
+        return exit_code
+
+    print("AIX Prompt Footprint")
+    print(f"- Repo: {repo_root}")
+    print(f"- Recorded: {record}")
+    print()
+    for result in results:
+        print(f"Adapter: {result['adapter']}")
+        if result["status"] != "measured":
+            print(f"  Status: {result['status']}")
+            print(f"  {'Error' if result['status'] == 'error' else 'Reason'}: "
+                  f"{result.get('error') or result.get('reason')}")
+            print()
+            continue
+        if result.get("model_set"):
+            print(f"  Model Set: {result['model_set']}")
+        if result["variant"] != "full":
+            print(f"  Variant: {result['variant']}")
+        total = result["total"]
+        line = f"  Total: {total['bytes']:,} bytes, ~{total['tokens']:,} tokens ({_signed(total['tokens_delta'])}"
+        if result["growth_percent"] is not None:
+            line += f", {result['growth_percent']:+.1f}%"
+        if result["previous_recorded"]:
+            line += f" since {result['previous_recorded']}"
+        print(line + ")")
+        print(f"  Frontmatter Overhead: ~{total['overhead_tokens']:,} tokens")
+        if result["over_budget"]:
+            print(f"  Over Budget: grew more than {max_growth}%")
+        print("  Roles:")
+        width = max((len(name) for name in result["roles"]), default=0)
+        for name, metrics in sorted(result["roles"].items(), key=lambda item: -item[1]["tokens"]):
+            print(
+                f"    {name:<{width}}  {metrics['bytes']:>8,} B  {'~' + format(metrics['tokens'], ','):>8} tok  "
+                f"overhead ~{metrics['overhead_tokens']:,} tok  ({_signed(metrics['tokens_delta'])})"
+            )
+        if result["duplicates"]:
+            print("  Duplicated Paragraphs:")
+            for dup in result["duplicates"]:
+                print(
+                    f"    - \"{dup['preview']}...\" in {', '.join(dup['roles'])} "
+                    f"(~{dup['tokens']:,} tok each, ~{dup['savings_tokens']:,} tok if shared)"
+                )
+        if result.get("variants"):
+            comparison = result["variants"]
+            print("  Variants:")
+            for variant, totals in comparison["totals"].items():
+                line = f"    {variant:<8}  {totals['bytes']:>8,} B  {'~' + format(totals['tokens'], ','):>8} tok"
+                if variant != "full":
+                    line += f"  (saves ~{totals['savings_tokens']:,} tok, {totals['savings_percent']:.1f}%)"
+                print(line)
+            if comparison["shared"]:
+                shared = comparison["shared"]
+                print(f"    Shared file {shared['path']}: ~{shared['tokens']:,} tok (counted in compact)")
+            width = max((len(name) for name in comparison["roles"]), default=0)
+            for name, sizes in sorted(comparison["roles"].items()):
+                cells = "  ".join(
+                    f"{variant} ~{sizes[variant]['tokens']:,}" for variant in aix_compact.VARIANTS if variant in sizes
+                )
+                print(f"      {name:<{width}}  {cells} tok")
+        print()
+    return exit_code
+
+
 def main() -> None:
     """Main entry point for aix-generate script."""
     parser = argparse.ArgumentParser(
@@ -711,43 +2011,125 @@ def main() -> None:
     parser.add_argument(
         "--force",
         action="store_true",
-        help="Regenerate all files even if unchanged",
+        help="Regenerate all files even if unchanged (with --activate-model-set: discard local edits)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Verify generated files are current without writing; exit 1 on drift",
+    )
+    parser.add_argument(
+        "--footprint",
+        action="store_true",
+        help="Report prompt size per role and record it in the manifest (--dry-run: don't record)",
+    )
+    parser.add_argument(
+        "--model-set-matrix",
+        action="store_true",
+        help="Resolve every model set in one pass and stage each under .aix/state/model-sets "
+             "(--dry-run: table only)",
+    )
+    parser.add_argument(
+        "--activate-model-set",
+        metavar="SET",
+        help="Point the adapter's agent output at a staged model set (symlink swap)",
+    )
+    parser.add_argument(
+        "--max-growth",
+        type=float,
+        metavar="PERCENT",
+        help="With --footprint, exit 1 if an adapter's tokens grew more than PERCENT since the last run",
+    )
+    parser.add_argument(
+        "--compare-variants",
+        action="store_true",
+        help="With --footprint, also size every role as each roles.variant (full, compact)",
     )
     parser.add_argument(
         "--repo-root",
         help="Path to repository root (default: git root)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write the worktree-shared cache (<git common dir>/aix-cache)",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
         help="Output results as JSON",
     )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream one JSON record per adapter as it finishes, then a summary record",
+    )
 
     args = parser.parse_args()
 
     # Determine repo root
-    repo_root = Path(args.repo_root) if args.repo_root else _git_root()
+    repo_root = Path(args.repo_root) if args.repo_root else git_root()
+    # --check writes nothing, so it only reads the shared cache
+    if not args.no_cache and use_cache(repo_root, read_only=args.check) is not None and not args.check:
+        atexit.register(close_cache)
 
     # Determine which adapters to generate
     adapters_to_generate: Dict[str, Optional[str]] = {}
 
     if args.all:
-        # Get enabled adapters from tier.yaml
-        adapters_to_generate = get_enabled_adapters(repo_root)
-        if not adapters_to_generate:
-            # If no tier.yaml config, generate all available adapters
-            adapters_dir = repo_root / ".aix" / "adapters"
-            if adapters_dir.exists():
-                for adapter_dir in adapters_dir.iterdir():
-                    if adapter_dir.is_dir() and not adapter_dir.name.startswith("_"):
-                        adapters_to_generate[adapter_dir.name] = None
+        adapters_to_generate = resolve_all_adapters(repo_root)
     elif args.adapter:
         adapters_to_generate[args.adapter] = args.model_set
     else:
         parser.error("Must specify --adapter or --all")
 
-    # Generate each adapter
+    if args.activate_model_set:
+        if not args.adapter or args.all:
+            parser.error("--activate-model-set requires --adapter")
+        result = activate_model_set(repo_root, args.adapter, args.activate_model_set, force=args.force)
+        if args.json or args.ndjson:
+            print(json.dumps(result if args.ndjson else {"results": [result]}, indent=None if args.ndjson else 2))
+        elif result["status"] == "error":
+            print(f"Error: {result['error']}")
+        else:
+            print(f"Adapter: {result['adapter']}")
+            print(f"  Model Set: {result['model_set']} (activated{', restaged' if result['restaged'] else ''})")
+            print(f"  Output: {result['output']} -> {result['target']}")
+        sys.exit(1 if result["status"] == "error" else 0)
+
+    if args.model_set_matrix:
+        if args.check or args.footprint or args.force or args.model_set:
+            parser.error("--model-set-matrix cannot be combined with --check, --footprint, --force or --model-set")
+        sys.exit(run_matrix(
+            repo_root, adapters_to_generate, write=not args.dry_run, as_json=args.json, ndjson=args.ndjson
+        ))
+
+    if args.max_growth is not None and not args.footprint:
+        parser.error("--max-growth requires --footprint")
+    if args.compare_variants and not args.footprint:
+        parser.error("--compare-variants requires --footprint")
+
+    if args.footprint:
+        if args.check or args.force:
+            parser.error("--footprint cannot be combined with --check or --force")
+        sys.exit(run_footprint(
+            repo_root,
+            adapters_to_generate,
+            record=not args.dry_run,
+            max_growth=args.max_growth,
+            as_json=args.json,
+            ndjson=args.ndjson,
+            compare_variants=args.compare_variants,
+        ))
+
+    if args.check:
+        if args.dry_run or args.force:
+            parser.error("--check cannot be combined with --dry-run or --force")
+        sys.exit(run_check(repo_root, adapters_to_generate, as_json=args.json, ndjson=args.ndjson))
+
+    # Generate each adapter (streamed immediately with --ndjson)
     results = []
+    summary: Dict[str, int] = {"roles_generated": 0, "roles_skipped": 0}
     for adapter_name, model_set in adapters_to_generate.items():
         result = generate_adapter(
             repo_root,
@@ -756,7 +2138,23 @@ def main() -> None:
             dry_run=args.dry_run,
             force=args.force,
         )
-        results.append(result)
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+        summary["roles_generated"] += result.get("roles_generated", 0)
+        summary["roles_skipped"] += result.get("roles_skipped", 0)
+        if args.ndjson:
+            print(json.dumps({"type": "result", **result}), flush=True)
+        else:
+            results.append(result)
+
+    if args.ndjson:
+        print(json.dumps({
+            "type": "summary",
+            "repo_root": str(repo_root),
+            "dry_run": args.dry_run,
+            "force": args.force,
+            "summary": summary,
+        }), flush=True)
+        return
 
     # Output results
     if args.json:
@@ -782,7 +2180,21 @@ def main() -> None:
                     print(f"  Model Set: {result['model_set']}")
                 print(f"  Roles Generated: {result.get('roles_generated', 0)}")
                 print(f"  Roles Skipped: {result.get('roles_skipped', 0)}")
-                print(f"  Skills Symlink: {result.get('skills_symlink_created', False)}")
+                if result.get("roles_linked"):
+                    print(f"  Roles Hardlinked: {result['roles_linked']} (identical to another adapter's output)")
+                mirror = result.get("skills_mirror")
+                if mirror is not None:
+                    print(
+                        f"  Skills Mirror: {len(mirror['added'])} added, {len(mirror['updated'])} updated, "
+                        f"{len(mirror['removed'])} removed, {len(mirror['unchanged'])} unchanged"
+                        + (f" ({mirror['copied']} file(s) copied, not linked)" if mirror["copied"] else "")
+                    )
+                else:
+                    print(f"  Skills Symlink: {result.get('skills_symlink_created', False)}")
+                catalog = result.get("skills_catalog")
+                if catalog is not None:
+                    state = f"{catalog['parsed']} re-read" if catalog["written"] else "unchanged"
+                    print(f"  Skills Catalog: {catalog['path']} ({catalog['skills']} skills, {state})")
 
                 if result.get("generated_files"):
                     print(f"  Generated Files:")
@@ -0,0 +1,599 @@
+#!/usr/bin/env python3
+"""
+Replay recorded hook inputs through the Claude Code hooks and time them.
+
+validate-bash.sh, pre-compact.sh and post-compact.sh run inside the
+agent's tool-call loop, so their latency is paid on every call. This
+harness feeds hook-input payloads to each hook as the agent would (JSON on
+stdin, one process per call) and reports per hook:
+
+    - p50 / p95 / p99 / mean latency
+    - processes spawned per call (the hook itself included)
+    - gh invocations
+    - decision distribution (allow / deny / ask, context, ok, error), and
+      mismatches against expected decisions recorded in the payloads
+
+Several hooks, or several versions of one hook (--rev), run side by side:
+calls are interleaved round-robin so drift in machine load hits every
+target alike, and each target is compared with the first target of its
+kind.
+
+Everything runs offline. Hooks run in a throwaway git repository (or a
+copy of --fixture), one copy per target so one hook's PR cache or handoff
+file never warms another's, with a stub gh first on PATH that answers
+"[]" after --gh-delay seconds and logs each call.
+
+Payload files (--payloads):
+    *.jsonl   one hook-input object per line
+    *.json    a list of hook-input objects, or {"cases": [...]} in the
+              validate-bash.cases.json format
+    *.txt     one bash command per line (wrapped as Bash tool input)
+An object with a "command" key is wrapped as Bash tool input and its
+"decision" is the expected decision. Payloads go to validate-bash and
+custom hooks; without --payloads, validate-bash replays the
+validate-bash.cases.json next to it. The compaction hooks always get a
+minimal trigger payload.
+
+Spawn counts come from the kernel's fork counter (/proc/stat), so they
+are exact on an idle machine and inflated by anything else running; they
+are reported as unavailable off Linux.
+
+Usage:
+    python3 .aix/scripts/aix-hook-bench.py
+    python3 .aix/scripts/aix-hook-bench.py --hook .aix/hooks/validate-bash.sh --payloads commands.jsonl --runs 5000
+    python3 .aix/scripts/aix-hook-bench.py --hook .aix/hooks/validate-bash.sh --rev HEAD~5 --warm
+    python3 .aix/scripts/aix-hook-bench.py --hook old=/tmp/v1/pre-compact.sh --hook new=.aix/hooks/pre-compact.sh --gh-delay 0.5
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from aix_git import git_root, is_repo
+
+HOOK_NAMES = ("validate-bash.sh", "pre-compact.sh", "post-compact.sh")
+DEFAULT_RUNS = 200
+DEFAULT_WARMUP = 3
+DEFAULT_TIMEOUT = 10.0
+PERCENTILES = (50, 95, 99)
+
+DEFAULT_PAYLOADS: Dict[str, List[Dict[str, Any]]] = {
+    "validate-bash": [
+        {"tool_name": "Bash", "tool_input": {"command": "git status"}},
+        {"tool_name": "Bash", "tool_input": {"command": "npm test"}},
+        {"tool_name": "Bash", "tool_input": {"command": "npx prisma migrate reset"}},
+    ],
+    "pre-compact": [{"hook_event_name": "PreCompact", "trigger": "auto"}],
+    "post-compact": [{"hook_event_name": "SessionStart", "source": "compact"}],
+}
+
+GH_STUB = """#!/bin/sh
+# gh stub for aix-hook-bench: log the call, wait, answer with no PRs
+printf '%s\\n' "$*" >> "{log}"
+sleep {delay}
+printf '[]\\n'
+"""
+
+FIXTURE_HANDOFF = """# Session Handoff
+
+## Current Phase: implementation
+## Completed By: coder
+## Status: in_progress
+## Summary: Benchmark fixture
+"""
+
+
+class BenchError(Exception):
+    """Raised when a hook, payload file or fixture can't be set up."""
+
+
+class Payload(NamedTuple):
+    data: bytes
+    expected: Optional[str]
+
+
+class Target(NamedTuple):
+    label: str
+    kind: str
+    hook: Path
+    warm: bool
+
+
+def hook_kind(path: Path) -> str:
+    for name in HOOK_NAMES:
+        if path.name.startswith(name[:-3]):
+            return name[:-3]
+    return "custom"
+
+
+def _bash_payload(command: str) -> Dict[str, Any]:
+    return {"hook_event_name": "PreToolUse", "tool_name": "Bash", "tool_input": {"command": command}}
+
+
+def _payload(item: Any) -> Payload:
+    if isinstance(item, dict) and "command" in item and "tool_input" not in item:
+        return Payload(json.dumps(_bash_payload(item["command"])).encode(), item.get("decision"))
+    if not isinstance(item, dict):
+        return Payload(json.dumps(item).encode(), None)
+    item = dict(item)
+    expected = item.pop("expected", None)
+    return Payload(json.dumps(item).encode(), expected)
+
+
+def load_payloads(path: Path) -> List[Payload]:
+    """
+    Read a payload file (.jsonl, .json or .txt; see the module docstring).
+
+    Raises:
+        BenchError: If the file is missing, malformed or empty
+    """
+    try:
+        text = path.read_text()
+    except OSError as e:
+        raise BenchError(f"Can't read payloads {path}: {e}") from e
+    try:
+        if path.suffix == ".txt":
+            items: List[Any] = [{"command": line} for line in text.splitlines() if line.strip()]
+        elif path.suffix == ".jsonl":
+            items = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            data = json.loads(text)
+            items = data.get("cases", [data]) if isinstance(data, dict) else data
+    except ValueError as e:
+        raise BenchError(f"Invalid payloads {path}: {e}") from e
+    if not items:
+        raise BenchError(f"No payloads in {path}")
+    return [_payload(item) for item in items]
+
+
+def default_payloads(target: Target) -> List[Payload]:
+    if target.kind == "validate-bash":
+        cases = target.hook.parent / "validate-bash.cases.json"
+        if cases.exists():
+            return load_payloads(cases)
+    if target.kind not in DEFAULT_PAYLOADS:
+        raise BenchError(f"{target.hook} isn't a known hook; pass --payloads")
+    return [Payload(json.dumps(item).encode(), None) for item in DEFAULT_PAYLOADS[target.kind]]
+
+
+def find_hooks(repo_root: Path) -> List[Path]:
+    """Installed hooks (.aix/hooks) if present, else the framework tiers this script ships with."""
+    framework = Path(__file__).resolve().parent.parent
+    search = [repo_root / ".aix" / "hooks", framework / "hooks"]
+    search += sorted((framework / "tiers").glob("*/hooks"))
+    found: List[Path] = []
+    for name in HOOK_NAMES:
+        for directory in search:
+            if (directory / name).is_file():
+                found.append(directory / name)
+                break
+    return found
+
+
+def extract_revision(hook: Path, rev: str, dest: Path) -> Path:
+    """
+    Check out a hook's directory (only that directory) as of a git revision.
+
+    Returns:
+        Path of the hook inside dest
+
+    Raises:
+        BenchError: If the hook isn't tracked or doesn't exist at rev
+    """
+    hook_dir = hook.resolve().parent
+    if not is_repo(hook_dir):
+        raise BenchError(f"--rev needs {hook} to be in a git repository")
+    root = git_root(hook_dir)
+    prefix = hook_dir.relative_to(root.resolve()).as_posix()
+    archive = subprocess.run(
+        ["git", "-C", str(root), "archive", "--format=tar", f"{rev}:{prefix}"], capture_output=True
+    )
+    if archive.returncode != 0:
+        raise BenchError(f"Can't read {hook.name} at {rev}: {archive.stderr.decode(errors='replace').strip()}")
+    with tarfile.open(fileobj=io.BytesIO(archive.stdout)) as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(dest, filter="data")
+        else:
+            tar.extractall(dest)
+    extracted = dest / hook.name
+    if not extracted.is_file():
+        raise BenchError(f"{hook.name} doesn't exist at {rev}")
+    return extracted
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=aix-bench", "-c", "user.email=bench@aix.invalid", *args],
+        cwd=repo, check=True, capture_output=True,
+    )
+
+
+def build_fixture(path: Path) -> None:
+    """A small repository on a feature branch with history and uncommitted changes."""
+    path.mkdir(parents=True)
+    _git(path, "init", "-q")
+    _git(path, "checkout", "-q", "-b", "main")
+    for index in range(5):
+        (path / "src").mkdir(exist_ok=True)
+        (path / "src" / f"module_{index}.py").write_text(f"VALUE = {index}\n")
+        _git(path, "add", "-A")
+        _git(path, "commit", "-q", "-m", f"Add module {index}")
+    _git(path, "checkout", "-q", "-b", "feat/hook-bench")
+    (path / "src" / "module_0.py").write_text("VALUE = 10\n")
+    (path / "notes.txt").write_text("untracked\n")
+    (path / ".aix" / "state").mkdir(parents=True)
+    (path / ".aix-handoff.md").write_text(FIXTURE_HANDOFF)
+
+
+def _forks() -> Optional[int]:
+    """Processes created since boot (Linux), or None."""
+    try:
+        with open("/proc/stat") as handle:
+            for line in handle:
+                if line.startswith("processes "):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def classify(returncode: Optional[int], stdout: bytes) -> str:
+    """Map a hook's result to its decision: the permission decision, context, ok, error or timeout."""
+    if returncode is None:
+        return "timeout"
+    if returncode != 0:
+        return "error"
+    try:
+        output = json.loads(stdout) if stdout.strip() else {}
+    except ValueError:
+        return "invalid-output"
+    specific = (output.get("hookSpecificOutput") or {}) if isinstance(output, dict) else {}
+    if specific.get("permissionDecision"):
+        return str(specific["permissionDecision"])
+    if specific.get("additionalContext") is not None:
+        return "context"
+    return "ok"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    if not samples:
+        return 0.0
+    rank = max(1, -(-len(samples) * pct // 100))
+    return samples[int(rank) - 1]
+
+
+class Runner:
+    """One target's fixture, environment and measurements."""
+
+    def __init__(self, target: Target, fixture: Path, bin_dir: Path, timeout: float) -> None:
+        self.target = target
+        self.fixture = fixture
+        self.timeout = timeout
+        self.gh_log = bin_dir / "gh.log"
+        self.port_file = fixture / ".aix" / "state" / "validate-bash.port"
+        self.env = dict(os.environ)
+        self.env["PATH"] = f"{bin_dir}{os.pathsep}{self.env.get('PATH', '')}"
+        self.env["AIX_VALIDATE_BASH_PORT_FILE"] = str(self.port_file)
+        # Cold targets must stay cold: never let the hook start a server
+        self.env.pop("AIX_VALIDATE_BASH_SERVER", None)
+        hook = str(target.hook)
+        self.argv = [hook] if os.access(hook, os.X_OK) else ["bash", hook]
+        self.latencies: List[float] = []
+        self.spawns: List[int] = []
+        self.decisions: Counter = Counter()
+        self.mismatches: List[Dict[str, Any]] = []
+        self.server: Optional[subprocess.Popen] = None
+
+    def start_server(self) -> None:
+        engine = self.target.hook.parent / "validate_bash.py"
+        if not engine.exists():
+            raise BenchError(f"--warm needs {engine}")
+        self.server = subprocess.Popen(
+            [sys.executable, "-I", "-S", str(engine), "--serve", "--port-file", str(self.port_file)],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + self.timeout
+        while not self.port_file.exists():
+            if time.monotonic() > deadline or self.server.poll() is not None:
+                raise BenchError(f"validate-bash server for {self.target.label} didn't start")
+            time.sleep(0.01)
+
+    def stop_server(self) -> None:
+        if self.server is not None and self.server.poll() is None:
+            self.server.send_signal(signal.SIGTERM)
+            try:
+                self.server.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.server.kill()
+
+    def call(self, payload: Payload, record: bool = True) -> None:
+        before = _forks()
+        start = time.perf_counter()
+        try:
+            result = subprocess.run(
+                self.argv, input=payload.data, cwd=self.fixture, env=self.env,
+                capture_output=True, timeout=self.timeout,
+            )
+            returncode: Optional[int] = result.returncode
+            stdout = result.stdout
+        except subprocess.TimeoutExpired:
+            returncode, stdout = None, b""
+        elapsed = (time.perf_counter() - start) * 1000
+        after = _forks()
+        if not record:
+            return
+        decision = classify(returncode, stdout)
+        self.latencies.append(elapsed)
+        if before is not None and after is not None:
+            self.spawns.append(after - before)
+        self.decisions[decision] += 1
+        if payload.expected is not None and decision != payload.expected:
+            self.mismatches.append({
+                "payload": payload.data.decode(errors="replace"),
+                "expected": payload.expected,
+                "decision": decision,
+            })
+
+    def report(self) -> Dict[str, Any]:
+        samples = sorted(self.latencies)
+        gh_calls = len(self.gh_log.read_text().splitlines()) if self.gh_log.exists() else 0
+        return {
+            "label": self.target.label,
+            "kind": self.target.kind,
+            "hook": str(self.target.hook),
+            "warm": self.target.warm,
+            "runs": len(samples),
+            "latency_ms": {
+                **{f"p{pct}": round(percentile(samples, pct), 2) for pct in PERCENTILES},
+                "mean": round(sum(samples) / len(samples), 2) if samples else 0.0,
+                "max": round(samples[-1], 2) if samples else 0.0,
+            },
+            "spawns_per_call": round(sum(self.spawns) / len(self.spawns), 2) if self.spawns else None,
+            "spawns_max": max(self.spawns) if self.spawns else None,
+            "gh_calls": gh_calls,
+            "decisions": dict(self.decisions.most_common()),
+            "mismatches": self.mismatches,
+        }
+
+
+def bench(
+    targets: List[Target],
+    payloads: Optional[List[Payload]],
+    runs: int,
+    warmup: int,
+    fixture: Optional[Path],
+    work_dir: Path,
+    gh_delay: float,
+    timeout: float,
+) -> List[Dict[str, Any]]:
+    """
+    Replay payloads through every target, interleaved, and report each.
+
+    Args:
+        targets: Hooks to run
+        payloads: Inputs for validate-bash and custom hooks (None: defaults)
+        runs: Recorded calls per target, cycling through the payloads
+        warmup: Unrecorded calls per target before timing starts
+        fixture: Repository to copy per target (None: build one)
+        work_dir: Scratch directory for fixtures and stubs
+        gh_delay: Seconds the gh stub waits before answering
+        timeout: Seconds before a call counts as timed out
+
+    Returns:
+        One report per target, with a comparison to the first target of
+        the same kind
+    """
+    template = work_dir / "fixture"
+    if fixture is not None:
+        shutil.copytree(fixture, template, symlinks=True)
+    else:
+        build_fixture(template)
+
+    runners: List[Runner] = []
+    inputs: List[List[Payload]] = []
+    try:
+        for index, target in enumerate(targets):
+            target_dir = work_dir / f"target-{index}"
+            bin_dir = target_dir / "bin"
+            bin_dir.mkdir(parents=True)
+            stub = bin_dir / "gh"
+            stub.write_text(GH_STUB.format(log=bin_dir / "gh.log", delay=gh_delay))
+            stub.chmod(0o755)
+            shutil.copytree(template, target_dir / "repo", symlinks=True)
+            runner = Runner(target, target_dir / "repo", bin_dir, timeout)
+            if target.warm:
+                runner.start_server()
+            runners.append(runner)
+            takes_payloads = payloads and target.kind in ("validate-bash", "custom")
+            inputs.append(payloads if takes_payloads else default_payloads(target))
+
+        for call in range(warmup):
+            for runner, items in zip(runners, inputs):
+                runner.call(items[call % len(items)], record=False)
+        for runner in runners:
+            if runner.gh_log.exists():
+                runner.gh_log.unlink()
+        for call in range(runs):
+            for runner, items in zip(runners, inputs):
+                runner.call(items[call % len(items)])
+    finally:
+        for runner in runners:
+            runner.stop_server()
+
+    reports = [runner.report() for runner in runners]
+    baselines: Dict[str, Dict[str, Any]] = {}
+    for report in reports:
+        baseline = baselines.setdefault(report["kind"], report)
+        report["baseline"] = baseline["label"] if baseline is not report else None
+        base_p50 = baseline["latency_ms"]["p50"]
+        report["p50_vs_baseline"] = (
+            round(report["latency_ms"]["p50"] / base_p50, 2) if baseline is not report and base_p50 else None
+        )
+    return reports
+
+
+def parse_hook_spec(spec: str) -> Target:
+    """[LABEL=]PATH for --hook."""
+    label, sep, path = spec.partition("=")
+    if not sep:
+        label, path = "", spec
+    hook = Path(path)
+    if not hook.is_file():
+        raise BenchError(f"No hook at {hook}")
+    # Hooks run with the fixture as their working directory
+    hook = hook.resolve()
+    return Target(label or hook.name, hook_kind(hook), hook, False)
+
+
+def print_reports(reports: List[Dict[str, Any]], runs: int, warmup: int, fixture: str, gh_delay: float) -> None:
+    print("AIX Hook Benchmark")
+    print(f"- Runs: {runs} per hook ({warmup} warmup), interleaved")
+    print(f"- Fixture: {fixture}")
+    print(f"- gh: stubbed, {gh_delay}s per call")
+    print()
+    width = max(len(report["label"]) for report in reports)
+    print(f"  {'Hook':<{width}}  {'p50':>7}  {'p95':>7}  {'p99':>7}  {'mean':>7}  {'spawns':>6}  {'gh':>4}  vs")
+    for report in reports:
+        latency = report["latency_ms"]
+        spawns = "n/a" if report["spawns_per_call"] is None else f"{report['spawns_per_call']:.1f}"
+        ratio = f"{report['p50_vs_baseline']:.2f}x {report['baseline']}" if report["p50_vs_baseline"] else "-"
+        print(
+            f"  {report['label']:<{width}}  {latency['p50']:>7.1f}  {latency['p95']:>7.1f}  "
+            f"{latency['p99']:>7.1f}  {latency['mean']:>7.1f}  {spawns:>6}  {report['gh_calls']:>4}  {ratio}"
+        )
+    print("  (latency in ms; spawns per call include the hook itself)")
+    print()
+    print("Decisions:")
+    for report in reports:
+        decisions = ", ".join(f"{name} {count}" for name, count in report["decisions"].items())
+        print(f"  {report['label']}: {decisions}")
+        for mismatch in report["mismatches"][:5]:
+            print(f"    - expected {mismatch['expected']}, got {mismatch['decision']}: {mismatch['payload']}")
+        if len(report["mismatches"]) > 5:
+            print(f"    - ... {len(report['mismatches']) - 5} more mismatches")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Claude Code hooks by replaying recorded inputs")
+    parser.add_argument(
+        "--hook",
+        action="append",
+        metavar="[LABEL=]PATH",
+        help="Hook script to benchmark (repeatable; default: validate-bash, pre-compact and post-compact)",
+    )
+    parser.add_argument(
+        "--payloads", help="Hook inputs to replay through validate-bash and custom hooks (.jsonl, .json or .txt)"
+    )
+    parser.add_argument(
+        "--rev",
+        action="append",
+        default=[],
+        help="Also benchmark each hook as of this git revision (repeatable)",
+    )
+    parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="Also benchmark validate-bash hooks against a running warm policy server (versions that have one)",
+    )
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"Timed calls per hook (default: {DEFAULT_RUNS})")
+    parser.add_argument(
+        "--warmup", type=int, default=DEFAULT_WARMUP, help=f"Untimed calls per hook first (default: {DEFAULT_WARMUP})"
+    )
+    parser.add_argument("--gh-delay", type=float, default=0.0, help="Seconds the gh stub takes to answer (default: 0)")
+    parser.add_argument(
+        "--timeout", type=float, default=DEFAULT_TIMEOUT, help=f"Seconds per call (default: {DEFAULT_TIMEOUT:g})"
+    )
+    parser.add_argument("--fixture", help="Git repository to copy as each hook's working directory")
+    parser.add_argument("--keep-fixture", action="store_true", help="Keep the scratch directory and print its path")
+    parser.add_argument(
+        "--max-p95",
+        type=float,
+        metavar="MS",
+        help="Exit 1 if any hook's p95 latency is above MS",
+    )
+    parser.add_argument("--repo-root", help="Path to repository root (default: git root)")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    args = parser.parse_args()
+
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+
+    try:
+        if args.hook:
+            targets = [parse_hook_spec(spec) for spec in args.hook]
+        else:
+            repo_root = Path(args.repo_root) if args.repo_root else (git_root() if is_repo() else Path.cwd())
+            targets = [Target(hook.name, hook_kind(hook), hook, False) for hook in find_hooks(repo_root)]
+            if not targets:
+                parser.error("No hooks found; pass --hook")
+        payloads = load_payloads(Path(args.payloads)) if args.payloads else None
+        fixture = Path(args.fixture) if args.fixture else None
+        if fixture is not None and not is_repo(fixture):
+            raise BenchError(f"--fixture {fixture} is not a git repository")
+
+        work_dir = Path(tempfile.mkdtemp(prefix="aix-hook-bench-"))
+        try:
+            current = list(targets)
+            for index, rev in enumerate(args.rev):
+                for target in current:
+                    hook = extract_revision(target.hook, rev, work_dir / f"rev-{index}")
+                    targets.append(Target(f"{target.label}@{rev}", target.kind, hook, False))
+            if args.warm:
+                targets += [
+                    Target(f"{target.label} (warm)", target.kind, target.hook, True)
+                    for target in list(targets)
+                    if target.kind == "validate-bash" and (target.hook.parent / "validate_bash.py").exists()
+                ]
+            reports = bench(
+                targets, payloads, args.runs, args.warmup, fixture, work_dir, args.gh_delay, args.timeout
+            )
+        finally:
+            if args.keep_fixture:
+                print(f"Scratch directory kept: {work_dir}", file=sys.stderr)
+            else:
+                shutil.rmtree(work_dir, ignore_errors=True)
+    except BenchError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    over_budget = [
+        report["label"] for report in reports
+        if args.max_p95 is not None and report["latency_ms"]["p95"] > args.max_p95
+    ]
+    failed = any(
+        report["mismatches"] or report["decisions"].get("error") or report["decisions"].get("timeout")
+        for report in reports
+    )
+
+    if args.json:
+        print(json.dumps({
+            "runs": args.runs,
+            "warmup": args.warmup,
+            "gh_delay": args.gh_delay,
+            "fixture": args.fixture or "generated",
+            "results": reports,
+            "over_budget": over_budget,
+        }, indent=2))
+    else:
+        print_reports(reports, args.runs, args.warmup, args.fixture or "generated (temporary)", args.gh_delay)
+        if over_budget:
+            print()
+            print(f"Over Budget: p95 above {args.max_p95} ms for {', '.join(over_budget)}")
+
+    sys.exit(1 if failed or over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Install Tier 0 or upgrade to a higher tier from one precomputed plan.
+
+The whole plan (copy, keep existing, record) is built before anything is
+written; copies run in parallel and the manifest is saved once. Upgrades
+also move tier.yaml to the target tier in the same transaction.
+
+Usage:
+    python3 scripts/aix-install.py seed
+    python3 scripts/aix-install.py upgrade --to 3
+    python3 scripts/aix-install.py --dry-run --json upgrade --to 3
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from aix_git import git_root, short_sha
+from aix_install import InstallError, InstallPlan, apply_plan, op_action, plan_seed, plan_tier_upgrade
+from aix_tier import TierConfigError, load_tier, record_upgrade, tier_name
+
+
+def _resolve_framework_root(path: Optional[str]) -> Path:
+    if path:
+        return Path(path)
+    env_path = os.environ.get("AIX_FRAMEWORK")
+    if env_path:
+        return Path(env_path)
+    return Path.home() / "tools" / "aix"
+
+
+def _plan_report(plan: InstallPlan, repo_root: Path) -> Dict[str, Any]:
+    ops = []
+    counts = {"create": 0, "update": 0, "keep": 0}
+    for op in plan.ops:
+        action = op_action(op)
+        counts[action] += 1
+        ops.append({
+            "action": action,
+            "dest": str(op.dest.relative_to(repo_root)),
+            "capability": op.capability,
+            "record": op.record,
+        })
+    return {"ops": ops, "counts": counts, "notes": plan.notes}
+
+
+def install(
+    plan: InstallPlan,
+    framework_root: Path,
+    repo_root: Path,
+    dry_run: bool = False,
+    extra_writes: Optional[Dict[Path, str]] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Apply a plan (unless dry_run) and report what it did or would do.
+
+    Raises:
+        InstallError: If applying fails (after rollback)
+    """
+    report = _plan_report(plan, repo_root)
+    report["dry_run"] = dry_run
+    report["written"] = {}
+    if not dry_run:
+        report["written"] = apply_plan(
+            plan.ops,
+            repo_root=repo_root,
+            framework_root=framework_root,
+            aix_version=short_sha(framework_root) or "unknown",
+            extra_writes=extra_writes,
+            workers=workers,
+        )
+    return report
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    if report["dry_run"]:
+        for op in report["ops"]:
+            suffix = "" if op["record"] else " (not tracked)"
+            print(f"  {op['action']:<7} {op['dest']}  [{op['capability']}]{suffix}")
+    else:
+        for capability, count in report["written"].items():
+            print(f"  {capability}: {count} file(s) written")
+    for note in report["notes"]:
+        print(f"  {note}")
+    counts = report["counts"]
+    verb = "Would write" if report["dry_run"] else "Wrote"
+    print(
+        f"{verb} {counts['create'] + counts['update']} file(s) "
+        f"({counts['create']} new, {counts['update']} updated), kept {counts['keep']} existing"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Install or upgrade an AIX tier in one transaction")
+    parser.add_argument("--framework-root", help="Path to AIX framework repo")
+    parser.add_argument("--repo-root", help="Target repository root")
+    parser.add_argument("--workers", type=int, help="Parallel copy threads")
+    parser.add_argument("--dry-run", action="store_true", help="Show the plan without writing")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("seed", help="Install Tier 0, doc templates, core skills and scripts")
+    upgrade_parser = subparsers.add_parser("upgrade", help="Upgrade to a higher tier")
+    upgrade_parser.add_argument("--to", type=int, dest="target", help="Target tier (default: current + 1)")
+    upgrade_parser.add_argument("--reason", default="upgraded via aix-install.py", help="tier.yaml history reason")
+
+    args = parser.parse_args()
+    framework_root = _resolve_framework_root(args.framework_root).resolve()
+    repo_root = (Path(args.repo_root) if args.repo_root else git_root()).resolve()
+    tier_path = repo_root / ".aix" / "tier.yaml"
+
+    report: Dict[str, Any]
+    try:
+        if args.command == "seed":
+            report = install(plan_seed(framework_root, repo_root), framework_root, repo_root,
+                             dry_run=args.dry_run, workers=args.workers)
+        else:
+            if not (repo_root / ".aix").is_dir():
+                raise InstallError("aix not initialized. Run bootstrap.sh first.")
+            current = load_tier(tier_path).tier or 0
+            target = args.target if args.target is not None else current + 1
+            if target <= current:
+                if args.json:
+                    print(json.dumps({"status": "ok", "from": current, "to": current, "ops": []}, indent=2))
+                else:
+                    print(f"Already at tier {current}. Nothing to upgrade.")
+                return
+
+            plan = plan_tier_upgrade(framework_root, repo_root, current, target)
+            tier_text = tier_path.read_text() if tier_path.exists() else ""
+            new_tier_text = record_upgrade(
+                tier_text,
+                target,
+                short_sha(framework_root) or "unknown",
+                datetime.date.today().isoformat(),
+                args.reason,
+            )
+            if not args.json:
+                print(f"Tier {current} ({tier_name(current)}) -> Tier {target} ({tier_name(target)})")
+            report = install(plan, framework_root, repo_root, dry_run=args.dry_run,
+                             extra_writes={tier_path: new_tier_text}, workers=args.workers)
+            report.update({"from": current, "to": target})
+    except (InstallError, TierConfigError, FileNotFoundError) as e:
+        if args.json:
+            print(json.dumps({"status": "error", "error": str(e)}, indent=2))
+        else:
+            print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        report["status"] = "ok"
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,70 +6,24 @@ Deterministic helper for bootstrap/upgrade/adopt scripts.
 """
 
 import argparse
-import hashlib
-import json
-from datetime import date
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Optional
 
-
-def _today() -> str:
-    return date.today().isoformat()
-
-
-def _load_manifest(path: Path) -> Dict[str, Any]:
-    if path.exists():
-        return json.loads(path.read_text())
-    return {"manifest_version": 1, "files": []}
-
-
-def _save_manifest(path: Path, data: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    data.setdefault("manifest_version", 1)
-    data.setdefault("files", [])
-    path.write_text(json.dumps(data, indent=2) + "\n")
-
-
-def _sha256(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(8192), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
-
-
-def _relpath(path: Path, root: Path) -> str:
-    if not path.is_absolute():
-        return str(path)
-    return str(path.resolve().relative_to(root.resolve()))
-
-
-def _source_ref(source: Path, framework_root: Optional[Path]) -> str:
-    if framework_root is None:
-        return str(source)
-    try:
-        return str(source.resolve().relative_to(framework_root.resolve()))
-    except ValueError:
-        return str(source)
+from aix_manifest import ManifestRecorder, default_hash_algo, init, load_manifest, migrate_entries, save_manifest, touch
 
 
 def init_manifest(args: argparse.Namespace) -> None:
     manifest_path = Path(args.manifest)
-    data = _load_manifest(manifest_path)
-    data.setdefault("installed_at", _today())
-    data["updated_at"] = _today()
-    if args.aix_version:
-        data["aix_version"] = args.aix_version
-    _save_manifest(manifest_path, data)
+    data = load_manifest(manifest_path)
+    init(data, args.aix_version)
+    save_manifest(manifest_path, data)
 
 
 def touch_manifest(args: argparse.Namespace) -> None:
     manifest_path = Path(args.manifest)
-    data = _load_manifest(manifest_path)
-    data["updated_at"] = _today()
-    if args.aix_version:
-        data["aix_version"] = args.aix_version
-    _save_manifest(manifest_path, data)
+    data = load_manifest(manifest_path)
+    touch(data, args.aix_version)
+    save_manifest(manifest_path, data)
 
 
 def record_file(
@@ -81,44 +35,11 @@ def record_file(
     framework_root: Optional[Path],
     aix_version: Optional[str],
 ) -> None:
-    data = _load_manifest(manifest_path)
-    data.setdefault("files", [])
-
-    dest_path = dest
-    if not dest_path.is_absolute():
-        dest_path = (repo_root / dest_path).resolve()
-
-    if not dest_path.exists():
-        return
-
-    dest_rel = _relpath(dest_path, repo_root)
-    if any(entry.get("path") == dest_rel for entry in data["files"]):
-        return
-
-    snapshot_root = repo_root / ".aix" / "snapshots"
-    snapshot_path = snapshot_root / dest_rel
-    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
-
-    if not snapshot_path.exists():
-        if source.exists():
-            snapshot_path.write_bytes(source.read_bytes())
-        else:
-            snapshot_path.write_bytes(dest_path.read_bytes())
-
-    entry = {
-        "path": dest_rel,
-        "source": _source_ref(source, framework_root),
-        "sha256": _sha256(snapshot_path),
-    }
-    if capability:
-        entry["capability"] = capability
-
-    data["files"].append(entry)
-    data["updated_at"] = _today()
-    if aix_version:
-        data["aix_version"] = aix_version
-
-    _save_manifest(manifest_path, data)
+    data = load_manifest(manifest_path)
+    recorder = ManifestRecorder(data, repo_root, framework_root)
+    if recorder.record(source, dest, capability):
+        touch(data, aix_version)
+        save_manifest(manifest_path, data)
 
 
 def record(args: argparse.Namespace) -> None:
@@ -143,20 +64,28 @@ def record_dir(args: argparse.Namespace) -> None:
     if not source_root.exists():
         return
 
+    data = load_manifest(manifest_path)
+    recorder = ManifestRecorder(data, repo_root, framework_root)
+    added = False
     for source_path in source_root.rglob("*"):
-        if source_path.is_dir():
+        if source_path.is_dir() or "__pycache__" in source_path.parts:
             continue
         rel = source_path.relative_to(source_root)
-        dest_path = dest_root / rel
-        record_file(
-            manifest_path=manifest_path,
-            repo_root=repo_root,
-            source=source_path,
-            dest=dest_path,
-            capability=args.capability,
-            framework_root=framework_root,
-            aix_version=args.aix_version,
-        )
+        added = recorder.record(source_path, dest_root / rel, args.capability) or added
+
+    if added:
+        touch(data, args.aix_version)
+        save_manifest(manifest_path, data)
+
+
+def migrate_hashes(args: argparse.Namespace) -> None:
+    manifest_path = Path(args.manifest)
+    data = load_manifest(manifest_path)
+    algo = args.algo or default_hash_algo()
+    changed = migrate_entries(data, Path(args.repo_root), algo)
+    if changed:
+        save_manifest(manifest_path, data)
+    print(f"Migrated {changed} entr{'y' if changed == 1 else 'ies'} to {algo}")
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -193,6 +122,12 @@ def build_parser() -> argparse.ArgumentParser:
     record_dir_parser.add_argument("--aix-version")
     record_dir_parser.set_defaults(func=record_dir)
 
+    migrate_parser = subparsers.add_parser("migrate-hashes", help="Rewrite entry digests in the current algorithm")
+    migrate_parser.add_argument("--manifest", required=True)
+    migrate_parser.add_argument("--repo-root", required=True)
+    migrate_parser.add_argument("--algo", choices=["sha256", "blake2b"], help="Target algorithm (default: AIX_HASH_ALGO or sha256)")
+    migrate_parser.set_defaults(func=migrate_hashes)
+
     return parser
 
 
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Query the AIX capability registry.
+
+Usage:
+    python3 scripts/aix-registry.py get agent-browser
+    python3 scripts/aix-registry.py list --tier 2 --type skill
+    python3 scripts/aix-registry.py owners --repo-root .
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from aix_git import git_root
+from aix_registry import Capability, Registry, load_registry, read_adopted
+
+
+def _resolve_framework_root(path: Optional[str]) -> Path:
+    if path:
+        return Path(path)
+    env_path = os.environ.get("AIX_FRAMEWORK")
+    if env_path:
+        return Path(env_path)
+    return Path.home() / "tools" / "aix"
+
+
+def _row(
+    cap: Capability,
+    registry: Registry,
+    repo_root: Optional[Path],
+    adopted: List[str],
+) -> Dict[str, Any]:
+    row = cap._asdict()
+    row["source"] = cap.source_ref
+    if repo_root is not None:
+        row["installed"] = registry.is_installed(cap, repo_root, adopted)
+    return row
+
+
+def _print_rows(rows: List[Dict[str, Any]], as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return
+    for row in rows:
+        fields = [row["name"], str(row["tier"]), row["type"], row["subpath"]]
+        if "installed" in row:
+            fields.append("yes" if row["installed"] else "no")
+        print("\t".join(fields))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the AIX capability registry")
+    parser.add_argument("--framework-root", help="Path to AIX framework repo")
+    parser.add_argument("--repo-root", help="Repo to report installed state for")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    get_parser = subparsers.add_parser("get", help="Show one capability")
+    get_parser.add_argument("name")
+
+    list_parser = subparsers.add_parser("list", help="List capabilities")
+    list_parser.add_argument("--tier", type=int)
+    list_parser.add_argument("--type", dest="cap_type")
+
+    subparsers.add_parser("owners", help="Map manifest entries to owning capabilities")
+
+    args = parser.parse_args()
+
+    framework_root = _resolve_framework_root(args.framework_root)
+    try:
+        registry = load_registry(framework_root / "registry.tsv")
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    repo_root = Path(args.repo_root) if args.repo_root else None
+    adopted = read_adopted(repo_root / ".aix" / "tier.yaml") if repo_root else []
+
+    if args.command == "get":
+        cap = registry.get(args.name)
+        if cap is None:
+            print(f"Error: Unknown capability '{args.name}'", file=sys.stderr)
+            sys.exit(1)
+        row = _row(cap, registry, repo_root, adopted)
+        if args.json:
+            print(json.dumps(row, indent=2))
+        else:
+            _print_rows([row], as_json=False)
+    elif args.command == "list":
+        caps = registry.select(tier=args.tier, cap_type=args.cap_type)
+        _print_rows([_row(cap, registry, repo_root, adopted) for cap in caps], args.json)
+    else:
+        root = repo_root or git_root()
+        manifest_path = root / ".aix" / "manifest.json"
+        if not manifest_path.exists():
+            print(f"Error: Manifest not found: {manifest_path}", file=sys.stderr)
+            sys.exit(2)
+        entries = json.loads(manifest_path.read_text()).get("files", [])
+        owners = registry.owners(entries)
+        if args.json:
+            print(json.dumps(owners, indent=2))
+        else:
+            for path, owner in owners.items():
+                print(f"{path}\t{owner or '-'}")
+
+
+if __name__ == "__main__":
+    main()
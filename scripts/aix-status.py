@@ -8,57 +8,16 @@ Deterministic and safe to run locally.
 import argparse
 import json
 import os
-import subprocess
 from pathlib import Path
 from typing import Any, Dict, List
 
-
-def _git_root() -> Path:
-    result = subprocess.run(
-        ["git", "rev-parse", "--show-toplevel"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode == 0:
-        return Path(result.stdout.strip())
-    return Path.cwd()
-
-
-def _read_tier_yaml(path: Path) -> Dict[str, Any]:
-    data: Dict[str, Any] = {}
-    adopted: List[str] = []
-    if not path.exists():
-        return data
-    in_adopted = False
-    for line in path.read_text().splitlines():
-        if line.strip().startswith("#") or not line.strip():
-            continue
-        if line.startswith("adopted:"):
-            in_adopted = True
-            continue
-        if in_adopted:
-            if line.startswith("  - "):
-                adopted.append(line.replace("  - ", "").strip())
-                continue
-            if not line.startswith(" "):
-                in_adopted = False
-        if ":" in line and not line.startswith(" "):
-            key, value = line.split(":", 1)
-            data[key.strip()] = value.strip()
-    if adopted:
-        data["adopted"] = adopted
-    return data
+from aix_git import git_root, same_revision, short_sha
+from aix_registry import load_registry
+from aix_tier import load_tier
 
 
 def _framework_version(framework_root: Path) -> str:
-    result = subprocess.run(
-        ["git", "-C", str(framework_root), "rev-parse", "--short", "HEAD"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode == 0:
-        return result.stdout.strip()
-    return "unknown"
+    return short_sha(framework_root) or "unknown"
 
 
 def _count_files(path: Path) -> int:
@@ -87,7 +46,7 @@ def _guardrail_status(repo_root: Path) -> List[str]:
 
 
 def status_report(args: argparse.Namespace) -> Dict[str, Any]:
-    repo_root = Path(args.repo_root) if args.repo_root else _git_root()
+    repo_root = Path(args.repo_root) if args.repo_root else git_root()
     aix_dir = repo_root / ".aix"
     tier_path = aix_dir / "tier.yaml"
     manifest_path = aix_dir / "manifest.json"
@@ -101,14 +60,14 @@ def status_report(args: argparse.Namespace) -> Dict[str, Any]:
 
     registry_path = framework_root / "registry.tsv"
 
-    tier = _read_tier_yaml(tier_path)
+    tier = load_tier(tier_path)
     manifest = _load_manifest(manifest_path)
 
     report = {
         "repo_root": str(repo_root),
-        "tier": tier.get("tier"),
-        "tier_name": tier.get("name"),
-        "aix_version": tier.get("aix_version") or manifest.get("aix_version"),
+        "tier": tier.tier,
+        "tier_name": tier.name,
+        "aix_version": tier.aix_version or manifest.get("aix_version"),
         "framework_root": str(framework_root) if framework_root.exists() else None,
         "framework_version": _framework_version(framework_root) if framework_root.exists() else None,
         "registry_path": str(registry_path) if registry_path.exists() else None,
@@ -116,23 +75,23 @@ def status_report(args: argparse.Namespace) -> Dict[str, Any]:
         "manifest_files": len(manifest.get("files", [])) if manifest else 0,
         "snapshot_files": _count_files(snapshots_path),
         "guardrails_missing": _guardrail_status(repo_root),
-        "adopted": tier.get("adopted", []),
+        "adopted": list(tier.adopted),
     }
 
-    capabilities = sorted(
-        {
-            entry.get("capability")
-            for entry in manifest.get("files", [])
-            if entry.get("capability")
-        }
-    )
-    report["capabilities"] = capabilities
+    entries = manifest.get("files", [])
+    capabilities = {entry.get("capability") for entry in entries if entry.get("capability")}
+    if registry_path.exists():
+        registry = load_registry(registry_path)
+        report["registry_capabilities"] = len(registry.capabilities)
+        unowned = [entry for entry in entries if not entry.get("capability")]
+        capabilities.update(owner for owner in registry.owners(unowned).values() if owner)
+    report["capabilities"] = sorted(capabilities)
 
     suggestions = []
     if report["guardrails_missing"]:
         suggestions.append("Adopt architecture guardrails (Tier 1) or add docs/architecture/*.")
     if report["framework_version"] and report["aix_version"]:
-        if report["framework_version"] != report["aix_version"]:
+        if not same_revision(report["framework_version"], report["aix_version"]):
             suggestions.append("Run aix-sync to merge upstream updates.")
     if not manifest_path.exists():
         suggestions.append("Manifest missing. Run bootstrap/upgrade or re-init manifest.")
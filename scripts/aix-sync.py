@@ -3,34 +3,34 @@
 Compute three-way merges between local files and updated AIX templates.
 
 This is deterministic. It does not overwrite local files unless --apply is set.
+Merge results and file digests are memoized in the cache shared by all
+worktrees (see aix_merge.py and aix_cache.py), so re-running a preview
+while conflicts are being resolved, or syncing a fresh worktree, doesn't
+re-merge entries whose inputs haven't changed.
+
+With --apply, every write (local files, advanced snapshots and the manifest)
+is staged first and committed together through a journal (see
+aix_journal.py); a run interrupted mid-commit is completed by the next one.
+
+Previews normally write a full copy of every proposed file to .aix/sync/.
+With --bundle they write one unified-diff bundle instead (see aix_bundle.py),
+which --apply-bundle applies after review.
 """
 
 import argparse
-import hashlib
 import json
 import os
-import subprocess
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-
+from typing import Any, Dict, Iterator, Optional
 
-def _git_root() -> Path:
-    result = subprocess.run(
-        ["git", "rev-parse", "--show-toplevel"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode == 0:
-        return Path(result.stdout.strip())
-    return Path.cwd()
-
-
-def _sha256(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(8192), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+from aix_bundle import BundleError, BundleWriter, apply_bundle
+from aix_cache import SharedCache, SharedHashCache
+from aix_git import git_root
+from aix_journal import Journal, JournalError, recover
+from aix_manifest import HashCache, default_hash_algo, dump_manifest, entry_digest, hash_file, set_entry_digest
+from aix_merge import MergeCache, merge_three_way
+from aix_registry import Registry, load_registry
 
 
 def _read_manifest(path: Path) -> Dict[str, Any]:
@@ -39,15 +39,6 @@ def _read_manifest(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text())
 
 
-def _merge_three_way(local: Path, base: Path, new: Path) -> Tuple[int, str]:
-    result = subprocess.run(
-        ["git", "merge-file", "-p", str(local), str(base), str(new)],
-        capture_output=True,
-        text=True,
-    )
-    return result.returncode, result.stdout
-
-
 def _write_output(path: Path, content: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(content)
@@ -62,24 +53,99 @@ def _resolve_framework_root(path: Optional[str]) -> Path:
     return Path.home() / "tools" / "aix"
 
 
-def sync(args: argparse.Namespace) -> Dict[str, Any]:
-    repo_root = Path(args.repo_root) if args.repo_root else _git_root()
-    framework_root = _resolve_framework_root(args.framework_root)
-    manifest_path = Path(args.manifest) if args.manifest else repo_root / ".aix" / "manifest.json"
-    output_dir = Path(args.output_dir) if args.output_dir else repo_root / ".aix" / "sync"
-    apply_changes = args.apply
+def sync_context(args: argparse.Namespace) -> Dict[str, Any]:
+    """Resolve repo, framework, manifest and output paths for a sync run."""
+    repo_root = Path(args.repo_root) if args.repo_root else git_root()
+    return {
+        "repo_root": repo_root,
+        "framework_root": _resolve_framework_root(args.framework_root),
+        "manifest_path": Path(args.manifest) if args.manifest else repo_root / ".aix" / "manifest.json",
+        "output_dir": Path(args.output_dir) if args.output_dir else repo_root / ".aix" / "sync",
+        "apply": args.apply,
+        "merge_cache": not getattr(args, "no_merge_cache", False),
+        "bundle": getattr(args, "bundle", False),
+        "txn_dir": repo_root / ".aix" / "state" / "sync-txn",
+    }
+
+
+def iter_sync(
+    context: Dict[str, Any],
+    hashes: Optional[HashCache] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Classify manifest entries against the framework templates, one at a time.
 
-    manifest = _read_manifest(manifest_path)
-    results: List[Dict[str, Any]] = []
+    Each result is yielded as soon as its entry is classified (and any
+    proposal written), so callers can stream without holding every result.
+    hashes may be shared across calls (see aix-fleet.py) so framework files
+    are hashed once per process rather than once per repo.
+
+    The snapshot (base) digest comes from the manifest entry when it was
+    recorded with the current algorithm; older entries are re-hashed and,
+    with apply set, migrated in the manifest.
+
+    With apply set, "applied" means staged: each applied file's snapshot
+    and manifest digest advance to the upstream version, and all writes
+    are committed together once every entry has been classified. A
+    transaction left by an interrupted run is finished first.
+
+    With bundle set, proposals go into .aix/sync/proposal.patch instead of
+    full-file copies; merge conflicts are still written out in full. With
+    classify_only set (see aix-fleet.py status), entries are classified
+    without writing proposals or finishing an interrupted apply.
+    """
+    repo_root = context["repo_root"]
+    shared = SharedCache.for_repo(repo_root) if hashes is None else None
+    hashes = hashes or (SharedHashCache(shared) if shared is not None else HashCache())
+    framework_root = context["framework_root"]
+    output_dir = context["output_dir"]
+    apply_changes = context["apply"]
+    classify_only = context.get("classify_only", False) and not apply_changes
+
+    context["recovered"] = None if classify_only else recover(context["txn_dir"])
+    manifest = _read_manifest(context["manifest_path"])
+    algo = default_hash_algo()
+    migrated = 0
+    merges = MergeCache.for_repo(repo_root) if context.get("merge_cache", True) else None
+    bundle = None
+    if context.get("bundle") and not apply_changes:
+        bundle = BundleWriter(output_dir, framework_root, algo)
+
+    def propose(
+        rel_path: str, status: str, local: Optional[Path], content: str, local_hash: Optional[str], new_hash: str
+    ) -> Optional[Path]:
+        if classify_only:
+            return None
+        if bundle is None:
+            output_path = output_dir / rel_path
+            _write_output(output_path, content)
+            return output_path
+        return bundle.patch_path if bundle.add(rel_path, status, local, content, local_hash, new_hash) else None
+
+    journal = Journal(context["txn_dir"])
+
+    def stage_apply(
+        entry: Dict[str, Any], local_path: Path, base_path: Path, new_path: Path, content: bytes, new_hash: str
+    ) -> None:
+        """Stage the local write and advance the snapshot to upstream."""
+        mode = None if local_path.exists() else new_path.stat().st_mode & 0o7777
+        journal.stage(local_path, content, mode)
+        journal.stage(base_path, new_path.read_bytes())
+        set_entry_digest(entry, new_hash, algo)
+
+    registry: Optional[Registry] = None
+    registry_path = framework_root / "registry.tsv"
+    if registry_path.exists():
+        registry = load_registry(registry_path)
 
     for entry in manifest.get("files", []):
         rel_path = entry.get("path")
         source_ref = entry.get("source")
         if not rel_path or not source_ref:
-            results.append({
+            yield {
                 "path": rel_path,
                 "status": "invalid_entry",
-            })
+            }
             continue
 
         local_path = repo_root / rel_path
@@ -98,18 +164,26 @@ def sync(args: argparse.Namespace) -> Dict[str, Any]:
             status = "local_missing"
             action = "restore_from_upstream"
             if apply_changes:
-                _write_output(local_path, new_path.read_text())
+                stage_apply(
+                    entry, local_path, base_path, new_path, new_path.read_bytes(), hashes.digest(new_path, algo)
+                )
                 applied = True
             else:
-                output_path = output_dir / rel_path
-                _write_output(output_path, new_path.read_text())
+                output_path = propose(
+                    rel_path, status, None, new_path.read_text(), None, hashes.digest(new_path, algo)
+                )
         elif not base_path.exists():
             status = "no_snapshot"
             action = "manual_review"
         else:
-            base_hash = _sha256(base_path)
-            local_hash = _sha256(local_path)
-            new_hash = _sha256(new_path)
+            recorded_algo, base_hash = entry_digest(entry)
+            if recorded_algo != algo or not base_hash:
+                base_hash = hash_file(base_path, algo)
+            if entry.get("hash_algo") != algo or entry.get("hash") != base_hash:
+                set_entry_digest(entry, base_hash, algo)
+                migrated += 1
+            local_hash = hash_file(local_path, algo)
+            new_hash = hashes.digest(new_path, algo)
 
             if new_hash == base_hash and local_hash == base_hash:
                 status = "unchanged"
@@ -121,55 +195,121 @@ def sync(args: argparse.Namespace) -> Dict[str, Any]:
                 status = "update_available"
                 action = "apply_upstream"
                 if apply_changes:
-                    _write_output(local_path, new_path.read_text())
+                    stage_apply(entry, local_path, base_path, new_path, new_path.read_bytes(), new_hash)
                     applied = True
                 else:
-                    output_path = output_dir / rel_path
-                    _write_output(output_path, new_path.read_text())
+                    output_path = propose(rel_path, status, local_path, new_path.read_text(), local_hash, new_hash)
             else:
-                merge_code, merged = _merge_three_way(local_path, base_path, new_path)
+                if merges is not None:
+                    merge_code, merged = merges.merge(
+                        local_path, base_path, new_path, (local_hash, base_hash, new_hash), algo
+                    )
+                else:
+                    merge_code, merged = merge_three_way(local_path, base_path, new_path)
                 if merge_code == 0:
                     status = "merge_clean"
                     action = "apply_merge"
                     if apply_changes:
-                        _write_output(local_path, merged)
+                        stage_apply(entry, local_path, base_path, new_path, merged.encode(), new_hash)
                         applied = True
                     else:
-                        output_path = output_dir / rel_path
-                        _write_output(output_path, merged)
+                        output_path = propose(rel_path, status, local_path, merged, local_hash, new_hash)
                 elif merge_code == 1:
                     status = "merge_conflict"
                     action = "manual_merge"
-                    output_path = output_dir / rel_path
-                    _write_output(output_path, merged)
+                    if not classify_only:
+                        output_path = output_dir / rel_path
+                        _write_output(output_path, merged)
                 else:
                     status = "merge_error"
                     action = "manual_review"
 
-        results.append({
+        capability = entry.get("capability")
+        if not capability and registry is not None:
+            owner = registry.owner(source_ref)
+            capability = owner.name if owner else None
+
+        yield {
             "path": rel_path,
             "status": status,
             "action": action,
             "output": str(output_path) if output_path else None,
             "applied": applied,
-            "capability": entry.get("capability"),
-        })
+            "capability": capability,
+        }
+
+    if bundle is not None:
+        bundle.close()
+    if apply_changes and (journal or migrated):
+        journal.stage(context["manifest_path"], dump_manifest(manifest).encode())
+        journal.commit()
+    if merges is not None and merges.stored:
+        merges.prune()
+    if isinstance(hashes, SharedHashCache):
+        hashes.flush()
 
-    summary = {}
-    for item in results:
-        summary[item["status"]] = summary.get(item["status"], 0) + 1
 
+def sync_header(context: Dict[str, Any], summary: Dict[str, int]) -> Dict[str, Any]:
+    framework_root = context["framework_root"]
     return {
-        "repo_root": str(repo_root),
+        "repo_root": str(context["repo_root"]),
         "framework_root": str(framework_root) if framework_root.exists() else None,
-        "manifest": str(manifest_path),
-        "output_dir": str(output_dir),
-        "applied": apply_changes,
+        "manifest": str(context["manifest_path"]),
+        "output_dir": str(context["output_dir"]),
+        "applied": context["apply"],
+        "recovered": context.get("recovered"),
         "summary": summary,
-        "results": results,
     }
 
 
+def sync(args: argparse.Namespace, hashes: Optional[HashCache] = None) -> Dict[str, Any]:
+    """Run a sync and return the full report with every result."""
+    context = sync_context(args)
+    results = list(iter_sync(context, hashes))
+
+    summary: Dict[str, int] = {}
+    for item in results:
+        summary[item["status"]] = summary.get(item["status"], 0) + 1
+
+    report = sync_header(context, summary)
+    report["results"] = results
+    return report
+
+
+def stream_ndjson(args: argparse.Namespace) -> None:
+    """Print one result record per entry as classified, then a summary record."""
+    context = sync_context(args)
+    summary: Dict[str, int] = {}
+    for item in iter_sync(context):
+        summary[item["status"]] = summary.get(item["status"], 0) + 1
+        print(json.dumps({"type": "result", **item}), flush=True)
+    print(json.dumps({"type": "summary", **sync_header(context, summary)}), flush=True)
+
+
+def run_apply_bundle(args: argparse.Namespace) -> None:
+    context = sync_context(args)
+    try:
+        recover(context["txn_dir"])
+        report = apply_bundle(
+            context["repo_root"], context["output_dir"], context["manifest_path"], Journal(context["txn_dir"])
+        )
+    except BundleError as e:
+        if args.json or args.ndjson:
+            print(json.dumps({"status": "error", "error": str(e)}))
+        else:
+            print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json or args.ndjson:
+        print(json.dumps({"status": "ok", **report}, indent=None if args.ndjson else 2))
+        return
+    print(f"Applied {len(report['applied'])} file(s) from {report['patch']}")
+    if len(report["advanced"]) > len(report["applied"]):
+        print(f"Advanced {len(report['advanced']) - len(report['applied'])} snapshot(s) already matching upstream")
+    if report["skipped"]:
+        print(f"Skipped {len(report['skipped'])} file(s) with no remaining hunks")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Compute AIX sync merge proposals")
     parser.add_argument("--repo-root", help="Path to repo root")
@@ -177,10 +317,37 @@ def main() -> None:
     parser.add_argument("--manifest", help="Path to manifest.json")
     parser.add_argument("--output-dir", help="Directory for merge outputs")
     parser.add_argument("--apply", action="store_true", help="Apply clean merges to local files")
-    parser.add_argument("--json", action="store_true", help="Output JSON")
+    parser.add_argument("--bundle", action="store_true",
+                        help="Preview as one patch (.aix/sync/proposal.patch) instead of full-file copies")
+    parser.add_argument("--apply-bundle", action="store_true",
+                        help="Apply the reviewed proposal.patch from the output dir")
+    parser.add_argument("--no-merge-cache", action="store_true",
+                        help="Re-run every merge instead of reusing cached results")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="Output JSON")
+    output.add_argument("--ndjson", action="store_true", help="Stream one JSON record per entry, then a summary")
     args = parser.parse_args()
 
-    report = sync(args)
+    if args.bundle and args.apply:
+        parser.error("--bundle is a preview; review it, then use --apply-bundle")
+    if args.apply_bundle:
+        if args.apply or args.bundle:
+            parser.error("--apply-bundle can't be combined with --apply or --bundle")
+        run_apply_bundle(args)
+        return
+
+    try:
+        if args.ndjson:
+            stream_ndjson(args)
+            return
+        report = sync(args)
+    except JournalError as e:
+        if args.json or args.ndjson:
+            print(json.dumps({"status": "error", "error": str(e)}))
+        else:
+            print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
     if args.json:
         print(json.dumps(report, indent=2))
     else:
@@ -190,6 +357,8 @@ def main() -> None:
         print(f"- Manifest: {report['manifest']}")
         print(f"- Output Dir: {report['output_dir']}")
         print(f"- Apply: {report['applied']}")
+        if report["recovered"] is not None:
+            print(f"- Recovered: finished {report['recovered']} write(s) from an interrupted apply")
         print("Summary:")
         for key, value in sorted(report["summary"].items()):
             print(f"- {key}: {value}")
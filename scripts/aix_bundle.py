@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Sync proposals as one unified-diff bundle instead of full-file copies.
+
+A preview with aix-sync.py --bundle writes .aix/sync/proposal.patch (a
+git-style patch from each local file to its proposed content) and
+.aix/sync/proposal.json (an index holding each file's pre-image digest).
+Only entries whose proposal differs from the local file get a diff, so
+preview writes scale with the size of the changes.
+
+aix-sync.py --apply-bundle applies the reviewed bundle: every target must
+still match its recorded pre-image, every hunk must apply, and only then
+are files replaced. Hunks may be removed from the patch during review;
+files left without hunks are skipped. Like --apply, the local writes, the
+advanced snapshots and the manifest are committed together through a
+journal (see aix_journal.py).
+"""
+
+import difflib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from aix_journal import Journal, JournalError
+from aix_manifest import dump_manifest, hash_file, set_entry_digest, today
+
+BUNDLE_FORMAT = 2
+PATCH_NAME = "proposal.patch"
+INDEX_NAME = "proposal.json"
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_NO_NEWLINE = "\\ No newline at end of file\n"
+_LINE_END = re.compile(r"(?<=\n)")
+
+
+class BundleError(Exception):
+    """Raised when a bundle is missing, stale or doesn't apply."""
+
+
+class Hunk(NamedTuple):
+    old_start: int
+    old_len: int
+    lines: List[Tuple[str, str]]
+
+
+class FilePatch(NamedTuple):
+    path: str
+    hunks: List[Hunk]
+
+
+def _read(path: Path) -> str:
+    return path.read_bytes().decode("utf-8", "surrogateescape")
+
+
+def _split_lines(text: str) -> List[str]:
+    """Split on "\n" only, keeping line ends (str.splitlines also breaks on \r, \f, ...)."""
+    return [line for line in _LINE_END.split(text) if line]
+
+
+def _diff_lines(path: str, old: str, new: str, created: bool) -> List[str]:
+    lines = [f"diff --git a/{path} b/{path}\n"]
+    if created:
+        lines.append("new file mode 100644\n")
+    body = difflib.unified_diff(
+        _split_lines(old),
+        _split_lines(new),
+        fromfile="/dev/null" if created else f"a/{path}",
+        tofile=f"b/{path}",
+    )
+    for line in body:
+        lines.append(line if line.endswith("\n") else line + "\n" + _NO_NEWLINE)
+    return lines
+
+
+class BundleWriter:
+    """
+    Accumulate proposals into proposal.patch and its index.
+
+    The patch is streamed to a temporary file and both files are moved
+    into place by close(); a run with no differing entries removes any
+    previous bundle instead.
+    """
+
+    def __init__(self, output_dir: Path, framework_root: Path, algo: str) -> None:
+        self.output_dir = output_dir
+        self.patch_path = output_dir / PATCH_NAME
+        self.index_path = output_dir / INDEX_NAME
+        self.framework_root = framework_root
+        self.algo = algo
+        self.entries: List[Dict[str, Any]] = []
+        self._tmp_path = output_dir / f".{PATCH_NAME}.{os.getpid()}.tmp"
+        self._handle = None
+
+    def add(
+        self,
+        path: str,
+        status: str,
+        local: Optional[Path],
+        proposed: str,
+        local_hash: Optional[str],
+        new_hash: str,
+    ) -> bool:
+        """
+        Add one proposal; local is None when the file doesn't exist yet.
+
+        new_hash is the upstream digest the entry's snapshot advances to
+        when the bundle is applied. A proposal identical to the local file
+        gets no diff but is still indexed, so its snapshot advances too.
+
+        Returns:
+            True if the proposal differs from the local file
+        """
+        old = _read(local) if local is not None else ""
+        changed = local is None or old != proposed
+        self.entries.append(
+            {"path": path, "status": status, "local_hash": local_hash, "new_hash": new_hash, "diff": changed}
+        )
+        if not changed:
+            return False
+        if self._handle is None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self._tmp_path, "w", encoding="utf-8", errors="surrogateescape")
+        self._handle.writelines(_diff_lines(path, old, proposed, local is None))
+        return True
+
+    def close(self) -> None:
+        if self._handle is None and not self.entries:
+            for path in (self.patch_path, self.index_path):
+                if path.exists():
+                    path.unlink()
+            return
+        if self._handle is None:
+            # Nothing to patch, only snapshots to advance
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._tmp_path.write_text("")
+        else:
+            self._handle.close()
+            self._handle = None
+        index = {
+            "format": BUNDLE_FORMAT,
+            "created_at": today(),
+            "framework_root": str(self.framework_root),
+            "patch": PATCH_NAME,
+            "hash_algo": self.algo,
+            "entries": self.entries,
+        }
+        tmp_index = self.index_path.with_name(f".{INDEX_NAME}.{os.getpid()}.tmp")
+        tmp_index.write_text(json.dumps(index, indent=2) + "\n")
+        os.replace(self._tmp_path, self.patch_path)
+        os.replace(tmp_index, self.index_path)
+
+
+def parse_patch(text: str) -> List[FilePatch]:
+    """
+    Parse a unified diff into per-file hunks.
+
+    Raises:
+        BundleError: If a hunk is malformed
+    """
+    patches: List[FilePatch] = []
+    hunks: Optional[List[Hunk]] = None
+    lines = _split_lines(text)
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        index += 1
+        if line.startswith("+++ "):
+            target = line[4:].rstrip("\n")
+            if target.startswith("b/"):
+                target = target[2:]
+            hunks = []
+            patches.append(FilePatch(target, hunks))
+            continue
+        match = _HUNK_HEADER.match(line)
+        if not match:
+            continue
+        if hunks is None:
+            raise BundleError(f"Hunk without a file header: {line.strip()}")
+        old_len = int(match.group(2) or 1)
+        new_len = int(match.group(4) or 1)
+        body: List[Tuple[str, str]] = []
+        old_seen = new_seen = 0
+        while (old_seen < old_len or new_seen < new_len) and index < len(lines):
+            line = lines[index]
+            index += 1
+            tag = line[:1]
+            if tag not in (" ", "-", "+"):
+                raise BundleError(f"Malformed hunk line: {line.rstrip()}")
+            if index < len(lines) and lines[index].startswith("\\"):
+                # "\ No newline at end of file" applies to the line before it
+                line = line.rstrip("\n")
+                index += 1
+            body.append((tag, line[1:]))
+            old_seen += tag != "+"
+            new_seen += tag != "-"
+        if old_seen != old_len or new_seen != new_len:
+            raise BundleError(f"Truncated hunk in {patches[-1].path}")
+        hunks.append(Hunk(int(match.group(1)), old_len, body))
+    return patches
+
+
+def apply_hunks(path: str, old: str, hunks: List[Hunk]) -> str:
+    """
+    Apply hunks to old content, requiring every context line to match.
+
+    Raises:
+        BundleError: If a hunk doesn't apply
+    """
+    old_lines = _split_lines(old)
+    out: List[str] = []
+    position = 0
+    for hunk in hunks:
+        start = hunk.old_start if hunk.old_len == 0 else hunk.old_start - 1
+        if start < position:
+            raise BundleError(f"{path}: overlapping hunks at line {hunk.old_start}")
+        out.extend(old_lines[position:start])
+        position = start
+        for tag, content in hunk.lines:
+            if tag == "+":
+                out.append(content)
+                continue
+            if position >= len(old_lines) or old_lines[position] != content:
+                raise BundleError(f"{path}: hunk does not apply at line {position + 1}")
+            if tag == " ":
+                out.append(content)
+            position += 1
+    out.extend(old_lines[position:])
+    return "".join(out)
+
+
+def _load_index(bundle_dir: Path) -> Dict[str, Any]:
+    index_path = bundle_dir / INDEX_NAME
+    if not index_path.exists():
+        raise BundleError(f"No bundle index at {index_path}")
+    try:
+        index = json.loads(index_path.read_text())
+    except ValueError as e:
+        raise BundleError(f"Invalid bundle index {index_path}: {e}") from e
+    if index.get("format") != BUNDLE_FORMAT:
+        raise BundleError(f"Unsupported bundle format in {index_path}")
+    return index
+
+
+def _verify_local(path: str, target: Path, expected: Optional[str], algo: str) -> Optional[str]:
+    """Return target's content, raising if it changed since the preview."""
+    if expected is None:
+        if target.exists():
+            raise BundleError(f"{path} was created since the preview")
+        return None
+    if not target.exists() or hash_file(target, algo) != expected:
+        raise BundleError(f"{path} changed since the preview; re-run aix-sync --bundle")
+    return _read(target)
+
+
+def apply_bundle(
+    repo_root: Path,
+    bundle_dir: Path,
+    manifest_path: Path,
+    journal: Journal,
+    remove: bool = True,
+) -> Dict[str, Any]:
+    """
+    Apply a reviewed bundle to repo_root atomically.
+
+    Each applied file's snapshot and manifest digest advance to the upstream
+    version the preview was made from, as with aix-sync.py --apply; so do
+    those of entries whose proposal already matched the local file. Entries
+    whose hunks were all removed during review are left as they were.
+
+    Args:
+        repo_root: Repository the bundle was previewed against
+        bundle_dir: Directory holding proposal.patch and proposal.json
+        manifest_path: The repository's .aix/manifest.json
+        journal: Empty journal the writes are staged and committed through
+        remove: Delete the bundle once applied
+
+    Returns:
+        Report with applied and skipped paths
+
+    Raises:
+        BundleError: If any file or upstream template changed since the
+            preview, any hunk fails, or the commit fails; nothing is
+            written in that case
+    """
+    index = _load_index(bundle_dir)
+    patch_path = bundle_dir / index.get("patch", PATCH_NAME)
+    if not patch_path.exists():
+        raise BundleError(f"No bundle patch at {patch_path}")
+    if not manifest_path.exists():
+        raise BundleError(f"Manifest not found: {manifest_path}")
+    algo = index.get("hash_algo") or "sha256"
+    framework_root = Path(index.get("framework_root") or "")
+    entries = {entry["path"]: entry for entry in index.get("entries", [])}
+    manifest = json.loads(manifest_path.read_text())
+    recorded = {entry.get("path"): entry for entry in manifest.get("files", [])}
+    root = repo_root.resolve()
+
+    def checked_target(path: str) -> Path:
+        target = (repo_root / path).resolve()
+        if root not in target.parents:
+            raise BundleError(f"{path} is outside the repository")
+        return target
+
+    results: List[Tuple[str, Path, Optional[str], str]] = []
+    for file_patch in parse_patch(_read(patch_path)):
+        entry = entries.get(file_patch.path)
+        if entry is None:
+            raise BundleError(f"{file_patch.path} is not in the bundle index")
+        target = checked_target(file_patch.path)
+        if not file_patch.hunks:
+            continue
+        old = _verify_local(file_patch.path, target, entry.get("local_hash"), algo)
+        results.append((file_patch.path, target, old, apply_hunks(file_patch.path, old or "", file_patch.hunks)))
+
+    # Proposals that matched the local file only advance the snapshot
+    advanced = [path for path, _, _, _ in results]
+    for path, entry in entries.items():
+        if not entry.get("diff", True):
+            _verify_local(path, checked_target(path), entry.get("local_hash"), algo)
+            advanced.append(path)
+
+    for path, target, old, new in results:
+        upstream = framework_root / recorded.get(path, {}).get("source", "")
+        mode = None if old is not None or not upstream.is_file() else upstream.stat().st_mode & 0o7777
+        journal.stage(target, new.encode("utf-8", "surrogateescape"), mode)
+    for path in advanced:
+        manifest_entry = recorded.get(path)
+        if manifest_entry is None or not manifest_entry.get("source"):
+            raise BundleError(f"{path} is not in the manifest")
+        upstream = framework_root / manifest_entry["source"]
+        new_hash = entries[path].get("new_hash")
+        if not upstream.is_file() or hash_file(upstream, algo) != new_hash:
+            raise BundleError(f"{manifest_entry['source']} changed upstream since the preview; re-run aix-sync --bundle")
+        journal.stage(checked_target(f".aix/snapshots/{path}"), upstream.read_bytes())
+        set_entry_digest(manifest_entry, new_hash, algo)
+
+    if advanced:
+        journal.stage(manifest_path, dump_manifest(manifest).encode())
+    try:
+        journal.commit()
+    except JournalError as e:
+        raise BundleError(f"Applying bundle failed: {e}") from e
+
+    if remove:
+        patch_path.unlink()
+        (bundle_dir / INDEX_NAME).unlink()
+
+    applied = [path for path, _, _, _ in results]
+    return {
+        "applied": applied,
+        "advanced": sorted(advanced),
+        "skipped": sorted(set(entries) - set(advanced)),
+        "patch": str(patch_path),
+    }
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache shared by every worktree of a repository.
+
+Objects live under $(git rev-parse --git-common-dir)/aix-cache/, so a new
+worktree (see worktree-setup.sh) starts with the parses, renders and
+merges its siblings already produced. Keys are digests of everything the
+cached value was derived from, so an object never goes stale and racing
+writers store identical bytes; each write is still a temp file renamed
+into place. Shared tables (file digests) and pruning take an exclusive
+lock on aix-cache/lock.
+
+File digests are keyed by inode and (size, mtime, ctime) rather than by
+content: worktrees share the framework tree and hardlinked outputs, and a
+path's digest is only reused while none of those change.
+
+Environment:
+    AIX_CACHE_DIR    Cache location (default: <git common dir>/aix-cache)
+    AIX_CACHE        Set to 0 to disable the shared cache
+    AIX_CACHE_MB     Size budget in MiB (default: 256)
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from aix_git import common_dir
+from aix_manifest import HashCache, default_hash_algo, hash_file
+
+try:
+    import fcntl
+except ImportError:  # Windows: object writes stay atomic, tables are last-writer-wins
+    fcntl = None  # type: ignore[assignment]
+
+CACHE_DIR_NAME = "aix-cache"
+CACHE_FORMAT = 1
+DEFAULT_MAX_MB = 256
+DIGEST_TABLE = "digests.json"
+# Digest table entries kept; the oldest are dropped first
+MAX_DIGESTS = 50000
+
+
+def cache_root(repo_root: Path) -> Optional[Path]:
+    """Resolve the shared cache directory for a repo, or None when disabled."""
+    if os.environ.get("AIX_CACHE", "1").strip().lower() in ("0", "off", "false", "no"):
+        return None
+    override = os.environ.get("AIX_CACHE_DIR")
+    if override:
+        return Path(override)
+    common = common_dir(repo_root)
+    if common is None:
+        return None
+    return common / CACHE_DIR_NAME
+
+
+def _max_bytes() -> int:
+    try:
+        return int(float(os.environ.get("AIX_CACHE_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_MAX_MB * 1024 * 1024
+
+
+class SharedCache:
+    """
+    Objects stored as <root>/<namespace>/<key[:2]>/<key[2:]>.
+
+    Every read and write fails soft: an unreadable or unwritable cache
+    behaves as a miss, never as an error. A read-only cache serves hits
+    but never stores, touches or prunes anything.
+    """
+
+    def __init__(self, root: Path, max_bytes: Optional[int] = None, read_only: bool = False) -> None:
+        self.root = root
+        self.max_bytes = _max_bytes() if max_bytes is None else max_bytes
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    @classmethod
+    def for_repo(cls, repo_root: Path, read_only: bool = False) -> Optional["SharedCache"]:
+        root = cache_root(repo_root)
+        return cls(root, read_only=read_only) if root is not None else None
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        material = "\0".join((str(CACHE_FORMAT), *parts))
+        return hashlib.sha256(material.encode("utf-8", "surrogateescape")).hexdigest()
+
+    def _path(self, namespace: str, key: str) -> Path:
+        return self.root / namespace / key[:2] / key[2:]
+
+    def get_bytes(self, namespace: str, key: str) -> Optional[bytes]:
+        path = self._path(namespace, key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.read_only:
+            return data
+        try:
+            # mtime is the LRU clock used by prune()
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put_bytes(self, namespace: str, key: str, data: bytes) -> None:
+        if self.read_only:
+            return
+        path = self._path(namespace, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+            self.stored += 1
+        except OSError:
+            pass
+
+    def get_json(self, namespace: str, key: str) -> Any:
+        """Return the stored value, or None on a miss."""
+        data = self.get_bytes(namespace, key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def put_json(self, namespace: str, key: str, value: Any) -> None:
+        """Store a value; values JSON can't represent exactly are skipped."""
+        try:
+            data = json.dumps(value, sort_keys=True)
+        except (TypeError, ValueError):
+            return
+        if json.loads(data) != value:
+            return
+        self.put_bytes(namespace, key, data.encode())
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold the cache-wide lock (shared tables, pruning)."""
+        if fcntl is None:
+            yield
+            return
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            handle = open(self.root / "lock", "a")
+        except OSError:
+            yield
+            return
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            yield
+        finally:
+            handle.close()
+
+    def read_table(self, name: str) -> Dict[str, Any]:
+        try:
+            data = json.loads((self.root / name).read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def update_table(self, name: str, updates: Dict[str, Any], limit: int) -> None:
+        """Merge entries into a shared table under the lock, keeping the newest limit."""
+        if not updates or self.read_only:
+            return
+        with self.lock():
+            entries = self.read_table(name)
+            for key, value in updates.items():
+                entries.pop(key, None)
+                entries[key] = value
+            if len(entries) > limit:
+                entries = dict(list(entries.items())[-limit:])
+            path = self.root / name
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                tmp_path.write_text(json.dumps({"format": CACHE_FORMAT, "entries": entries}))
+                os.replace(tmp_path, path)
+            except OSError:
+                pass
+
+    def prune(self) -> int:
+        """
+        Evict the least recently used objects until the cache fits its budget.
+
+        Returns:
+            Number of objects removed
+        """
+        if self.read_only:
+            return 0
+        with self.lock():
+            objects: List[Tuple[int, int, Path]] = []
+            total = 0
+            try:
+                for namespace in self.root.iterdir():
+                    if not namespace.is_dir():
+                        continue
+                    for path in namespace.glob("*/*"):
+                        stat = path.stat()
+                        objects.append((stat.st_mtime_ns, stat.st_size, path))
+                        total += stat.st_size
+            except OSError:
+                return 0
+            removed = 0
+            for _, size, path in sorted(objects):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            return removed
+
+
+class SharedHashCache(HashCache):
+    """
+    HashCache backed by the shared digest table.
+
+    Lookups are keyed by (device, inode, size, mtime, ctime), so a digest
+    computed in one worktree is reused in another only for the very same
+    file; call flush() to publish new digests.
+    """
+
+    def __init__(self, store: SharedCache) -> None:
+        super().__init__()
+        self.store = store
+        self._table = store.read_table(DIGEST_TABLE)
+        self._new: Dict[str, str] = {}
+
+    def digest(self, path: Path, algo: Optional[str] = None) -> str:
+        algo = algo or default_hash_algo()
+        stat = path.stat()
+        key = f"{algo}:{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}:{stat.st_ctime_ns}"
+        with self._lock:
+            cached = self._table.get(key)
+        if isinstance(cached, str):
+            return cached
+        digest = hash_file(path, algo)
+        with self._lock:
+            self._table[key] = digest
+            self._new[key] = digest
+        return digest
+
+    def flush(self) -> None:
+        with self._lock:
+            updates, self._new = self._new, {}
+        self.store.update_table(DIGEST_TABLE, updates, MAX_DIGESTS)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Condensed role prompts for adapters with roles.variant: compact.
+
+Canonical roles mark sections with an HTML comment on the line directly
+above the heading:
+
+    <!-- aix:optional -->   dropped from compact prompts
+    <!-- aix:collapse -->   reduced to the heading and its first paragraph
+    <!-- aix:shared -->     moved to the adapter's shared file; the role
+                            keeps the heading and a pointer to it
+
+A section runs to the next heading of the same or a higher level. Marker
+lines are removed from full prompts too, so marking a role doesn't change
+its full output. Compact prompts also have trailing whitespace stripped
+and runs of blank lines collapsed (outside code fences).
+
+Used by aix-generate.py.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+VARIANTS = ("full", "compact")
+
+_MARKER = re.compile(r"^<!--\s*aix:(optional|collapse|shared)\s*-->\s*$")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+def _lines(text: str) -> List[str]:
+    return text.split("\n")
+
+
+def strip_markers(body: str) -> str:
+    """Remove marker lines (outside code fences), leaving everything else as is."""
+    kept = []
+    in_fence = False
+    for line in _lines(body):
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        elif not in_fence and _MARKER.match(line):
+            continue
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def normalize_whitespace(text: str) -> str:
+    """Strip trailing whitespace and collapse blank-line runs outside code fences."""
+    out: List[str] = []
+    in_fence = False
+    for line in _lines(text):
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        if in_fence:
+            out.append(line)
+            continue
+        line = line.rstrip()
+        if not line and out and not out[-1]:
+            continue
+        out.append(line)
+    return "\n".join(out).strip("\n") + "\n"
+
+
+def _first_paragraph(lines: List[str]) -> List[str]:
+    kept: List[str] = []
+    in_fence = False
+    for line in lines:
+        if not kept and not line.strip():
+            continue
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        elif not in_fence and not line.strip():
+            break
+        kept.append(line)
+    return kept
+
+
+def compact(body: str, shared_ref: Optional[str]) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Condense a role body.
+
+    Args:
+        body: Canonical role body
+        shared_ref: Path shown in place of shared sections; without one,
+            shared sections stay inline
+
+    Returns:
+        (compact body, [(heading, section text)] moved to the shared file)
+    """
+    lines = _lines(body)
+    out: List[str] = []
+    shared: List[Tuple[str, str]] = []
+    in_fence = False
+    pending: Optional[str] = None
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        index += 1
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        if in_fence:
+            out.append(line)
+            continue
+        marker = _MARKER.match(line)
+        if marker:
+            pending = marker.group(1)
+            continue
+        heading = _HEADING.match(line)
+        action, pending = pending, None
+        if not heading or action is None:
+            out.append(line)
+            continue
+
+        # Collect the marked section: up to the next heading at this level or above
+        level = len(heading.group(1))
+        section: List[str] = []
+        section_fence = False
+        while index < len(lines):
+            candidate = lines[index]
+            if _FENCE.match(candidate):
+                section_fence = not section_fence
+            elif not section_fence:
+                next_heading = _HEADING.match(candidate)
+                if next_heading and len(next_heading.group(1)) <= level:
+                    break
+                if _MARKER.match(candidate) and index + 1 < len(lines):
+                    following = _HEADING.match(lines[index + 1])
+                    if following and len(following.group(1)) <= level:
+                        break
+            section.append(candidate)
+            index += 1
+        section = [candidate for candidate in section if not _MARKER.match(candidate)]
+
+        if action == "optional":
+            continue
+        if action == "collapse":
+            out.extend([line, ""] + _first_paragraph(section) + [""])
+        elif shared_ref is None:
+            out.extend([line] + section)
+        else:
+            shared.append((heading.group(2), "\n".join([line] + section).strip("\n")))
+            out.extend([line, "", f"See \"{heading.group(2)}\" in `{shared_ref}`.", ""])
+    return normalize_whitespace("\n".join(out)), shared
+
+
+def shared_document(sections: List[Tuple[str, str]]) -> Optional[str]:
+    """Build the shared file from every role's shared sections, each distinct section once."""
+    seen: Dict[str, None] = {}
+    for _, text in sections:
+        seen.setdefault(text, None)
+    if not seen:
+        return None
+    header = "# Shared Role Guidance\n\nGenerated by aix-generate from sections roles mark `<!-- aix:shared -->`."
+    return normalize_whitespace("\n\n".join([header, *seen]))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Prompt footprint measurement for generated agent outputs.
+
+Sizes are reported in bytes and approximate tokens. The token estimate is
+tokenizer-free: letter runs cost one token per six characters (rounded up),
+digit runs one per three, punctuation runs one per two characters, and
+whitespace only where it contains a line break. It tracks BPE tokenizers
+closely enough to compare roles and catch growth, not to bill against.
+
+Used by aix-generate.py --footprint.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Paragraphs shorter than this aren't worth factoring out
+MIN_PARAGRAPH_CHARS = 80
+
+_TOKEN_PATTERN = re.compile(r"[^\W\d_]+|\d+|\s+|[^\w\s]+|_+", re.UNICODE)
+_BLANK_LINE = re.compile(r"\n[ \t]*\n")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of text without a tokenizer."""
+    tokens = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        piece = match.group()
+        first = piece[0]
+        if first.isspace():
+            tokens += "\n" in piece
+        elif first.isdigit():
+            tokens += (len(piece) + 2) // 3
+        elif first.isalpha():
+            tokens += (len(piece) + 5) // 6
+        else:
+            tokens += (len(piece) + 1) // 2
+    return tokens
+
+
+def split_prompt(content: str, role_format: str) -> Tuple[str, str]:
+    """
+    Split generated output into (overhead, prompt).
+
+    Overhead is the frontmatter for markdown outputs and everything but the
+    prompt string for JSON outputs.
+    """
+    if role_format == "json":
+        try:
+            prompt = json.loads(content).get("prompt") or ""
+        except (ValueError, AttributeError):
+            return "", content
+        return content.replace(json.dumps(prompt, ensure_ascii=False)[1:-1], "", 1), prompt
+
+    if content.startswith("---\n"):
+        end = content.find("\n---\n", 4)
+        if end != -1:
+            return content[:end + 5], content[end + 5:]
+    return "", content
+
+
+def measure(content: str, role_format: str) -> Dict[str, int]:
+    """Size of one generated output."""
+    overhead, _ = split_prompt(content, role_format)
+    return {
+        "bytes": len(content.encode("utf-8")),
+        "tokens": estimate_tokens(content),
+        "overhead_bytes": len(overhead.encode("utf-8")),
+        "overhead_tokens": estimate_tokens(overhead),
+    }
+
+
+def find_duplicates(prompts: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Find paragraphs repeated across roles.
+
+    Paragraphs are compared with whitespace normalized. Each result lists
+    the roles sharing it and the tokens saved by keeping a single copy.
+
+    Args:
+        prompts: Role name -> prompt text
+
+    Returns:
+        Duplicates, largest saving first
+    """
+    seen: Dict[str, Dict[str, Any]] = {}
+    for role, prompt in sorted(prompts.items()):
+        for paragraph in _BLANK_LINE.split(prompt):
+            normalized = _WHITESPACE.sub(" ", paragraph).strip()
+            if len(normalized) < MIN_PARAGRAPH_CHARS:
+                continue
+            key = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+            entry = seen.setdefault(key, {"text": normalized, "roles": []})
+            if role not in entry["roles"]:
+                entry["roles"].append(role)
+
+    duplicates = []
+    for entry in seen.values():
+        if len(entry["roles"]) < 2:
+            continue
+        tokens = estimate_tokens(entry["text"])
+        duplicates.append({
+            "roles": entry["roles"],
+            "preview": entry["text"][:60],
+            "bytes": len(entry["text"].encode("utf-8")),
+            "tokens": tokens,
+            "savings_tokens": tokens * (len(entry["roles"]) - 1),
+        })
+    duplicates.sort(key=lambda d: (-d["savings_tokens"], d["preview"]))
+    return duplicates
+
+
+def delta(current: int, previous: Optional[int]) -> Optional[int]:
+    return None if previous is None else current - previous
+
+
+def growth_percent(current: int, previous: Optional[int]) -> Optional[float]:
+    """Percentage change from previous, or None without a usable baseline."""
+    if not previous:
+        return None
+    return (current - previous) * 100.0 / previous
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Resolve git repository facts without spawning git.
+
+Reads the on-disk layout directly (.git directories and gitdir files,
+commondir links, HEAD, loose and packed refs, linked worktree metadata).
+Results are memoized per process. Layouts this module does not understand
+(GIT_DIR overrides, bare repos, reftable refs, separate git dirs for the
+main worktree) fall back to the git CLI.
+
+Usage:
+    python3 .aix/scripts/aix_git.py root
+    python3 .aix/scripts/aix_git.py short-sha -C ~/tools/aix
+    python3 .aix/scripts/aix_git.py worktrees --json
+"""
+
+import argparse
+import functools
+import json
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SHORT_SHA_LENGTH = 7
+
+_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}(?:[0-9a-f]{24})?$")
+_OVERRIDE_ENV = ("GIT_DIR", "GIT_WORK_TREE", "GIT_COMMON_DIR")
+_PER_WORKTREE_PREFIXES = ("refs/bisect/", "refs/worktree/", "refs/rewritten/")
+
+
+class UnsupportedLayout(Exception):
+    """Raised when the repository layout needs the git CLI to interpret."""
+
+
+def _run_git(start: Path, *args: str) -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(start), *args],
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def _read_text(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def _gitdir_from_file(dot_git: Path) -> Optional[Path]:
+    content = _read_text(dot_git)
+    if not content or not content.startswith("gitdir:"):
+        return None
+    target = Path(content[len("gitdir:"):].strip())
+    if not target.is_absolute():
+        target = dot_git.parent / target
+    return target.resolve()
+
+
+def _config_values(common: Path) -> Dict[str, str]:
+    """Read the handful of core/extensions keys that change how refs are stored."""
+    content = _read_text(common / "config")
+    values: Dict[str, str] = {}
+    if not content:
+        return values
+    section = ""
+    for raw in content.splitlines():
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("["):
+            section = line.strip("[]").split()[0].lower()
+            continue
+        if "=" in line:
+            key, value = line.split("=", 1)
+            values[f"{section}.{key.strip().lower()}"] = value.strip().lower()
+    return values
+
+
+@functools.lru_cache(maxsize=None)
+def _locate(start: str) -> Tuple[Path, Path, Path]:
+    """Return (worktree_root, git_dir, common_dir) for a starting directory."""
+    if any(os.environ.get(name) for name in _OVERRIDE_ENV):
+        raise UnsupportedLayout("git environment overrides are set")
+
+    current = Path(start).resolve()
+    for candidate in (current, *current.parents):
+        dot_git = candidate / ".git"
+        if dot_git.is_dir():
+            git_dir = dot_git
+        elif dot_git.is_file():
+            resolved = _gitdir_from_file(dot_git)
+            if resolved is None:
+                raise UnsupportedLayout(f"unreadable gitdir file: {dot_git}")
+            git_dir = resolved
+        else:
+            continue
+
+        if not (git_dir / "HEAD").exists():
+            raise UnsupportedLayout(f"missing HEAD in {git_dir}")
+
+        commondir = _read_text(git_dir / "commondir")
+        if commondir:
+            common = Path(commondir)
+            if not common.is_absolute():
+                common = git_dir / common
+            common = common.resolve()
+        else:
+            common = git_dir
+
+        config = _config_values(common)
+        if config.get("core.bare") == "true" or config.get("core.worktree"):
+            raise UnsupportedLayout("bare or relocated worktree")
+        if config.get("extensions.refstorage", "files") != "files":
+            raise UnsupportedLayout("non-files ref storage")
+
+        return candidate, git_dir, common
+
+    raise UnsupportedLayout(f"not inside a git repository: {current}")
+
+
+@functools.lru_cache(maxsize=None)
+def _packed_refs(common: Path) -> Dict[str, str]:
+    refs: Dict[str, str] = {}
+    content = _read_text(common / "packed-refs")
+    if not content:
+        return refs
+    for line in content.splitlines():
+        if not line or line[0] in "#^":
+            continue
+        parts = line.split(" ", 1)
+        if len(parts) == 2:
+            refs[parts[1].strip()] = parts[0]
+    return refs
+
+
+def _resolve_ref(git_dir: Path, common: Path, ref: str, depth: int = 0) -> Optional[str]:
+    if depth > 5:
+        return None
+    per_worktree = ref == "HEAD" or ref.startswith(_PER_WORKTREE_PREFIXES)
+    loose = (git_dir if per_worktree else common) / ref
+    content = _read_text(loose)
+    if content:
+        if content.startswith("ref:"):
+            return _resolve_ref(git_dir, common, content[4:].strip(), depth + 1)
+        return content if _SHA_PATTERN.match(content) else None
+    return _packed_refs(common).get(ref)
+
+
+def _head(git_dir: Path, common: Path) -> Tuple[Optional[str], Optional[str]]:
+    """Return (branch, sha) for a git dir; branch is None when detached."""
+    content = _read_text(git_dir / "HEAD") or ""
+    if content.startswith("ref:"):
+        ref = content[4:].strip()
+        branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+        return branch, _resolve_ref(git_dir, common, ref)
+    return None, content if _SHA_PATTERN.match(content) else None
+
+
+def _start(path: Optional[Path]) -> str:
+    return str(Path(path) if path else Path.cwd())
+
+
+def git_root(path: Optional[Path] = None) -> Path:
+    """Get the worktree root containing path (default: cwd), or cwd outside git."""
+    try:
+        return _locate(_start(path))[0]
+    except UnsupportedLayout:
+        output = _run_git(Path(_start(path)), "rev-parse", "--show-toplevel")
+        return Path(output) if output else Path.cwd()
+
+
+def is_repo(path: Optional[Path] = None) -> bool:
+    """Return True when path is inside a git repository."""
+    try:
+        _locate(_start(path))
+        return True
+    except UnsupportedLayout:
+        return _run_git(Path(_start(path)), "rev-parse", "--git-dir") is not None
+
+
+def git_dir(path: Optional[Path] = None) -> Optional[Path]:
+    """Get the per-worktree git directory for path."""
+    try:
+        return _locate(_start(path))[1]
+    except UnsupportedLayout:
+        output = _run_git(Path(_start(path)), "rev-parse", "--absolute-git-dir")
+        return Path(output) if output else None
+
+
+def common_dir(path: Optional[Path] = None) -> Optional[Path]:
+    """Get the git directory shared by all worktrees of the repository."""
+    try:
+        return _locate(_start(path))[2]
+    except UnsupportedLayout:
+        output = _run_git(Path(_start(path)), "rev-parse", "--path-format=absolute", "--git-common-dir")
+        return Path(output) if output else None
+
+
+def current_branch(path: Optional[Path] = None) -> Optional[str]:
+    """Get the checked-out branch name, or None when HEAD is detached."""
+    try:
+        _, gdir, common = _locate(_start(path))
+        return _head(gdir, common)[0]
+    except UnsupportedLayout:
+        return _run_git(Path(_start(path)), "branch", "--show-current") or None
+
+
+def head_sha(path: Optional[Path] = None) -> Optional[str]:
+    """Get the full commit id of HEAD, or None for unborn branches."""
+    try:
+        _, gdir, common = _locate(_start(path))
+        return _head(gdir, common)[1]
+    except UnsupportedLayout:
+        return _run_git(Path(_start(path)), "rev-parse", "HEAD")
+
+
+def short_sha(path: Optional[Path] = None, length: int = SHORT_SHA_LENGTH) -> Optional[str]:
+    """Get an abbreviated HEAD commit id."""
+    sha = head_sha(path)
+    return sha[:length] if sha else None
+
+
+def same_revision(left: Optional[str], right: Optional[str]) -> bool:
+    """
+    Compare two possibly abbreviated commit ids.
+
+    git may abbreviate beyond 7 characters in large repositories, so ids
+    recorded by `git rev-parse --short` and by short_sha() can differ in
+    length while naming the same commit.
+    """
+    if not left or not right:
+        return False
+    left, right = left.lower(), right.lower()
+    return left.startswith(right) or right.startswith(left)
+
+
+def worktree_list(path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    List worktrees like `git worktree list --porcelain`.
+
+    The main worktree comes first. Each entry has path, head and branch.
+    """
+    try:
+        _, _, common = _locate(_start(path))
+        if common.name != ".git":
+            raise UnsupportedLayout("main worktree uses a separate git dir")
+        branch, sha = _head(common, common)
+        worktrees = [{"path": str(common.parent), "head": sha, "branch": branch}]
+        linked = []
+        admin_root = common / "worktrees"
+        if admin_root.is_dir():
+            for admin in admin_root.iterdir():
+                gitdir_file = _read_text(admin / "gitdir")
+                if not gitdir_file:
+                    continue
+                branch, sha = _head(admin, common)
+                linked.append({
+                    "path": str(Path(gitdir_file).parent),
+                    "head": sha,
+                    "branch": branch,
+                })
+        worktrees.extend(sorted(linked, key=lambda item: item["path"]))
+        return worktrees
+    except UnsupportedLayout:
+        return _worktree_list_cli(Path(_start(path)))
+
+
+def _worktree_list_cli(start: Path) -> List[Dict[str, Any]]:
+    output = _run_git(start, "worktree", "list", "--porcelain")
+    worktrees: List[Dict[str, Any]] = []
+    if not output:
+        return worktrees
+    current: Dict[str, Any] = {}
+    for line in output.splitlines() + [""]:
+        if not line:
+            if current:
+                worktrees.append(current)
+            current = {}
+            continue
+        key, _, value = line.partition(" ")
+        if key == "worktree":
+            current = {"path": value, "head": None, "branch": None}
+        elif key == "HEAD":
+            current["head"] = value
+        elif key == "branch":
+            current["branch"] = value[len("refs/heads/"):] if value.startswith("refs/heads/") else value
+    return worktrees
+
+
+def main_worktree(path: Optional[Path] = None) -> Optional[Path]:
+    """Get the path of the repository's main worktree."""
+    worktrees = worktree_list(path)
+    return Path(worktrees[0]["path"]) if worktrees else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resolve git repository facts")
+    parser.add_argument(
+        "query",
+        choices=["root", "git-dir", "common-dir", "branch", "head", "short-sha", "main-worktree", "worktrees"],
+    )
+    parser.add_argument("-C", dest="path", help="Directory to resolve from (default: cwd)")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args()
+
+    start = Path(args.path) if args.path else None
+    queries = {
+        "root": lambda: git_root(start),
+        "git-dir": lambda: git_dir(start),
+        "common-dir": lambda: common_dir(start),
+        "branch": lambda: current_branch(start),
+        "head": lambda: head_sha(start),
+        "short-sha": lambda: short_sha(start),
+        "main-worktree": lambda: main_worktree(start),
+        "worktrees": lambda: worktree_list(start),
+    }
+    value = queries[args.query]()
+
+    if args.json:
+        print(json.dumps(value if isinstance(value, list) else (str(value) if value else None), indent=2))
+    elif isinstance(value, list):
+        for item in value:
+            print(f"{item['path']}\t{item.get('head') or ''}\t{item.get('branch') or ''}")
+    elif value is None:
+        raise SystemExit(1)
+    else:
+        print(value)
+
+
+if __name__ == "__main__":
+    main()
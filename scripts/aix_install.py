@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Plan and apply batched installs (capabilities, seed and tier upgrades) as a
+single transaction.
+
+Plans are computed up front as a list of copies (each either overwriting or
+keeping an existing file, and recorded in the manifest unless it targets git
+hooks). Sources are staged into .aix/ in parallel, hashed from the bytes read
+for the copy, then moved into place, recorded and saved once. Any failure
+restores every touched path.
+"""
+
+import os
+import re
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from aix_manifest import ManifestRecorder, hash_bytes, init, load_manifest, relpath, save_manifest
+from aix_registry import Capability
+from aix_tier import tier_name
+
+
+class InstallError(Exception):
+    """Raised when a plan cannot be built or applied (after rollback)."""
+
+
+class CopyOp(NamedTuple):
+    source: Path
+    dest: Path
+    capability: Optional[str]
+    overwrite: bool = True
+    executable: bool = False
+    record: bool = True
+
+
+class InstallPlan(NamedTuple):
+    ops: List[CopyOp]
+    notes: List[str]
+
+
+class _Staged(NamedTuple):
+    op: CopyOp
+    staged: Optional[Path]
+    content: Optional[bytes]
+    digest: Optional[str]
+
+
+def _walk_files(root: Path) -> List[Path]:
+    return sorted(
+        path for path in root.rglob("*")
+        if path.is_file() and "__pycache__" not in path.parts
+    )
+
+
+def _top_files(root: Path, pattern: str = "*") -> List[Path]:
+    return sorted(path for path in root.glob(pattern) if path.is_file())
+
+
+def op_action(op: CopyOp) -> str:
+    """What applying op would do right now: create, update or keep."""
+    if not op.dest.exists():
+        return "create"
+    return "update" if op.overwrite else "keep"
+
+
+class _PlanBuilder:
+    """
+    Collect copies in install order, one per destination.
+
+    A later overwriting copy replaces an earlier one (a higher tier ships a
+    newer file); a later keep-existing copy never displaces an earlier one.
+    """
+
+    def __init__(self) -> None:
+        self.ops: Dict[Path, CopyOp] = {}
+        self.notes: List[str] = []
+
+    def add(self, op: CopyOp) -> None:
+        if op.dest not in self.ops or op.overwrite:
+            self.ops[op.dest] = op
+
+    def add_tree(self, source: Path, dest: Path, capability: str, overwrite: bool = True) -> None:
+        for path in _walk_files(source):
+            self.add(CopyOp(path, dest / path.relative_to(source), capability, overwrite))
+
+    def will_exist(self, path: Path) -> bool:
+        return path.exists() or path in self.ops
+
+    def content(self, path: Path) -> Optional[str]:
+        """Text of path as it will be once planned copies land (None if absent)."""
+        op = self.ops.get(path)
+        if op is not None and (op.overwrite or not path.exists()):
+            return op.source.read_text(errors="replace")
+        if path.is_file():
+            return path.read_text(errors="replace")
+        return None
+
+    def plan(self) -> InstallPlan:
+        return InstallPlan(list(self.ops.values()), self.notes)
+
+
+def detect_ci_template(tech_stack: Optional[str]) -> Optional[str]:
+    """Pick a CI template from the Runtime row of docs/tech-stack.md."""
+    if not tech_stack:
+        return None
+    runtime = next(
+        (line for line in tech_stack.splitlines() if re.search(r"\| Runtime", line, re.IGNORECASE)),
+        "",
+    ).lower()
+    if re.search(r"node|javascript|typescript", runtime):
+        return "ci-node.yml"
+    if "python" in runtime:
+        return "ci-python.yml"
+    if "go" in runtime:
+        return "ci-go.yml"
+    return None
+
+
+def _plan_tier(builder: _PlanBuilder, tier_dir: Path, repo_root: Path, capability: str) -> None:
+    """Add one tier's files, mirroring the per-tier steps of upgrade.sh."""
+    aix_dir = repo_root / ".aix"
+
+    # Roles and workflows never replace local edits
+    for kind in ("roles", "workflows"):
+        for path in _top_files(tier_dir / kind, "*.md"):
+            builder.add(CopyOp(path, aix_dir / kind / path.name, capability, overwrite=False))
+
+    skills_dir = tier_dir / "skills"
+    if skills_dir.is_dir():
+        for skill_dir in sorted(path for path in skills_dir.iterdir() if path.is_dir()):
+            builder.add_tree(skill_dir, aix_dir / "skills" / skill_dir.name, capability)
+
+    hooks = _top_files(tier_dir / "hooks")
+    if any("compact" in path.name for path in hooks):
+        # Claude Code hooks (compaction) go to .aix/hooks/
+        for path in hooks:
+            builder.add(CopyOp(path, aix_dir / "hooks" / path.name, capability, executable=True))
+        builder.notes.append("Note: Configure hooks in .claude/settings.json")
+    elif hooks:
+        # Git hooks live outside .aix and aren't tracked in the manifest
+        if (repo_root / "package.json").is_file():
+            hooks_dir = repo_root / ".husky"
+            builder.notes.append(
+                "Note: Ensure husky is installed (npm install husky --save-dev && npx husky install)"
+            )
+        elif (repo_root / ".git" / "hooks").is_dir():
+            hooks_dir = repo_root / ".git" / "hooks"
+            builder.notes.append("Git hooks installed to .git/hooks/")
+        else:
+            hooks_dir = None
+            builder.notes.append("Warning: .git/hooks not found. Skipping git hooks.")
+        if hooks_dir is not None:
+            for path in hooks:
+                builder.add(CopyOp(path, hooks_dir / path.name, capability, executable=True, record=False))
+
+    for path in _top_files(tier_dir / "scripts"):
+        builder.add(CopyOp(path, aix_dir / "scripts" / path.name, capability, executable=True))
+
+    docs_dir = tier_dir / "docs"
+    if docs_dir.is_dir():
+        for path in _walk_files(docs_dir):
+            dest = repo_root / "docs" / path.relative_to(docs_dir)
+            if dest.exists():
+                builder.notes.append(f"Skipped {path.relative_to(docs_dir)} (already exists)")
+            builder.add(CopyOp(path, dest, capability, overwrite=False))
+
+    ci_dir = tier_dir / "ci"
+    if ci_dir.is_dir():
+        template = detect_ci_template(builder.content(repo_root / "docs" / "tech-stack.md"))
+        if template and (ci_dir / template).is_file():
+            builder.add(CopyOp(ci_dir / template, aix_dir / "ci" / "ci.yml", capability))
+            builder.notes.append(f"Selected {template} based on tech-stack.md")
+        else:
+            builder.add_tree(ci_dir, aix_dir / "ci", capability)
+            builder.notes.append("Could not detect runtime. All CI templates copied to .aix/ci/")
+        builder.notes.append("Note: Copy .aix/ci/ci.yml to .github/workflows/ci.yml")
+
+
+def plan_tier_upgrade(framework_root: Path, repo_root: Path, current: int, target: int) -> InstallPlan:
+    """
+    Plan every copy for moving a repo from tier current to tier target.
+
+    Tiers are applied in order, then core skills (only ones the repo lacks)
+    and core scripts (only missing files) are filled in, as upgrade.sh did.
+
+    Raises:
+        InstallError: If a tier directory is missing from the framework
+    """
+    builder = _PlanBuilder()
+    aix_dir = repo_root / ".aix"
+
+    for tier in range(current + 1, target + 1):
+        name = tier_name(tier)
+        tier_dir = framework_root / "tiers" / f"{tier}-{name}"
+        if not tier_dir.is_dir():
+            raise InstallError(f"Tier {tier} ({name}) not found at {tier_dir}")
+        _plan_tier(builder, tier_dir, repo_root, f"tier-{tier}-{name}")
+
+    skills_root = framework_root / "skills"
+    if skills_root.is_dir():
+        for skill_dir in sorted(path for path in skills_root.iterdir() if path.is_dir()):
+            dest_dir = aix_dir / "skills" / skill_dir.name
+            present = dest_dir.is_dir() or any(dest_dir in dest.parents for dest in builder.ops)
+            for path in _walk_files(skill_dir):
+                dest = dest_dir / path.relative_to(skill_dir)
+                # An existing skill is left alone; its matching files are only recorded
+                if not present or builder.will_exist(dest):
+                    builder.add(CopyOp(path, dest, "core-skills", overwrite=False))
+
+    for path in _top_files(framework_root / "scripts"):
+        builder.add(CopyOp(path, aix_dir / "scripts" / path.name, "core-scripts", overwrite=False, executable=True))
+
+    return builder.plan()
+
+
+def plan_seed(framework_root: Path, repo_root: Path) -> InstallPlan:
+    """
+    Plan the initial Tier 0 install done by bootstrap.sh.
+
+    Raises:
+        InstallError: If the framework has no tiers/0-seed
+    """
+    seed_dir = framework_root / "tiers" / "0-seed"
+    if not seed_dir.is_dir():
+        raise InstallError(f"Tier 0 (seed) not found at {seed_dir}")
+
+    builder = _PlanBuilder()
+    aix_dir = repo_root / ".aix"
+    for path in _walk_files(seed_dir):
+        relative = path.relative_to(seed_dir)
+        executable = relative.parts[0] == "hooks" and path.suffix == ".sh"
+        builder.add(CopyOp(path, aix_dir / relative, "seed-base", executable=executable))
+
+    templates = framework_root / "docs" / "templates"
+    if templates.is_dir():
+        builder.add_tree(templates, repo_root / "docs", "docs-templates", overwrite=False)
+
+    skills_root = framework_root / "skills"
+    if skills_root.is_dir():
+        builder.add_tree(skills_root, aix_dir / "skills", "core-skills")
+
+    for path in _top_files(framework_root / "scripts"):
+        builder.add(CopyOp(path, aix_dir / "scripts" / path.name, "core-scripts"))
+
+    return builder.plan()
+
+
+def plan_capability(cap: Capability, framework_root: Path, repo_root: Path) -> List[CopyOp]:
+    """
+    Expand one capability into file copies, mirroring adopt.sh semantics.
+
+    Docs never overwrite local files; hooks and scripts are made executable.
+
+    Raises:
+        InstallError: If the source is missing or the type can't be adopted
+    """
+    if cap.type == "adapter":
+        raise InstallError(f"'{cap.name}' is an adapter; use add-adapter.sh")
+
+    source = framework_root / cap.source_ref
+    if not source.exists():
+        raise InstallError(f"Source not found at {source}")
+
+    dest = cap.dest_path(repo_root)
+    overwrite = cap.type != "docs"
+    executable = cap.type in ("hook", "script")
+
+    if source.is_file():
+        ops = [CopyOp(source, dest, cap.name, overwrite, executable)]
+    else:
+        ops = [
+            CopyOp(path, dest / path.relative_to(source), cap.name, overwrite, executable)
+            for path in _walk_files(source)
+        ]
+
+    # Companion files land next to the main file and keep their own mode
+    for ref in cap.companion_refs:
+        companion = framework_root / ref
+        if not companion.is_file():
+            raise InstallError(f"Companion not found at {companion}")
+        ops.append(CopyOp(companion, dest.parent / companion.name, cap.name, overwrite))
+    return ops
+
+
+class _Transaction:
+    """Track every path a batch touches so it can be put back on failure."""
+
+    def __init__(self, work_dir: Path) -> None:
+        self.work_dir = work_dir
+        self.backup_dir = work_dir / "backup"
+        self.backups: List[Tuple[Path, Optional[Path]]] = []
+        self.created_dirs: List[Path] = []
+        self._protected = set()
+
+    def ensure_dir(self, path: Path) -> None:
+        missing = []
+        for candidate in (path, *path.parents):
+            if candidate.exists():
+                break
+            missing.append(candidate)
+        for candidate in reversed(missing):
+            candidate.mkdir()
+            self.created_dirs.append(candidate)
+
+    def protect(self, path: Path) -> None:
+        """Remember path's current content (or absence) before it is written."""
+        if path in self._protected:
+            return
+        self._protected.add(path)
+        if path.exists():
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            backup = self.backup_dir / str(len(self.backups))
+            shutil.copy2(path, backup)
+            self.backups.append((path, backup))
+        else:
+            self.backups.append((path, None))
+
+    def rollback(self) -> None:
+        for path, backup in reversed(self.backups):
+            if backup is not None:
+                os.replace(backup, path)
+            elif path.exists():
+                path.unlink()
+        for path in reversed(self.created_dirs):
+            try:
+                path.rmdir()
+            except OSError:
+                pass
+
+
+def _stage(op: CopyOp, work_dir: Path, index: int, recorded: Set[Path]) -> _Staged:
+    keep = not op.overwrite and op.dest.exists()
+    if keep and (not op.record or op.dest in recorded):
+        # Nothing to copy and nothing new to record
+        return _Staged(op, None, None, None)
+    content = op.source.read_bytes()
+    digest = hash_bytes(content)
+    if keep:
+        return _Staged(op, None, content, digest)
+    staged = work_dir / f"{index}.stage"
+    staged.write_bytes(content)
+    mode = stat.S_IMODE(op.source.stat().st_mode)
+    if op.executable:
+        mode |= stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+    os.chmod(staged, mode)
+    return _Staged(op, staged, content, digest)
+
+
+def apply_plan(
+    ops: List[CopyOp],
+    repo_root: Path,
+    framework_root: Path,
+    aix_version: Optional[str] = None,
+    extra_writes: Optional[Dict[Path, str]] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Apply a batch of copies, manifest records and extra file writes atomically.
+
+    Args:
+        ops: Planned copies
+        repo_root: Target repository root
+        framework_root: AIX framework root (for manifest source refs)
+        aix_version: Framework revision to stamp into the manifest
+        extra_writes: Whole-file writes to apply in the same transaction
+        workers: Parallel staging threads (default: executor default)
+
+    Returns:
+        Files written per capability
+
+    Raises:
+        InstallError: On any failure, after restoring all touched paths
+    """
+    for op in ops:
+        if not op.source.is_file():
+            raise InstallError(f"Source not found at {op.source}")
+
+    aix_dir = repo_root / ".aix"
+    manifest_path = aix_dir / "manifest.json"
+    work_dir = aix_dir / f".install-{os.getpid()}"
+    work_dir.mkdir(parents=True, exist_ok=True)
+    txn = _Transaction(work_dir)
+    written: Dict[str, int] = {}
+
+    try:
+        data = load_manifest(manifest_path)
+        recorder = ManifestRecorder(data, repo_root, framework_root)
+        recorded = {repo_root / rel for rel in recorder.recorded}
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            staged = list(pool.map(
+                lambda item: _stage(item[1], work_dir, item[0], recorded), enumerate(ops)
+            ))
+
+        for item in staged:
+            op = item.op
+            if item.staged is not None:
+                txn.ensure_dir(op.dest.parent)
+                txn.protect(op.dest)
+                os.replace(item.staged, op.dest)
+                written[op.capability or ""] = written.get(op.capability or "", 0) + 1
+            if not op.record:
+                continue
+            dest_rel = relpath(op.dest, repo_root)
+            snapshot_path = aix_dir / "snapshots" / dest_rel
+            if not snapshot_path.exists():
+                txn.ensure_dir(snapshot_path.parent)
+                txn.protect(snapshot_path)
+            recorder.record(op.source, op.dest, op.capability, item.content, item.digest)
+
+        for path, text in (extra_writes or {}).items():
+            txn.ensure_dir(path.parent)
+            txn.protect(path)
+            tmp_path = work_dir / f"{path.name}.write"
+            tmp_path.write_text(text)
+            os.replace(tmp_path, path)
+
+        init(data, aix_version)
+        txn.protect(manifest_path)
+        save_manifest(manifest_path, data)
+    except Exception as e:
+        txn.rollback()
+        if isinstance(e, InstallError):
+            raise
+        raise InstallError(f"{type(e).__name__}: {e}; changes rolled back") from e
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return written
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Crash-safe batched file writes with a redo journal.
+
+Writes are staged as complete files under a transaction directory, then
+committed by renaming each over its target. Before the first rename the
+journal records every (staged, target) pair, so a run interrupted partway
+through commit is finished by recover() on the next run; a run that never
+reached commit leaves targets untouched and its staging is discarded. A
+rename that fails in-process rolls back the ones already done.
+
+Used by aix-sync.py --apply and --apply-bundle (transaction directory
+.aix/state/sync-txn/).
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+JOURNAL_NAME = "journal.json"
+
+
+class JournalError(Exception):
+    """Raised when a commit fails (after rollback)."""
+
+
+def _write_synced(path: Path, data: bytes, mode: Optional[int] = None) -> None:
+    with open(path, "wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    if mode is not None:
+        os.chmod(path, mode)
+
+
+def _sync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    """One batch of file replacements, committed all together or not at all."""
+
+    def __init__(self, txn_dir: Path) -> None:
+        self.txn_dir = txn_dir
+        self.ops: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def stage(self, target: Path, data: bytes, mode: Optional[int] = None) -> None:
+        """
+        Stage target's new content; nothing is visible until commit().
+
+        The mode defaults to target's current mode (0644 for new files).
+        """
+        staged_dir = self.txn_dir / "staged"
+        if not self.ops:
+            if self.txn_dir.exists():
+                shutil.rmtree(self.txn_dir)
+            staged_dir.mkdir(parents=True)
+        if mode is None:
+            mode = target.stat().st_mode & 0o7777 if target.exists() else 0o644
+        staged = staged_dir / str(len(self.ops))
+        _write_synced(staged, data, mode)
+        self.ops.append({"target": str(target), "staged": str(staged)})
+
+    def commit(self) -> int:
+        """
+        Rename every staged file over its target.
+
+        Returns:
+            Number of files written
+
+        Raises:
+            JournalError: If a rename fails; completed renames are undone
+        """
+        if not self.ops:
+            return 0
+        backup_dir = self.txn_dir / "backup"
+        backup_dir.mkdir(exist_ok=True)
+        for index, op in enumerate(self.ops):
+            target = Path(op["target"])
+            if target.exists():
+                backup = backup_dir / str(index)
+                shutil.copy2(target, backup)
+                op["backup"] = str(backup)
+        _sync_dir(self.txn_dir / "staged")
+
+        journal_path = self.txn_dir / JOURNAL_NAME
+        _write_synced(journal_path.with_suffix(".tmp"), json.dumps({"ops": self.ops}).encode())
+        os.replace(journal_path.with_suffix(".tmp"), journal_path)
+        _sync_dir(self.txn_dir)
+
+        done: List[Dict[str, Any]] = []
+        try:
+            for op in self.ops:
+                target = Path(op["target"])
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(op["staged"], target)
+                done.append(op)
+        except OSError as e:
+            for op in reversed(done):
+                target = Path(op["target"])
+                if op.get("backup"):
+                    os.replace(op["backup"], target)
+                else:
+                    target.unlink()
+            shutil.rmtree(self.txn_dir, ignore_errors=True)
+            raise JournalError(f"Commit failed ({e}); {len(done)} file(s) rolled back") from e
+
+        shutil.rmtree(self.txn_dir, ignore_errors=True)
+        return len(self.ops)
+
+
+def recover(txn_dir: Path) -> Optional[int]:
+    """
+    Finish or discard a transaction left behind by an interrupted run.
+
+    Returns:
+        Files completed from the journal, or None if there was nothing to
+        finish (no transaction, or one that never started committing)
+    """
+    if not txn_dir.exists():
+        return None
+    journal_path = txn_dir / JOURNAL_NAME
+    completed: Optional[int] = None
+    if journal_path.exists():
+        try:
+            ops = json.loads(journal_path.read_text()).get("ops", [])
+        except (OSError, ValueError):
+            ops = []
+        completed = 0
+        for op in ops:
+            staged = Path(op["staged"])
+            if staged.exists():
+                target = Path(op["target"])
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(staged, target)
+                completed += 1
+    shutil.rmtree(txn_dir, ignore_errors=True)
+    return completed
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Read and update the AIX manifest (.aix/manifest.json) and its snapshots.
+
+Shared by aix-manifest.py and the batched install/adopt paths. Callers load
+the manifest once, record any number of entries in memory, and save once.
+
+Each entry records its digest as "hash" with a "hash_algo" (sha256 or
+blake2b). Entries from older manifests carry only a "sha256" field; they
+are read as sha256 and rewritten in the current form when next recorded
+or migrated.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def today() -> str:
+    return date.today().isoformat()
+
+
+def load_manifest(path: Path) -> Dict[str, Any]:
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"manifest_version": 1, "files": []}
+
+
+def dump_manifest(data: Dict[str, Any]) -> str:
+    data.setdefault("manifest_version", 1)
+    data.setdefault("files", [])
+    return json.dumps(data, indent=2) + "\n"
+
+
+def save_manifest(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(dump_manifest(data))
+    os.replace(tmp_path, path)
+
+
+HASH_ALGOS = ("sha256", "blake2b")
+
+# Files this large are hashed from a memory map instead of read in chunks
+MMAP_MIN_BYTES = 1024 * 1024
+READ_CHUNK = 1024 * 1024
+
+
+def default_hash_algo() -> str:
+    """
+    Digest used for new entries (AIX_HASH_ALGO, default sha256).
+
+    sha256 stays the default: with SHA CPU extensions (most current x86 and
+    ARM) it hashes faster than BLAKE2b. blake2b is faster without them.
+    """
+    algo = os.environ.get("AIX_HASH_ALGO", "sha256")
+    return algo if algo in HASH_ALGOS else "sha256"
+
+
+def _hasher(algo: str) -> Any:
+    if algo == "sha256":
+        return hashlib.sha256()
+    if algo == "blake2b":
+        return hashlib.blake2b(digest_size=32)
+    raise ValueError(f"Unsupported hash algorithm: {algo}")
+
+
+def hash_bytes(content: bytes, algo: Optional[str] = None) -> str:
+    hasher = _hasher(algo or default_hash_algo())
+    hasher.update(content)
+    return hasher.hexdigest()
+
+
+def hash_file(path: Path, algo: Optional[str] = None) -> str:
+    hasher = _hasher(algo or default_hash_algo())
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size >= MMAP_MIN_BYTES:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+        else:
+            for chunk in iter(lambda: handle.read(READ_CHUNK), b""):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    return hash_file(path, "sha256")
+
+
+def sha256_bytes(content: bytes) -> str:
+    return hash_bytes(content, "sha256")
+
+
+def entry_digest(entry: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """Return (algo, digest) recorded for a manifest entry, legacy form included."""
+    if entry.get("hash"):
+        return entry.get("hash_algo", "sha256"), entry["hash"]
+    if entry.get("sha256"):
+        return "sha256", entry["sha256"]
+    return None, None
+
+
+def set_entry_digest(entry: Dict[str, Any], digest: str, algo: str) -> None:
+    entry.pop("sha256", None)
+    entry["hash_algo"] = algo
+    entry["hash"] = digest
+
+
+def migrate_entries(data: Dict[str, Any], repo_root: Path, algo: Optional[str] = None) -> int:
+    """
+    Rewrite entries in the current digest form, re-hashing snapshots whose
+    recorded digest uses a different algorithm.
+
+    Returns:
+        Number of entries changed
+    """
+    algo = algo or default_hash_algo()
+    changed = 0
+    for entry in data.get("files", []):
+        recorded_algo, digest = entry_digest(entry)
+        if recorded_algo == algo and "sha256" not in entry:
+            continue
+        if recorded_algo != algo:
+            snapshot_path = repo_root / ".aix" / "snapshots" / entry.get("path", "")
+            if not entry.get("path") or not snapshot_path.is_file():
+                continue
+            digest = hash_file(snapshot_path, algo)
+        if digest:
+            set_entry_digest(entry, digest, algo)
+            changed += 1
+    return changed
+
+
+class HashCache:
+    """
+    Thread-safe digest memo keyed by path and algorithm, revalidated by
+    (mtime_ns, size).
+
+    Lets many repos that share one framework tree hash each template once.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: Dict[Tuple[str, str], Tuple[Tuple[int, int], str]] = {}
+        self._lock = threading.Lock()
+
+    def digest(self, path: Path, algo: Optional[str] = None) -> str:
+        algo = algo or default_hash_algo()
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = (str(path), algo)
+        with self._lock:
+            cached = self._hashes.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+        digest = hash_file(path, algo)
+        with self._lock:
+            self._hashes[key] = (signature, digest)
+        return digest
+
+    def sha256(self, path: Path) -> str:
+        return self.digest(path, "sha256")
+
+
+def relpath(path: Path, root: Path) -> str:
+    if not path.is_absolute():
+        return str(path)
+    return str(path.resolve().relative_to(root.resolve()))
+
+
+def source_ref(source: Path, framework_root: Optional[Path]) -> str:
+    if framework_root is None:
+        return str(source)
+    try:
+        return str(source.resolve().relative_to(framework_root.resolve()))
+    except ValueError:
+        return str(source)
+
+
+def init(data: Dict[str, Any], aix_version: Optional[str]) -> None:
+    data.setdefault("installed_at", today())
+    touch(data, aix_version)
+
+
+def touch(data: Dict[str, Any], aix_version: Optional[str]) -> None:
+    data["updated_at"] = today()
+    if aix_version:
+        data["aix_version"] = aix_version
+
+
+class ManifestRecorder:
+    """
+    Record installed files into an in-memory manifest.
+
+    Keeps a path index so recording n files is O(n) instead of rescanning
+    the file list per entry.
+    """
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        repo_root: Path,
+        framework_root: Optional[Path],
+    ) -> None:
+        self.data = data
+        self.data.setdefault("files", [])
+        self.repo_root = repo_root
+        self.framework_root = framework_root
+        self.recorded = {entry.get("path") for entry in self.data["files"]}
+        self.created_snapshots: List[Path] = []
+
+    def record(
+        self,
+        source: Path,
+        dest: Path,
+        capability: Optional[str],
+        content: Optional[bytes] = None,
+        digest: Optional[str] = None,
+    ) -> bool:
+        """
+        Record dest as installed from source.
+
+        content/digest may be passed when the caller already holds the
+        source bytes, so the snapshot is written without re-reading the
+        source and the digest is not recomputed. digest must use the
+        current default algorithm.
+
+        Returns:
+            True if a new entry was added
+        """
+        dest_path = dest
+        if not dest_path.is_absolute():
+            dest_path = (self.repo_root / dest_path).resolve()
+
+        if not dest_path.exists():
+            return False
+
+        dest_rel = relpath(dest_path, self.repo_root)
+        if dest_rel in self.recorded:
+            return False
+
+        snapshot_path = self.repo_root / ".aix" / "snapshots" / dest_rel
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+
+        algo = default_hash_algo()
+        if snapshot_path.exists():
+            digest = hash_file(snapshot_path, algo)
+        else:
+            if content is None:
+                content = source.read_bytes() if source.exists() else dest_path.read_bytes()
+                digest = None
+            snapshot_path.write_bytes(content)
+            self.created_snapshots.append(snapshot_path)
+            digest = digest or hash_bytes(content, algo)
+
+        entry = {
+            "path": dest_rel,
+            "source": source_ref(source, self.framework_root),
+            "hash_algo": algo,
+            "hash": digest,
+        }
+        if capability:
+            entry["capability"] = capability
+
+        self.data["files"].append(entry)
+        self.recorded.add(dest_rel)
+        return True
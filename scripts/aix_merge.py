@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Three-way merges for aix-sync, memoized on disk.
+
+A `git merge-file` result depends only on its inputs and the git that
+produced it, so results are stored keyed by the local, base and upstream
+digests and the git version; conflicts also key on the paths named in
+their markers. Repeated sync previews reuse the stored output and exit
+code instead of re-merging.
+
+The cache lives in the worktree-shared store (<git common dir>/aix-cache/
+merge/, see aix_cache.py), so clean merges computed in one worktree are
+hits in the others; with the shared cache disabled it is .aix/cache/merge/.
+Entries are evicted least recently used first once the directory exceeds
+its size budget.
+
+Environment:
+    AIX_MERGE_CACHE_MB    Size budget for the merge cache in MiB (default: 64)
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from aix_cache import cache_root
+
+MERGE_CACHE_DIR = Path(".aix") / "cache" / "merge"
+CACHE_FORMAT = 1
+DEFAULT_MAX_MB = 64
+
+_BACKEND: Dict[str, str] = {}
+
+
+def merge_three_way(local: Path, base: Path, new: Path) -> Tuple[int, str]:
+    """Run `git merge-file -p`; return (exit code, merged output)."""
+    result = subprocess.run(
+        ["git", "merge-file", "-p", str(local), str(base), str(new)],
+        capture_output=True,
+        text=True,
+    )
+    return result.returncode, result.stdout
+
+
+def backend_version() -> str:
+    """Identify the merge backend (the git version), once per process."""
+    if "git" not in _BACKEND:
+        try:
+            result = subprocess.run(["git", "--version"], capture_output=True, text=True)
+            _BACKEND["git"] = result.stdout.strip() or "unknown"
+        except OSError:
+            _BACKEND["git"] = "unknown"
+    return _BACKEND["git"]
+
+
+def _max_bytes() -> int:
+    try:
+        return int(float(os.environ.get("AIX_MERGE_CACHE_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_MAX_MB * 1024 * 1024
+
+
+class MergeCache:
+    """
+    Merge results stored as one JSON file per input combination.
+
+    A hit touches the file's mtime, which is the LRU clock used by prune().
+    Failed merges (git errors rather than conflicts) are never stored.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: Optional[int] = None) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = _max_bytes() if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    @classmethod
+    def for_repo(cls, repo_root: Path) -> "MergeCache":
+        shared = cache_root(repo_root)
+        return cls(shared / "merge" if shared is not None else repo_root / MERGE_CACHE_DIR)
+
+    def key(self, local_hash: str, base_hash: str, new_hash: str, algo: str, labels: Tuple[str, ...] = ()) -> str:
+        material = "\0".join((algo, local_hash, base_hash, new_hash, backend_version(), *labels))
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[int, str]]:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text())
+            if data.get("format") != CACHE_FORMAT:
+                return None
+            result = int(data["code"]), str(data["output"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, code: int, output: str) -> None:
+        try:
+            if not self.cache_dir.exists():
+                self.cache_dir.mkdir(parents=True)
+            # Keep the cache out of git without touching the repo's .gitignore
+            ignore = self.cache_dir.parent / ".gitignore"
+            if not ignore.exists():
+                ignore.write_text("*\n")
+            path = self._path(key)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({"format": CACHE_FORMAT, "code": code, "output": output}))
+            os.replace(tmp_path, path)
+            self.stored += 1
+        except OSError:
+            pass
+
+    def merge(
+        self,
+        local: Path,
+        base: Path,
+        new: Path,
+        digests: Tuple[str, str, str],
+        algo: str,
+    ) -> Tuple[int, str]:
+        """
+        Merge local, base and new, reusing a stored result for the same inputs.
+
+        Args:
+            digests: (local, base, new) content digests computed with algo
+        """
+        # Conflict markers name the local and upstream paths, so they are
+        # inputs too; clean results don't mention them and are shared
+        clean_key = self.key(*digests, algo)
+        conflict_key = self.key(*digests, algo, labels=(str(local), str(new)))
+        cached = self.get(clean_key) or self.get(conflict_key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        code, output = merge_three_way(local, base, new)
+        # 0 is clean, 1-127 counts conflicts; anything else is a git failure
+        if code == 0:
+            self.put(clean_key, code, output)
+        elif 0 < code < 128:
+            self.put(conflict_key, code, output)
+        return code, output
+
+    def prune(self) -> int:
+        """
+        Evict least recently used entries until the cache fits its budget.
+
+        Returns:
+            Number of entries removed
+        """
+        entries: List[Tuple[int, int, Path]] = []
+        total = 0
+        try:
+            for path in self.cache_dir.glob("*.json"):
+                stat = path.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+                total += stat.st_size
+        except OSError:
+            return 0
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Keep a directory as a hardlink mirror of the canonical skills tree.
+
+For adapters with skills.strategy: mirror (tools or sandboxes that don't
+follow symlinks). Each top-level entry of .aix/skills (normally a skill
+directory holding SKILL.md) is one unit. A unit is rebuilt only when the
+stat signature of its files (size, mtime, inode) differs from the record
+kept in the manifest, so an unchanged tree costs one stat per file.
+
+Files are hardlinked into the mirror; on another filesystem, or where
+links aren't allowed, they are copied instead. A rebuilt unit is staged
+beside its target and swapped in, so readers never see a half-written
+skill. Entries in the mirror that aix didn't create are left alone.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MIRROR_FORMAT = 1
+
+Signature = Dict[str, List[int]]
+
+
+def _units(source: Path) -> List[Path]:
+    if not source.is_dir():
+        return []
+    return sorted(
+        entry for entry in source.iterdir()
+        if not entry.name.startswith(".") and entry.name != "__pycache__"
+    )
+
+
+def unit_signature(unit: Path) -> Signature:
+    """Map each file under a unit (relative path) to [size, mtime_ns, inode]."""
+    if unit.is_file():
+        stat = unit.stat()
+        return {".": [stat.st_size, stat.st_mtime_ns, stat.st_ino]}
+    signature: Signature = {}
+    for path in sorted(unit.rglob("*")):
+        if path.is_file() and "__pycache__" not in path.parts:
+            stat = path.stat()
+            signature[str(path.relative_to(unit))] = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+    return signature
+
+
+def tree_signature(source: Path) -> Dict[str, Signature]:
+    return {unit.name: unit_signature(unit) for unit in _units(source)}
+
+
+def _place(source: Path, dest: Path) -> bool:
+    """Hardlink source to dest, copying when linking fails; return True if linked."""
+    try:
+        os.link(source, dest)
+        return True
+    except OSError:
+        shutil.copy2(source, dest)
+        return False
+
+
+def _remove(path: Path) -> None:
+    if path.is_symlink() or path.is_file():
+        path.unlink()
+    elif path.is_dir():
+        shutil.rmtree(path)
+
+
+def _build_unit(unit: Path, signature: Signature, dest: Path) -> int:
+    """Stage a unit beside dest and swap it in; return the number of copied (unlinked) files."""
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    old = dest.with_name(f".{dest.name}.{os.getpid()}.old")
+    _remove(tmp)
+    copied = 0
+    if unit.is_file():
+        copied += not _place(unit, tmp)
+    else:
+        tmp.mkdir()
+        for rel_path in signature:
+            target = tmp / rel_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            copied += not _place(unit / rel_path, target)
+    if dest.exists() or dest.is_symlink():
+        dest.rename(old)
+    tmp.rename(dest)
+    _remove(old)
+    return copied
+
+
+def mirror_tree(
+    source: Path,
+    target: Path,
+    record: Optional[Dict[str, Any]] = None,
+    dry_run: bool = False,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Bring target in line with source, touching only units that changed.
+
+    Args:
+        source: Canonical tree (.aix/skills)
+        target: Mirror directory (e.g. .claude/skills); a symlink left by
+            the symlink strategy is replaced with a directory
+        record: The "record" from the previous run's report
+        dry_run: Report what would change without writing
+        force: Rebuild every unit
+
+    Returns:
+        Report with added, updated, removed and unchanged unit names, the
+        number of copied (not linked) files, and the new record
+    """
+    previous: Dict[str, Signature] = {}
+    if record and record.get("format") == MIRROR_FORMAT and not target.is_symlink():
+        previous = record.get("units") or {}
+
+    current = tree_signature(source)
+    report: Dict[str, Any] = {"added": [], "updated": [], "removed": [], "unchanged": [], "copied": 0}
+    for name, signature in current.items():
+        if name not in previous:
+            report["added"].append(name)
+        elif force or previous[name] != signature or not (target / name).exists():
+            report["updated"].append(name)
+        else:
+            report["unchanged"].append(name)
+    report["removed"] = sorted(name for name in previous if name not in current)
+    report["record"] = {"format": MIRROR_FORMAT, "units": current}
+    if dry_run:
+        return report
+
+    if target.is_symlink() or target.is_file():
+        target.unlink()
+    target.mkdir(parents=True, exist_ok=True)
+    for name in report["added"] + report["updated"]:
+        report["copied"] += _build_unit(source / name, current[name], target / name)
+    for name in report["removed"]:
+        _remove(target / name)
+    return report
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Load the AIX capability registry (registry.tsv) into indexed lookups.
+
+The parsed table and its indexes are cached as a compiled JSON artifact
+under the user cache directory and reused until registry.tsv changes.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from aix_tier import load_tier, tier_name
+
+COMPILED_FORMAT = 2
+
+
+# Capability type -> directory under .aix/ that receives it
+TYPE_DIRS = {
+    "skill": "skills",
+    "role": "roles",
+    "workflow": "workflows",
+    "hook": "hooks",
+    "ci": "ci",
+    "script": "scripts",
+    "config": "config",
+}
+
+
+class Capability(NamedTuple):
+    name: str
+    tier: int
+    type: str
+    subpath: str
+    notes: str
+    companions: Tuple[str, ...] = ()
+
+    def _ref(self, subpath: str) -> str:
+        if self.tier == 0:
+            return subpath
+        return f"tiers/{self.tier}-{tier_name(self.tier)}/{subpath}"
+
+    @property
+    def source_ref(self) -> str:
+        """Framework-relative source path (tier 0 rows live at the framework root)."""
+        return self._ref(self.subpath)
+
+    @property
+    def companion_refs(self) -> List[str]:
+        """Framework-relative paths of files installed alongside the main one."""
+        return [self._ref(subpath) for subpath in self.companions]
+
+    def dest_path(self, repo_root: Path) -> Path:
+        """Local path the capability is installed to."""
+        aix_dir = repo_root / ".aix"
+        if self.type == "docs":
+            return repo_root / self.subpath
+        if self.type == "adapter":
+            return aix_dir / "adapters" / self.name[len("adapter-"):]
+        type_dir = TYPE_DIRS.get(self.type, self.type)
+        return aix_dir / type_dir / Path(self.subpath).name
+
+
+def _cache_path(registry_path: Path) -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    key = hashlib.sha256(str(registry_path.resolve()).encode()).hexdigest()[:16]
+    return Path(cache_home) / "aix" / f"registry-{key}.json"
+
+
+def _signature(registry_path: Path) -> Dict[str, int]:
+    stat = registry_path.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _parse_tsv(registry_path: Path) -> List[Capability]:
+    capabilities = []
+    for line in registry_path.read_text().splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        fields = line.split("\t")
+        if fields[0] == "name" or len(fields) < 4:
+            continue
+        name, tier, cap_type, subpath = (field.strip() for field in fields[:4])
+        notes = fields[4].strip() if len(fields) > 4 else ""
+        companions = tuple(
+            part.strip() for part in (fields[5] if len(fields) > 5 else "").split(",") if part.strip()
+        )
+        try:
+            tier_number = int(tier)
+        except ValueError:
+            continue
+        capabilities.append(Capability(name, tier_number, cap_type, subpath, notes, companions))
+    return capabilities
+
+
+class Registry:
+    """Capability table with indexes by name, tier, type and source path."""
+
+    def __init__(
+        self,
+        capabilities: List[Capability],
+        indexes: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self.capabilities = capabilities
+        if indexes is None:
+            indexes = self._build_indexes(capabilities)
+        self._indexes = indexes
+        self.by_name = {name: capabilities[i] for name, i in indexes["name"].items()}
+        self.by_source = {ref: capabilities[i] for ref, i in indexes["source"].items()}
+        self.by_tier = {int(k): [capabilities[i] for i in v] for k, v in indexes["tier"].items()}
+        self.by_type = {k: [capabilities[i] for i in v] for k, v in indexes["type"].items()}
+
+    @staticmethod
+    def _build_indexes(capabilities: List[Capability]) -> Dict[str, Dict[str, Any]]:
+        indexes: Dict[str, Dict[str, Any]] = {"name": {}, "source": {}, "tier": {}, "type": {}}
+        for i, cap in enumerate(capabilities):
+            indexes["name"].setdefault(cap.name, i)
+            indexes["source"].setdefault(cap.source_ref, i)
+            for ref in cap.companion_refs:
+                indexes["source"].setdefault(ref, i)
+            indexes["tier"].setdefault(str(cap.tier), []).append(i)
+            indexes["type"].setdefault(cap.type, []).append(i)
+        return indexes
+
+    def to_compiled(self, signature: Dict[str, int]) -> Dict[str, Any]:
+        return {
+            "format": COMPILED_FORMAT,
+            "source": signature,
+            "rows": [list(cap) for cap in self.capabilities],
+            "indexes": self._indexes,
+        }
+
+    @classmethod
+    def from_compiled(cls, data: Dict[str, Any]) -> "Registry":
+        capabilities = [Capability(*row[:5], tuple(row[5])) for row in data["rows"]]
+        return cls(capabilities, data["indexes"])
+
+    def get(self, name: str) -> Optional[Capability]:
+        return self.by_name.get(name)
+
+    def select(self, tier: Optional[int] = None, cap_type: Optional[str] = None) -> List[Capability]:
+        """Return capabilities matching every given filter, in registry order."""
+        if tier is not None:
+            candidates = self.by_tier.get(tier, [])
+        elif cap_type is not None:
+            candidates = self.by_type.get(cap_type, [])
+        else:
+            candidates = self.capabilities
+        if cap_type is not None:
+            candidates = [cap for cap in candidates if cap.type == cap_type]
+        return list(candidates)
+
+    def owner(self, source_ref: str) -> Optional[Capability]:
+        """
+        Find the capability that ships a framework-relative source path.
+
+        Walks up the path so files inside a skill or docs directory resolve
+        to the capability registered for the directory.
+        """
+        path = Path(source_ref)
+        for candidate in (path, *path.parents):
+            cap = self.by_source.get(candidate.as_posix())
+            if cap is not None:
+                return cap
+        return None
+
+    def owners(self, entries: Iterable[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+        """Map manifest entry paths to owning capability names."""
+        result: Dict[str, Optional[str]] = {}
+        for entry in entries:
+            path = entry.get("path")
+            if not path:
+                continue
+            cap = self.owner(entry.get("source") or "")
+            result[path] = cap.name if cap else None
+        return result
+
+    def is_installed(self, cap: Capability, repo_root: Path, adopted: Iterable[str] = ()) -> bool:
+        """Return True if the capability is listed as adopted or present locally."""
+        if cap.name in adopted:
+            return True
+        return cap.dest_path(repo_root).exists()
+
+
+_LOADED: Dict[str, Registry] = {}
+
+
+def load_registry(registry_path: Path, use_cache: bool = True) -> Registry:
+    """
+    Load registry.tsv, reusing the compiled cache when the TSV is unchanged.
+
+    Raises:
+        FileNotFoundError: If registry.tsv doesn't exist
+    """
+    key = str(registry_path.resolve())
+    if key in _LOADED:
+        return _LOADED[key]
+
+    if not registry_path.exists():
+        raise FileNotFoundError(f"Registry not found: {registry_path}")
+
+    signature = _signature(registry_path)
+    cache_path = _cache_path(registry_path)
+
+    registry = None
+    if use_cache and cache_path.exists():
+        try:
+            data = json.loads(cache_path.read_text())
+            if data.get("format") == COMPILED_FORMAT and data.get("source") == signature:
+                registry = Registry.from_compiled(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            registry = None
+
+    if registry is None:
+        registry = Registry(_parse_tsv(registry_path))
+        if use_cache:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+                tmp_path.write_text(json.dumps(registry.to_compiled(signature)))
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass
+
+    _LOADED[key] = registry
+    return registry
+
+
+def read_adopted(tier_path: Path) -> List[str]:
+    """Read the adopted capability list from tier.yaml."""
+    return list(load_tier(tier_path).adopted)
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Load .aix/tier.yaml into a typed config (tier, adopted capabilities, adapters).
+
+The file is parsed with PyYAML and the result cached as JSON under the user
+cache directory, reused until tier.yaml changes (mtime and size), so callers
+skip the YAML import entirely on a warm cache. Without PyYAML, a reader for
+the block layout aix writes is used instead. The writers (record_upgrade,
+add_adopted) edit the text in place so comments and layout are kept.
+
+Shell callers query it through the CLI:
+
+Usage:
+    python3 .aix/scripts/aix_tier.py get tier
+    python3 .aix/scripts/aix_tier.py get adapters.kiro.model_set
+    python3 .aix/scripts/aix_tier.py adapters
+    python3 .aix/scripts/aix_tier.py adopted
+    python3 .aix/scripts/aix_tier.py json
+    python3 .aix/scripts/aix_tier.py set-adapter opencode --model-set codex-5.3
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+COMPILED_FORMAT = 2
+
+TIER_NAMES = {0: "seed", 1: "sprout", 2: "grow", 3: "scale"}
+
+# Kept as written: an all-digit short SHA must not become an int (or octal)
+RAW_KEYS = ("aix_version",)
+
+
+class TierConfigError(Exception):
+    """Raised when tier.yaml can't be read or updated."""
+
+
+class AdapterEntry(NamedTuple):
+    name: str
+    enabled: bool = True
+    model_set: Optional[str] = None
+
+
+class TierConfig(NamedTuple):
+    tier: Optional[int]
+    name: Optional[str]
+    aix_version: Optional[str]
+    adopted: Tuple[str, ...]
+    adapters: Dict[str, AdapterEntry]
+    data: Dict[str, Any]
+
+    @property
+    def enabled_adapters(self) -> Dict[str, Optional[str]]:
+        """Enabled adapter names mapped to their model set (None for default)."""
+        return {name: entry.model_set for name, entry in self.adapters.items() if entry.enabled}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look up a dotted key (e.g. "adapters.kiro.model_set") in the raw document."""
+        value: Any = self.data
+        for part in key.split("."):
+            if isinstance(value, dict) and part in value:
+                value = value[part]
+            elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+                value = value[int(part)]
+            else:
+                return default
+        return value
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> "TierConfig":
+        adapters: Dict[str, AdapterEntry] = {}
+        raw_adapters = data.get("adapters")
+        if isinstance(raw_adapters, dict):
+            for name, entry in raw_adapters.items():
+                entry = entry if isinstance(entry, dict) else {}
+                model_set = entry.get("model_set")
+                adapters[str(name)] = AdapterEntry(
+                    name=str(name),
+                    enabled=entry.get("enabled", True) is not False,
+                    model_set=str(model_set) if model_set not in (None, "") else None,
+                )
+        adopted = data.get("adopted")
+        tier = data.get("tier")
+        try:
+            tier = int(tier) if tier is not None else None
+        except (TypeError, ValueError):
+            tier = None
+        name = data.get("name")
+        aix_version = data.get("aix_version")
+        return cls(
+            tier=tier,
+            name=str(name) if name is not None else None,
+            aix_version=str(aix_version) if aix_version is not None else None,
+            adopted=tuple(str(item) for item in adopted) if isinstance(adopted, list) else (),
+            adapters=adapters,
+            data=data,
+        )
+
+
+EMPTY = TierConfig.from_data({})
+
+
+def _plain(value: Any) -> Any:
+    """Convert YAML scalars JSON can't hold (dates) to strings."""
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def _scalar(text: str) -> Any:
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1]
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered in ("", "null", "~"):
+        return None
+    if text == "[]":
+        return []
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+def _raw_scalar(text: str, key: str) -> Optional[str]:
+    """Return a top-level key's value as written, without quotes or type coercion."""
+    prefix = f"{key}:"
+    for raw in text.splitlines():
+        if raw.startswith(prefix):
+            value = raw[len(prefix):].split(" #", 1)[0].strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+                return value[1:-1]
+            return value if value.lower() not in ("", "null", "~") else None
+    return None
+
+
+def _parse_block_yaml(text: str) -> Dict[str, Any]:
+    """
+    Read the subset of YAML aix writes to tier.yaml.
+
+    Handles top-level scalars, top-level lists of scalars or flat mappings
+    (adopted, history) and one level of nested mappings (adapters).
+    """
+    data: Dict[str, Any] = {}
+    key: Optional[str] = None
+    child: Optional[str] = None
+    for raw in text.splitlines():
+        line = raw.split(" #", 1)[0].rstrip()
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip())
+        stripped = line.strip()
+        if indent == 0:
+            child = None
+            name, _, value = stripped.partition(":")
+            key = name.strip()
+            data[key] = _scalar(value) if value.strip() else None
+            continue
+        if key is None:
+            continue
+        if stripped.startswith("- "):
+            items = data[key] if isinstance(data[key], list) else []
+            data[key] = items
+            item = stripped[2:]
+            if ":" in item and not item.startswith(("'", '"')):
+                name, _, value = item.partition(":")
+                items.append({name.strip(): _scalar(value)})
+            else:
+                items.append(_scalar(item))
+            continue
+        name, _, value = stripped.partition(":")
+        name = name.strip()
+        if isinstance(data[key], list) and data[key] and isinstance(data[key][-1], dict):
+            data[key][-1][name] = _scalar(value)
+            continue
+        mapping = data[key] if isinstance(data[key], dict) else {}
+        data[key] = mapping
+        if child is not None and indent > 2:
+            nested = mapping.get(child)
+            if not isinstance(nested, dict):
+                nested = {}
+                mapping[child] = nested
+            nested[name] = _scalar(value)
+        else:
+            mapping[name] = _scalar(value) if value.strip() else None
+            child = name
+    return data
+
+
+def parse_tier_text(text: str) -> Dict[str, Any]:
+    """Parse tier.yaml text into plain JSON-compatible data."""
+    try:
+        import yaml
+    except ImportError:
+        data = _parse_block_yaml(text)
+    else:
+        try:
+            loaded = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise TierConfigError(f"Invalid tier.yaml: {e}") from e
+        data = _plain(loaded) if isinstance(loaded, dict) else {}
+    for key in RAW_KEYS:
+        if key in data:
+            data[key] = _raw_scalar(text, key)
+    return data
+
+
+def _cache_path(tier_path: Path) -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    key = hashlib.sha256(str(tier_path.resolve()).encode()).hexdigest()[:16]
+    return Path(cache_home) / "aix" / f"tier-{key}.json"
+
+
+def _signature(tier_path: Path) -> Dict[str, int]:
+    stat = tier_path.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+_LOADED: Dict[str, Tuple[Dict[str, int], TierConfig]] = {}
+
+
+def load_tier(tier_path: Path, use_cache: bool = True) -> TierConfig:
+    """
+    Load tier.yaml, reusing the parsed cache while the file is unchanged.
+
+    A missing file yields an empty config (tier None, no adapters).
+
+    Raises:
+        TierConfigError: If tier.yaml is not valid YAML
+    """
+    if not tier_path.exists():
+        return EMPTY
+
+    key = str(tier_path.resolve())
+    signature = _signature(tier_path)
+    loaded = _LOADED.get(key)
+    if loaded and loaded[0] == signature:
+        return loaded[1]
+
+    cache_path = _cache_path(tier_path)
+    data = None
+    if use_cache and cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text())
+            if cached.get("format") == COMPILED_FORMAT and cached.get("source") == signature:
+                data = cached["data"]
+        except (OSError, ValueError, KeyError, TypeError):
+            data = None
+
+    if data is None:
+        data = parse_tier_text(tier_path.read_text())
+        if use_cache:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+                tmp_path.write_text(json.dumps({"format": COMPILED_FORMAT, "source": signature, "data": data}))
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass
+
+    config = TierConfig.from_data(data)
+    _LOADED[key] = (signature, config)
+    return config
+
+
+def set_adapter(tier_path: Path, adapter: str, model_set: Optional[str] = None) -> None:
+    """
+    Enable an adapter in tier.yaml, optionally pinning its model set.
+
+    Raises:
+        TierConfigError: If PyYAML is unavailable or tier.yaml is invalid
+    """
+    try:
+        import yaml
+    except ImportError as e:
+        raise TierConfigError(f"PyYAML is required to update tier.yaml: {e}") from e
+
+    text = tier_path.read_text()
+    try:
+        data = yaml.safe_load(text) or {}
+    except yaml.YAMLError as e:
+        raise TierConfigError(f"Invalid tier.yaml: {e}") from e
+    for key in RAW_KEYS:
+        if key in data:
+            data[key] = _raw_scalar(text, key)
+    adapters = data.get("adapters")
+    if not isinstance(adapters, dict):
+        adapters = {}
+
+    entry = adapters.get(adapter)
+    if not isinstance(entry, dict):
+        entry = {}
+
+    entry["enabled"] = True
+    if model_set:
+        entry["model_set"] = model_set
+
+    adapters[adapter] = entry
+    data["adapters"] = adapters
+
+    tier_path.write_text(yaml.safe_dump(data, sort_keys=False))
+
+
+def tier_name(tier: int) -> str:
+    return TIER_NAMES.get(tier, "unknown")
+
+
+def _inline_items(value: str) -> Optional[List[str]]:
+    """Items of an inline YAML list ("[a, 'b']"), [] for no value, None if not a list."""
+    value = value.split(" #", 1)[0].strip()
+    if not value:
+        return []
+    if not (value.startswith("[") and value.endswith("]")):
+        return None
+    items = [_scalar(item) for item in value[1:-1].split(",") if item.strip()]
+    return [str(item) for item in items]
+
+
+def record_upgrade(text: str, tier: int, aix_version: str, date: str, reason: str) -> str:
+    """
+    Return tier.yaml text moved to a new tier, with a history entry appended.
+
+    Only the tier, name, aix_version and upgraded_at keys and the history
+    block are touched; adapters, adopted and comments are kept as they are.
+    """
+    values = {
+        "tier": str(tier),
+        "name": tier_name(tier),
+        # Quoted so an all-digit short SHA stays a string
+        "aix_version": json.dumps(aix_version),
+        "upgraded_at": date,
+    }
+    lines = text.splitlines()
+    last = -1
+    for key, value in values.items():
+        index = next((i for i, line in enumerate(lines) if line.startswith(f"{key}:")), None)
+        if index is None:
+            index = last + 1
+            lines.insert(index, "")
+        lines[index] = f"{key}: {value}"
+        last = max(last, index)
+
+    entry = [f"  - tier: {tier}", f"    date: {date}", f"    reason: {reason}"]
+    start = next((i for i, line in enumerate(lines) if line.startswith("history:")), None)
+    if start is None:
+        lines[last + 1:last + 1] = ["history:"] + entry
+        return "\n".join(lines) + "\n"
+
+    lines[start] = "history:"
+    end = start + 1
+    while end < len(lines):
+        line = lines[end]
+        if line.strip() and not line.startswith(" "):
+            break
+        end += 1
+    while end > start + 1 and not lines[end - 1].strip():
+        end -= 1
+    lines[end:end] = entry
+    return "\n".join(lines) + "\n"
+
+
+def add_adopted(text: str, names: Iterable[str]) -> str:
+    """
+    Return tier.yaml text with names appended to the adopted list.
+
+    Inserts at the end of the existing adopted block (which may not be the
+    last section) and creates the block if missing. An inline list is
+    rewritten as a block list first.
+
+    Raises:
+        TierConfigError: If adopted holds something other than a list
+    """
+    names = list(names)
+    if not names:
+        return text
+    items = [f"  - {name}" for name in names]
+    lines = text.splitlines()
+
+    start = next((i for i, line in enumerate(lines) if line.startswith("adopted:")), None)
+    if start is None:
+        if lines and lines[-1].strip():
+            lines.append("")
+        lines.append("adopted:")
+        lines.extend(items)
+        return "\n".join(lines) + "\n"
+
+    existing = _inline_items(lines[start][len("adopted:"):])
+    if existing is None:
+        raise TierConfigError(f"Can't add to adopted: unsupported value {lines[start]!r}")
+    # An inline list ("adopted: [a, b]") becomes a block list, keeping its items
+    lines[start:start + 1] = ["adopted:"] + [f"  - {name}" for name in existing]
+    end = start + 1 + len(existing)
+    while end < len(lines):
+        line = lines[end]
+        if line.strip() and not line.startswith(" "):
+            break
+        end += 1
+    while end > start + 1 and not lines[end - 1].strip():
+        end -= 1
+    lines[end:end] = items
+    return "\n".join(lines) + "\n"
+
+
+def _print_value(value: Any) -> None:
+    if isinstance(value, list) and all(not isinstance(item, (dict, list)) for item in value):
+        for item in value:
+            print(item)
+    elif isinstance(value, (dict, list)):
+        print(json.dumps(value, indent=2))
+    elif isinstance(value, bool):
+        print("true" if value else "false")
+    else:
+        print(value)
+
+
+def _default_tier_path(repo_root: Optional[str]) -> Path:
+    if repo_root:
+        return Path(repo_root) / ".aix" / "tier.yaml"
+    from aix_git import git_root
+
+    return git_root() / ".aix" / "tier.yaml"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Query .aix/tier.yaml")
+    parser.add_argument("--file", help="Path to tier.yaml (default: <repo>/.aix/tier.yaml)")
+    parser.add_argument("--repo-root", help="Path to repository root (default: git root)")
+    parser.add_argument("--no-cache", action="store_true", help="Parse tier.yaml even if a cached parse exists")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    get_parser = subparsers.add_parser("get", help="Print a value by dotted key; exit 1 if unset")
+    get_parser.add_argument("key")
+    subparsers.add_parser("adapters", help="Print enabled adapters as 'name<TAB>model_set'")
+    subparsers.add_parser("adopted", help="Print adopted capabilities, one per line")
+    subparsers.add_parser("json", help="Print the typed config as JSON")
+    set_parser = subparsers.add_parser("set-adapter", help="Enable an adapter (and pin its model set)")
+    set_parser.add_argument("adapter")
+    set_parser.add_argument("--model-set")
+
+    args = parser.parse_args()
+    tier_path = Path(args.file) if args.file else _default_tier_path(args.repo_root)
+
+    try:
+        if args.command == "set-adapter":
+            if not tier_path.exists():
+                raise TierConfigError(f"tier file not found: {tier_path}")
+            set_adapter(tier_path, args.adapter, args.model_set)
+            return 0
+
+        config = load_tier(tier_path, use_cache=not args.no_cache)
+    except TierConfigError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.command == "get":
+        typed = {"tier": config.tier, "name": config.name, "aix_version": config.aix_version}
+        value = typed[args.key] if args.key in typed else config.get(args.key)
+        if value is None:
+            return 1
+        _print_value(value)
+    elif args.command == "adapters":
+        for name, model_set in config.enabled_adapters.items():
+            print(f"{name}\t{model_set or ''}")
+    elif args.command == "adopted":
+        for name in config.adopted:
+            print(name)
+    else:
+        print(json.dumps({
+            "tier": config.tier,
+            "name": config.name,
+            "aix_version": config.aix_version,
+            "adopted": list(config.adopted),
+            "adapters": {name: entry._asdict() for name, entry in config.adapters.items()},
+            "data": config.data,
+        }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
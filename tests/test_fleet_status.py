@@ -0,0 +1,54 @@
+"""aix-fleet status rolls up outdated capabilities from per-entry sync results."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+FLEET = Path(__file__).resolve().parent.parent / "scripts" / "aix-fleet.py"
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=cwd, check=True,
+                   capture_output=True)
+
+
+def _write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def _repo(root: Path, local: dict, snapshots: dict) -> Path:
+    entries = []
+    for path, content in local.items():
+        _write(root / path, content)
+        _write(root / ".aix" / "snapshots" / path, snapshots[path])
+        entries.append({"path": path, "source": f"templates/{path}", "capability": path.split("/")[1][:-3]})
+    _write(root / ".aix" / "manifest.json", json.dumps({"manifest_version": 1, "files": entries}))
+    _write(root / ".aix" / "tier.yaml", 'tier: 1\nname: sprout\naix_version: "0000000"\n')
+    _git(root, "init", "-q")
+    return root
+
+
+def test_stale_version_alone_is_not_outdated(tmp_path):
+    framework = tmp_path / "framework"
+    _write(framework / "templates" / "docs" / "alpha.md", "alpha v1\n")
+    _write(framework / "templates" / "docs" / "beta.md", "beta v2\n")
+    _git(framework, "init", "-q")
+    _git(framework, "add", ".")
+    _git(framework, "commit", "-q", "-m", "templates")
+
+    files = {"docs/alpha.md": "alpha v1\n", "docs/beta.md": "beta v2\n"}
+    current = _repo(tmp_path / "current", files, files)
+    behind = _repo(tmp_path / "behind", files, {**files, "docs/beta.md": "beta v1\n"})
+    _write(behind / "docs" / "beta.md", "beta v1\n")
+
+    result = subprocess.run(
+        [sys.executable, str(FLEET), "status", str(current), str(behind), "--framework-root", str(framework), "--json"],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    summary = json.loads(result.stdout)
+    assert summary["summary"] == {"current": 1, "outdated": 1}
+    assert summary["outdated"] == {"beta": [str(behind.resolve())]}
+    assert not (behind / ".aix" / "sync").exists()
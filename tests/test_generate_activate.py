@@ -0,0 +1,84 @@
+"""aix-generate --activate-model-set keeps the skills records --check relies on."""
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+GENERATE = ROOT / "scripts" / "aix-generate.py"
+
+SKILL = """---
+name: {name}
+description: Fixture skill {name}
+---
+
+# {name}
+"""
+
+
+def _generate(repo: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(GENERATE), "--adapter", "factory", "--repo-root", str(repo), "--no-cache", *args],
+        capture_output=True, text=True,
+    )
+
+
+def _repo(tmp_path: Path, strategy: str) -> Path:
+    repo = tmp_path / "repo"
+    (repo / ".aix" / "roles").mkdir(parents=True)
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    for role in ("analyst.md", "coder.md"):
+        shutil.copy(ROOT / "tiers" / "0-seed" / "roles" / role, repo / ".aix" / "roles" / role)
+    for name in ("alpha", "beta"):
+        (repo / ".aix" / "skills" / name).mkdir(parents=True)
+        (repo / ".aix" / "skills" / name / "SKILL.md").write_text(SKILL.format(name=name))
+    adapter = repo / ".aix" / "adapters" / "factory"
+    shutil.copytree(ROOT / "adapters" / "factory", adapter)
+    config = adapter / "adapter.yaml"
+    config.write_text(config.read_text().replace("strategy: symlink", f"strategy: {strategy}"))
+    return repo
+
+
+def _activate_then_check(tmp_path: Path, strategy: str) -> dict:
+    repo = _repo(tmp_path, strategy)
+    result = _generate(repo)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert (repo / ".factory" / "skills-catalog.json").exists()
+
+    result = _generate(repo, "--activate-model-set", "speed")
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    check = _generate(repo, "--check")
+    assert check.returncode == 0, check.stdout
+    return json.loads((repo / ".aix" / "manifest.json").read_text())["generated"]["factory"]
+
+
+def test_activate_keeps_skills_catalog_record(tmp_path):
+    record = _activate_then_check(tmp_path, "symlink")
+    assert record["model_set"] == "speed"
+    assert record["skills_catalog"]["signatures"]
+
+
+def test_activate_keeps_skills_mirror_record(tmp_path):
+    record = _activate_then_check(tmp_path, "mirror")
+    assert set(record["skills_mirror"]["units"]) == {"alpha", "beta"}
+
+
+def test_activate_refuses_to_discard_edited_output(tmp_path):
+    repo = _repo(tmp_path, "symlink")
+    assert _generate(repo).returncode == 0
+    droid = repo / ".factory" / "droids" / "coder.md"
+    edited = droid.read_text() + "local tweak\n"
+    droid.write_text(edited)
+
+    result = _generate(repo, "--activate-model-set", "speed")
+    assert result.returncode == 1
+    assert "locally modified" in result.stdout and ".factory/droids/coder.md" in result.stdout
+    assert not droid.parent.is_symlink()
+    assert droid.read_text() == edited
+
+    result = _generate(repo, "--activate-model-set", "speed", "--force")
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert droid.parent.is_symlink()
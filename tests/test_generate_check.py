@@ -0,0 +1,50 @@
+"""aix-generate --check leaves the shared cache (and everything else) untouched."""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+GENERATE = ROOT / "scripts" / "aix-generate.py"
+
+
+def _generate(repo: Path, cache: Path, *args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, AIX_CACHE_DIR=str(cache))
+    env.pop("AIX_CACHE", None)
+    return subprocess.run(
+        [sys.executable, str(GENERATE), "--adapter", "claude-code", "--repo-root", str(repo), *args],
+        capture_output=True, text=True, env=env,
+    )
+
+
+def _snapshot(root: Path) -> dict:
+    return {
+        str(path.relative_to(root)): (path.stat().st_mtime_ns, path.stat().st_size)
+        for path in root.rglob("*") if path.is_file()
+    }
+
+
+def test_check_does_not_write_the_shared_cache(tmp_path):
+    repo = tmp_path / "repo"
+    (repo / ".aix" / "roles").mkdir(parents=True)
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    for role in ("analyst.md", "coder.md"):
+        shutil.copy(ROOT / "tiers" / "0-seed" / "roles" / role, repo / ".aix" / "roles" / role)
+    shutil.copytree(ROOT / "adapters" / "claude-code", repo / ".aix" / "adapters" / "claude-code")
+    cache = tmp_path / "cache"
+
+    result = _generate(repo, cache)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert _snapshot(cache)
+
+    # New inputs: a cache-writing run would store their parses and renders
+    role = repo / ".aix" / "roles" / "coder.md"
+    role.write_text(role.read_text() + "\nOne more rule.\n")
+    before_cache, before_repo = _snapshot(cache), _snapshot(repo)
+
+    check = _generate(repo, cache, "--check")
+    assert check.returncode == 1, check.stdout
+    assert _snapshot(cache) == before_cache
+    assert _snapshot(repo) == before_repo
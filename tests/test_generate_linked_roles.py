@@ -0,0 +1,68 @@
+"""aix-generate with the bootstrap layout, where .claude/agents links to .aix/roles."""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+GENERATE = ROOT / "scripts" / "aix-generate.py"
+
+
+def _generate(repo: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(GENERATE), "--adapter", "claude-code", "--repo-root", str(repo), "--no-cache", *args],
+        capture_output=True, text=True,
+    )
+
+
+def _bootstrapped_repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    (repo / ".aix" / "roles").mkdir(parents=True)
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    for role in ("analyst.md", "coder.md", "reviewer.md"):
+        shutil.copy(ROOT / "tiers" / "0-seed" / "roles" / role, repo / ".aix" / "roles" / role)
+    shutil.copytree(ROOT / "adapters" / "claude-code", repo / ".aix" / "adapters" / "claude-code")
+    (repo / ".claude").mkdir()
+    (repo / ".claude" / "agents").symlink_to("../.aix/roles")
+    return repo
+
+
+def _canonical(repo: Path) -> dict:
+    return {path.name: path.read_bytes() for path in (repo / ".aix" / "roles").iterdir()}
+
+
+def test_full_render_leaves_canonical_roles_alone(tmp_path):
+    repo = _bootstrapped_repo(tmp_path)
+    before = _canonical(repo)
+    assert any(b"<!-- aix:" in data for data in before.values())
+
+    result = _generate(repo)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert _canonical(repo) == before
+    assert (repo / ".claude" / "agents").is_symlink()
+
+    check = _generate(repo, "--check")
+    assert check.returncode == 0, check.stdout
+
+
+def test_compact_render_replaces_link_instead_of_writing_through_it(tmp_path):
+    repo = _bootstrapped_repo(tmp_path)
+    before = _canonical(repo)
+    config = repo / ".aix" / "adapters" / "claude-code" / "adapter.yaml"
+    config.write_text(config.read_text().replace("  variant: full", "  variant: compact"))
+
+    result = _generate(repo)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert _canonical(repo) == before
+
+    agents = repo / ".claude" / "agents"
+    assert agents.is_dir() and not agents.is_symlink()
+    for name, data in before.items():
+        compact = (agents / name).read_bytes()
+        assert b"<!-- aix:" not in compact
+        if b"<!-- aix:" in data:
+            assert len(compact) < len(data)
+
+    check = _generate(repo, "--check")
+    assert check.returncode == 0, check.stdout
@@ -0,0 +1,26 @@
+"""aix-hook-bench resolves --hook paths before running hooks in the fixture."""
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BENCH = ROOT / "scripts" / "aix-hook-bench.py"
+
+
+def test_relative_hook_path(tmp_path):
+    hooks = tmp_path / ".aix" / "hooks"
+    hooks.mkdir(parents=True)
+    for source in (ROOT / "tiers" / "3-scale" / "hooks").glob("validate*"):
+        shutil.copy2(source, hooks / source.name)
+
+    result = subprocess.run(
+        [sys.executable, str(BENCH), "--hook", ".aix/hooks/validate-bash.sh", "--runs", "2", "--warmup", "0", "--json"],
+        cwd=tmp_path, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    (report,) = json.loads(result.stdout)["results"]
+    assert report["hook"] == str(hooks.resolve() / "validate-bash.sh")
+    assert report["runs"] == 2 and not report["mismatches"]
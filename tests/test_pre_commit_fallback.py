@@ -0,0 +1,38 @@
+"""The shell fallback of tiers/1-sprout/hooks/pre-commit checks paths with spaces whole."""
+
+import os
+import subprocess
+from pathlib import Path
+
+HOOK = Path(__file__).resolve().parent.parent / "tiers" / "1-sprout" / "hooks" / "pre-commit"
+
+
+def _staged_repo(tmp_path: Path, files: dict) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    for name, content in files.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    subprocess.run(["git", "add", "--", *files], cwd=repo, check=True)
+    return repo
+
+
+def _run_fallback(repo: Path) -> subprocess.CompletedProcess:
+    env = dict(os.environ, AIX_PRE_COMMIT_SHELL="1")
+    return subprocess.run(["bash", str(HOOK)], cwd=repo, capture_output=True, text=True, env=env)
+
+
+def test_oversized_file_with_space_in_path_is_blocked(tmp_path):
+    repo = _staged_repo(tmp_path, {"src/my module.py": "x = 1\n" * 501})
+    result = _run_fallback(repo)
+    assert result.returncode == 1, result.stdout
+    assert "src/my module.py has 501 lines" in result.stdout
+
+
+def test_focused_test_with_space_in_path_is_blocked(tmp_path):
+    repo = _staged_repo(tmp_path, {"tests/my feature.test.ts": "it.only('works', () => {});\n"})
+    result = _run_fallback(repo)
+    assert result.returncode == 1, result.stdout
+    assert "tests/my feature.test.ts" in result.stdout
@@ -0,0 +1,84 @@
+"""aix-sync --apply-bundle advances snapshots and the manifest like --apply."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SYNC = Path(__file__).resolve().parent.parent / "scripts" / "aix-sync.py"
+
+BASE = "".join(f"line {n}\n" for n in range(1, 21))
+
+
+def _sync(repo: Path, framework: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(SYNC), "--repo-root", str(repo), "--framework-root", str(framework), *args],
+        capture_output=True, text=True,
+    )
+
+
+def _statuses(repo: Path, framework: Path) -> dict:
+    result = _sync(repo, framework, "--json")
+    assert result.returncode == 0, result.stderr
+    return {item["path"]: item["status"] for item in json.loads(result.stdout)["results"]}
+
+
+def _setup(tmp_path: Path):
+    framework = tmp_path / "framework"
+    repo = tmp_path / "repo"
+    upstream = BASE.replace("line 2\n", "line 2 upstream\n")
+    files = {
+        # path: (snapshot, local, upstream)
+        "docs/updated.md": (BASE, BASE, upstream),
+        "docs/merged.md": (BASE, BASE.replace("line 19\n", "line 19 local\n"), upstream),
+        "docs/restored.md": (BASE, None, upstream),
+        # Already carries the upstream change: no diff, but the snapshot is behind
+        "docs/current.md": (BASE, upstream, upstream),
+    }
+    entries = []
+    for path, (snapshot, local, new) in files.items():
+        for root, content in ((repo / ".aix" / "snapshots", snapshot), (repo, local), (framework / "templates", new)):
+            if content is not None:
+                (root / path).parent.mkdir(parents=True, exist_ok=True)
+                (root / path).write_text(content)
+        entries.append({"path": path, "source": f"templates/{path}"})
+    (repo / ".aix" / "manifest.json").write_text(json.dumps({"manifest_version": 1, "files": entries}))
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    return repo, framework
+
+
+def test_applied_bundle_leaves_nothing_to_sync(tmp_path):
+    repo, framework = _setup(tmp_path)
+    assert _statuses(repo, framework) == {
+        "docs/updated.md": "update_available",
+        "docs/merged.md": "merge_clean",
+        "docs/restored.md": "local_missing",
+        "docs/current.md": "merge_clean",
+    }
+
+    assert _sync(repo, framework, "--bundle", "--json").returncode == 0
+    result = _sync(repo, framework, "--apply-bundle", "--json")
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert sorted(json.loads(result.stdout)["applied"]) == ["docs/merged.md", "docs/restored.md", "docs/updated.md"]
+    assert not (repo / ".aix" / "state" / "sync-txn").exists()
+
+    assert "line 19 local" in (repo / "docs" / "merged.md").read_text()
+    assert _statuses(repo, framework) == {
+        "docs/updated.md": "unchanged",
+        "docs/merged.md": "local_modified_only",
+        "docs/restored.md": "unchanged",
+        "docs/current.md": "unchanged",
+    }
+
+
+def test_upstream_change_after_preview_is_refused(tmp_path):
+    repo, framework = _setup(tmp_path)
+    assert _sync(repo, framework, "--bundle", "--json").returncode == 0
+    (framework / "templates" / "docs" / "updated.md").write_text(BASE + "late change\n")
+    manifest = (repo / ".aix" / "manifest.json").read_text()
+
+    result = _sync(repo, framework, "--apply-bundle", "--json")
+    assert result.returncode == 1
+    assert "changed upstream" in json.loads(result.stdout)["error"]
+    assert (repo / "docs" / "updated.md").read_text() == BASE
+    assert (repo / ".aix" / "manifest.json").read_text() == manifest
@@ -0,0 +1,62 @@
+"""aix_version in .aix/tier.yaml is read as written, with or without PyYAML."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import aix_tier  # noqa: E402
+from aix_tier import add_adopted, record_upgrade  # noqa: E402
+
+TIER_YAML = """tier: 0
+name: seed
+aix_version: {version}
+adapters:
+  claude:
+    enabled: true
+"""
+
+
+@pytest.fixture(params=["pyyaml", "fallback"])
+def parse(request, monkeypatch):
+    if request.param == "fallback":
+        monkeypatch.setitem(sys.modules, "yaml", None)
+    return aix_tier.parse_tier_text
+
+
+@pytest.mark.parametrize("version", ["0123456", "1234567", "'0123456'", '"0123456"'])
+def test_all_digit_sha_is_kept_verbatim(parse, version):
+    config = aix_tier.TierConfig.from_data(parse(TIER_YAML.format(version=version)))
+    assert config.aix_version == version.strip("'\"")
+
+
+def test_record_upgrade_quotes_version(parse):
+    text = record_upgrade(TIER_YAML.format(version="abc1234"), 1, "0123456", "2026-01-01", "upgrade")
+    assert 'aix_version: "0123456"' in text
+    assert parse(text)["aix_version"] == "0123456"
+
+
+def test_set_adapter_keeps_unquoted_version(tmp_path):
+    tier_path = tmp_path / "tier.yaml"
+    tier_path.write_text(TIER_YAML.format(version="0123456"))
+    aix_tier.set_adapter(tier_path, "kiro")
+    assert aix_tier.load_tier(tier_path, use_cache=False).aix_version == "0123456"
+
+
+@pytest.mark.parametrize("adopted", ["adopted: [foo, bar]", "adopted: ['foo', \"bar\"]  # pinned", "adopted:\n  - foo\n  - bar"])
+def test_add_adopted_keeps_existing_items(parse, adopted):
+    text = add_adopted(f"tier: 1\n{adopted}\nadapters:\n  claude:\n    enabled: true\n", ["baz"])
+    data = parse(text)
+    assert data["adopted"] == ["foo", "bar", "baz"]
+    assert data["adapters"] == {"claude": {"enabled": True}}
+
+
+def test_add_adopted_to_empty_inline_list(parse):
+    assert parse(add_adopted("tier: 1\nadopted: []\n", ["baz"]))["adopted"] == ["baz"]
+
+
+def test_add_adopted_rejects_non_list():
+    with pytest.raises(aix_tier.TierConfigError):
+        add_adopted("adopted: foo\n", ["baz"])
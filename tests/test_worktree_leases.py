@@ -0,0 +1,73 @@
+"""Port leases taken by concurrent worktree-setup runs (tiers/3-scale/scripts/aix_worktree.py)."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tiers" / "3-scale" / "scripts"))
+
+import aix_worktree  # noqa: E402
+from aix_worktree import PortLeases, Service  # noqa: E402
+
+SERVICES = [Service("api", "api", "PORT", 3000, ".env.local", "", {})]
+
+
+def _repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    return repo
+
+
+def test_interleaved_setups_keep_pending_lease(tmp_path):
+    repo = _repo(tmp_path)
+    first_path = tmp_path / "worktrees" / "first"
+    second_path = tmp_path / "worktrees" / "second"
+
+    # Setup A leases its slot; its `git worktree add` hasn't run yet
+    with PortLeases.open(repo) as leases:
+        first = leases.allocate("first", SERVICES, first_path, "feat/first")
+
+    # Setup B runs in between and must not reclaim A's lease
+    with PortLeases.open(repo) as leases:
+        assert leases.reclaim_stale(keep="second") == []
+        second = leases.allocate("second", SERVICES, second_path, "feat/second")
+    assert second["slot"] != first["slot"]
+    assert not set(second["ports"].values()) & set(first["ports"].values())
+
+    # A's worktree appears and setup confirms the lease
+    first_path.mkdir(parents=True)
+    with PortLeases.open(repo) as leases:
+        leases.confirm("first")
+    with PortLeases.open(repo, exclusive=False) as leases:
+        assert "pending" not in leases.get("first")
+        assert leases.get("second")["pending"]
+
+
+def test_abandoned_pending_lease_is_reclaimed_after_grace(tmp_path):
+    repo = _repo(tmp_path)
+    with PortLeases.open(repo) as leases:
+        leases.allocate("crashed", SERVICES, tmp_path / "never-created", "feat/crashed")
+
+    table = PortLeases.table_path(repo)
+    data = json.loads(table.read_text())
+    data["leases"]["crashed"]["pending"] = "2000-01-01T00:00:00Z"
+    table.write_text(json.dumps(data))
+
+    with PortLeases.open(repo) as leases:
+        assert leases.reclaim_stale() == ["crashed"]
+
+
+def test_confirmed_lease_without_directory_is_reclaimed(tmp_path, monkeypatch):
+    repo = _repo(tmp_path)
+    removed = tmp_path / "removed"
+    removed.mkdir()
+    with PortLeases.open(repo) as leases:
+        leases.allocate("removed", SERVICES, removed, "feat/removed")
+        leases.confirm("removed")
+    removed.rmdir()
+
+    monkeypatch.setattr(aix_worktree, "LEASE_PENDING_GRACE", 10 ** 9)
+    with PortLeases.open(repo) as leases:
+        assert leases.reclaim_stale() == ["removed"]
@@ -13,6 +13,13 @@
 # Don't use strict mode - we want the hook to succeed even if parts fail
 # set -euo pipefail
 
+# compact_state.py does the work in one process (concurrent git reads, cached
+# PR lookup, time budget); the shell below is the fallback without python3.
+HOOK_DIR=$(cd "$(dirname "$0")" 2>/dev/null && pwd)
+if command -v python3 >/dev/null 2>&1 && [ -f "$HOOK_DIR/compact_state.py" ]; then
+    exec python3 -I -S "$HOOK_DIR/compact_state.py" capture
+fi
+
 HANDOFF_FILE=".aix-handoff.md"
 SNAPSHOT_START="<!-- COMPACTION_SNAPSHOT_START -->"
 SNAPSHOT_END="<!-- COMPACTION_SNAPSHOT_END -->"
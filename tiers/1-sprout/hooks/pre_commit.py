@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Staged-file checker for the aix pre-commit hook - Tier 1 (Sprout).
+
+Reads the staged contents of every relevant file in one `git cat-file --batch`
+call and runs all checks for a file in a single scan with one precompiled
+pattern per file type. Large commits are checked on a process pool. Output,
+exit codes and limits match the shell version of the hook.
+
+Usage:
+    python3 pre_commit.py
+"""
+
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+RED = "\033[0;31m"
+YELLOW = "\033[1;33m"
+GREEN = "\033[0;32m"
+NC = "\033[0m"
+
+# Size limits (in lines)
+SOFT_LIMIT = 300
+HARD_LIMIT = 500
+
+# Below this much staged content, a process pool costs more than it saves
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+SIZE_EXTS = (".js", ".ts", ".jsx", ".tsx", ".py", ".go", ".rs", ".rb", ".java")
+FOCUS_SUFFIXES = (".test.js", ".test.ts", ".spec.js", ".spec.ts", "_test.go", "_test.py")
+JS_EXTS = (".js", ".ts", ".jsx", ".tsx")
+TODO_EXTS = (".js", ".ts", ".jsx", ".tsx", ".py", ".go", ".rs", ".rb")
+
+# Alternatives per check, joined into one flat alternation per file type.
+# (Grouping them would disable the regex engine's literal-prefix scan.)
+CHECK_PATTERNS = {
+    "focus": (rb"\.only", rb"fit\(", rb"fdescribe\("),
+    "debug_js": (rb"console\.log", rb"debugger"),
+    "debug_py": (rb"print\(", rb"breakpoint\(\)", rb"pdb\."),
+    "todo": (rb"TODO", rb"FIXME", rb"XXX", rb"HACK"),
+}
+
+# Matching lines shown per file and check (grep -n | head -3); None = all
+SHOW_LIMITS = {"focus": None, "debug": 3, "todo": 3}
+
+_COMBINED: Dict[Tuple[str, ...], Tuple["re.Pattern[bytes]", List[Tuple[str, "re.Pattern[bytes]"]]]] = {}
+
+
+class FileReport(NamedTuple):
+    path: str
+    lines: Optional[int]
+    focus: List[bytes]
+    debug: List[bytes]
+    todo: List[bytes]
+
+
+def checks_for(path: str) -> Tuple[bool, Tuple[str, ...]]:
+    """Return (size check applies, content checks that apply) for a path."""
+    checks = []
+    if path.endswith(FOCUS_SUFFIXES):
+        checks.append("focus")
+    if path.endswith(JS_EXTS):
+        checks.append("debug_js")
+    elif path.endswith(".py"):
+        checks.append("debug_py")
+    if path.endswith(TODO_EXTS):
+        checks.append("todo")
+    return path.endswith(SIZE_EXTS), tuple(checks)
+
+
+def _combined(checks: Tuple[str, ...]) -> Tuple["re.Pattern[bytes]", List[Tuple[str, "re.Pattern[bytes]"]]]:
+    """Scanner for a set of checks, plus per-check patterns to classify hits."""
+    compiled = _COMBINED.get(checks)
+    if compiled is None:
+        scanner = re.compile(b"|".join(alt for check in checks for alt in CHECK_PATTERNS[check]))
+        classifiers = [
+            (check.split("_")[0], re.compile(b"|".join(CHECK_PATTERNS[check]))) for check in checks
+        ]
+        compiled = (scanner, classifiers)
+        _COMBINED[checks] = compiled
+    return compiled
+
+
+def check_blob(path: str, blob: bytes) -> FileReport:
+    """Run every applicable check over a staged blob in one scan."""
+    size_check, checks = checks_for(path)
+    lines = blob.count(b"\n") if size_check else None
+    found: Dict[str, List[bytes]] = {"focus": [], "debug": [], "todo": []}
+    seen = {"focus": -1, "debug": -1, "todo": -1}
+
+    if checks:
+        scanner, classifiers = _combined(checks)
+        line_no = 1
+        position = 0
+        for match in scanner.finditer(blob):
+            text = match.group()
+            check = next(name for name, pattern in classifiers if pattern.fullmatch(text))
+            limit = SHOW_LIMITS[check]
+            if limit is not None and len(found[check]) >= limit:
+                continue
+            start = match.start()
+            line_no += blob.count(b"\n", position, start)
+            position = start
+            if seen[check] == line_no:
+                continue
+            seen[check] = line_no
+            line_start = blob.rfind(b"\n", 0, start) + 1
+            line_end = blob.find(b"\n", start)
+            if line_end == -1:
+                line_end = len(blob)
+            found[check].append(b"%d:%s" % (line_no, blob[line_start:line_end]))
+
+    return FileReport(path, lines, found["focus"], found["debug"], found["todo"])
+
+
+def _check_item(item: Tuple[str, bytes]) -> FileReport:
+    return check_blob(*item)
+
+
+def staged_files() -> List[str]:
+    output = subprocess.run(
+        ["git", "diff", "--cached", "--name-only", "-z", "--diff-filter=ACMR"],
+        capture_output=True,
+        check=True,
+    ).stdout
+    return [name for name in output.decode("utf-8", "surrogateescape").split("\0") if name]
+
+
+def read_staged(paths: List[str]) -> Dict[str, bytes]:
+    """
+    Read staged blobs for paths with a single `git cat-file --batch`.
+
+    Entries that aren't blobs (submodules) or can't be named on one line
+    are left out.
+    """
+    paths = [path for path in paths if "\n" not in path]
+    if not paths:
+        return {}
+    request = "".join(f":{path}\n" for path in paths).encode("utf-8", "surrogateescape")
+    output = subprocess.run(
+        ["git", "cat-file", "--batch"], input=request, capture_output=True, check=True
+    ).stdout
+
+    blobs: Dict[str, bytes] = {}
+    position = 0
+    for path in paths:
+        header_end = output.index(b"\n", position)
+        header = output[position:header_end].split()
+        position = header_end + 1
+        if len(header) != 3:  # "<name> missing"
+            continue
+        size = int(header[2])
+        if header[1] == b"blob":
+            blobs[path] = output[position:position + size]
+        position += size + 1
+    return blobs
+
+
+def run_checks(items: List[Tuple[str, bytes]]) -> List[FileReport]:
+    total = sum(len(blob) for _, blob in items)
+    workers = os.cpu_count() or 1
+    if total < PARALLEL_MIN_BYTES or len(items) < 2 or workers < 2:
+        return [check_blob(path, blob) for path, blob in items]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_check_item, items, chunksize=chunksize))
+
+
+def _emit(line: bytes) -> None:
+    sys.stdout.buffer.write(line + b"\n")
+
+
+def main() -> int:
+    print("Running pre-commit checks...")
+
+    paths = staged_files()
+    if not paths:
+        print("No staged files to check.")
+        return 0
+
+    relevant = [path for path in paths if any(checks_for(path))]
+    blobs = read_staged(relevant)
+    reports = run_checks([(path, blobs[path]) for path in relevant if path in blobs])
+
+    errors = 0
+    warnings = 0
+
+    print("")
+    print("Checking file sizes...")
+    for report in reports:
+        if report.lines is None:
+            continue
+        if report.lines > HARD_LIMIT:
+            print(f"{RED}BLOCKED{NC}: {report.path} has {report.lines} lines (max: {HARD_LIMIT})")
+            errors += 1
+        elif report.lines > SOFT_LIMIT:
+            print(f"{YELLOW}WARNING{NC}: {report.path} has {report.lines} lines (soft limit: {SOFT_LIMIT})")
+            warnings += 1
+
+    print("")
+    print("Checking for focused tests...")
+    for report in reports:
+        if report.focus:
+            sys.stdout.flush()
+            for line in report.focus:
+                _emit(line)
+            sys.stdout.buffer.flush()
+            print(f"{RED}BLOCKED{NC}: {report.path} contains focused test (.only, fit, etc.)")
+            errors += 1
+
+    print("")
+    print("Checking for debug statements...")
+    for report in reports:
+        if report.debug:
+            sys.stdout.flush()
+            for line in report.debug:
+                _emit(line)
+            sys.stdout.buffer.flush()
+            if report.path.endswith(".py"):
+                print(f"{YELLOW}WARNING{NC}: {report.path} contains print/breakpoint")
+            else:
+                print(f"{YELLOW}WARNING{NC}: {report.path} contains console.log or debugger")
+            warnings += 1
+
+    print("")
+    print("Checking for TODOs...")
+    for report in reports:
+        if report.todo:
+            sys.stdout.flush()
+            for line in report.todo:
+                _emit(line)
+            sys.stdout.buffer.flush()
+            print(f"{YELLOW}INFO{NC}: {report.path} contains TODO/FIXME markers")
+
+    print("")
+    print("==========================================")
+    if errors > 0:
+        print(f"{RED}BLOCKED: {errors} error(s) found{NC}")
+        print("Fix the errors above before committing.")
+        return 1
+    if warnings > 0:
+        print(f"{YELLOW}PASSED with {warnings} warning(s){NC}")
+        print("Consider addressing the warnings.")
+        return 0
+    print(f"{GREEN}PASSED: All checks passed{NC}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
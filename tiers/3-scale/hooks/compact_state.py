@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+State capture and restore for the compaction hooks.
+
+`capture` (PreCompact) gathers git state concurrently under a hard time
+budget and rewrites only the snapshot section of .aix-handoff.md. The PR
+lookup is cached per branch in .aix/state/pr-cache.json; when gh is slow
+the last cached answer is used and the snapshot says so.
+
+`restore` (SessionStart) prints the recovery context as hook JSON.
+
+Usage:
+    python3 compact_state.py capture < hook-input.json
+    python3 compact_state.py restore
+
+Environment:
+    AIX_COMPACT_BUDGET    Seconds for the whole capture (default: 2)
+    AIX_PR_CACHE_TTL      Seconds a cached PR lookup stays fresh (default: 300)
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+HANDOFF_FILE = ".aix-handoff.md"
+SNAPSHOT_START = "<!-- COMPACTION_SNAPSHOT_START -->"
+SNAPSHOT_END = "<!-- COMPACTION_SNAPSHOT_END -->"
+PR_CACHE = os.path.join(".aix", "state", "pr-cache.json")
+
+DEFAULT_BUDGET = 2.0
+DEFAULT_PR_TTL = 300
+
+MINIMAL_HANDOFF = """# Session Handoff
+
+> Auto-generated before compaction.
+
+## Status: interrupted
+
+No handoff file existed. Please gather state manually.
+"""
+
+RECOVERY_NOTICE = """## COMPACTION RECOVERY NOTICE
+
+This session resumed after context compaction.
+
+### MANDATORY: Before Any Action
+
+1. Read the handoff state below carefully
+2. Check TaskList for pending work
+3. DO NOT push or create PRs without user approval
+"""
+
+MISSING_HANDOFF = """### WARNING: No .aix-handoff.md found
+
+Run these commands to gather state:
+- git status
+- git log --oneline -5
+- git branch --show-current
+"""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class Source:
+    """Runs commands against a shared deadline; timeouts are recorded, not raised."""
+
+    def __init__(self, budget: float) -> None:
+        self.deadline = time.monotonic() + budget
+        self._lock = threading.Lock()
+        self._degraded: Dict[str, str] = {}
+
+    def note(self, label: str, detail: str) -> None:
+        with self._lock:
+            self._degraded[label] = detail
+
+    @property
+    def degraded(self) -> List[str]:
+        with self._lock:
+            return [f"{label} ({detail})" for label, detail in self._degraded.items()]
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def run(self, label: str, args: List[str]) -> Optional[str]:
+        """
+        Run a command within the remaining budget.
+
+        Returns:
+            stdout without the trailing newline, or None on failure/timeout
+        """
+        timeout = self.remaining()
+        if timeout <= 0:
+            self.note(label, "timed out")
+            return None
+        try:
+            result = subprocess.run(
+                args, capture_output=True, text=True, errors="replace",
+                stdin=subprocess.DEVNULL, timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            self.note(label, "timed out")
+            return None
+        except OSError:
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout.rstrip("\n")
+
+
+def _load_pr_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_pr_cache(path: str, cache: Dict[str, Any]) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(cache, handle, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def lookup_pr(source: Source, branch: str, repo_root: str) -> str:
+    """
+    PR list JSON for a branch, served from a per-branch TTL cache.
+
+    A stale cache entry is still better than nothing when gh times out.
+    """
+    if not branch or branch == "unknown":
+        return "[]"
+    cache_path = os.path.join(repo_root, PR_CACHE)
+    cache = _load_pr_cache(cache_path)
+    entry = cache.get(branch)
+    ttl = _env_float("AIX_PR_CACHE_TTL", DEFAULT_PR_TTL)
+    if entry and time.time() - entry.get("fetched", 0) < ttl:
+        return entry["value"]
+
+    value = source.run("pr lookup", ["gh", "pr", "list", "--head", branch, "--json", "number,title,url"])
+    if value is None:
+        if entry:
+            fetched = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(entry["fetched"]))
+            source.note("pr lookup", f"unavailable, using result cached at {fetched}")
+            return entry["value"]
+        return "[]"
+    cache[branch] = {"fetched": int(time.time()), "value": value}
+    _save_pr_cache(cache_path, cache)
+    return value
+
+
+def collect(budget: float) -> Dict[str, Any]:
+    """Gather git state concurrently; every field has a fallback."""
+    source = Source(budget)
+    cwd = os.getcwd()
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        branch_future = pool.submit(source.run, "branch", ["git", "branch", "--show-current"])
+        root_future = pool.submit(source.run, "repo root", ["git", "rev-parse", "--show-toplevel"])
+        status_future = pool.submit(source.run, "status", ["git", "status", "--short"])
+        log_future = pool.submit(source.run, "log", ["git", "log", "--oneline", "-5"])
+        worktree_future = pool.submit(source.run, "worktrees", ["git", "worktree", "list", "--porcelain"])
+
+        branch = branch_future.result()
+        branch = branch if branch is not None else "unknown"
+        repo_root = root_future.result() or cwd
+        pr_future = pool.submit(lookup_pr, source, branch, repo_root)
+
+        status = status_future.result()
+        log = log_future.result()
+        worktrees = worktree_future.result() or ""
+        existing_pr = pr_future.result()
+
+    main_repo = ""
+    for line in worktrees.splitlines():
+        if line.startswith("worktree "):
+            main_repo = line[len("worktree "):]
+            break
+    worktree_relative = "."
+    if main_repo and repo_root != main_repo and repo_root.startswith(main_repo + "/"):
+        worktree_relative = repo_root[len(main_repo) + 1:]
+    elif main_repo and repo_root != main_repo:
+        worktree_relative = repo_root
+
+    return {
+        "branch": branch,
+        "status": status if status is not None else "(no changes)",
+        "uncommitted": len(status.splitlines()) if status else 0,
+        "recent_commits": log if log is not None else "(no commits)",
+        "existing_pr": existing_pr,
+        "worktree_name": os.path.basename(repo_root),
+        "worktree_relative": worktree_relative,
+        "degraded": source.degraded,
+    }
+
+
+def render_snapshot(state: Dict[str, Any], trigger: str) -> str:
+    lines = [
+        SNAPSHOT_START,
+        "## Compaction Snapshot",
+        f"- Timestamp: {time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}",
+        f"- Trigger: {trigger}",
+        f"- Branch: {state['branch']}",
+        f"- Worktree: {state['worktree_name']}",
+        f"- Worktree Path: {state['worktree_relative']}",
+        f"- Uncommitted Files: {state['uncommitted']}",
+    ]
+    if state["degraded"]:
+        lines.append(f"- Incomplete: {', '.join(state['degraded'])}")
+    lines += [
+        "",
+        "### Uncommitted Changes",
+        "```",
+        state["status"],
+        "```",
+        "",
+        "### Recent Commits",
+        "```",
+        state["recent_commits"],
+        "```",
+        "",
+        "### Existing PR",
+        "```json",
+        state["existing_pr"],
+        "```",
+        SNAPSHOT_END,
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _split_snapshot(data: bytes) -> Tuple[bytes, bytes]:
+    """Return (content before the snapshot, content after it)."""
+    start_marker = SNAPSHOT_START.encode()
+    end_marker = SNAPSHOT_END.encode()
+    before: List[bytes] = []
+    after: List[bytes] = []
+    state = 0  # 0 before, 1 inside, 2 after
+    for line in data.splitlines(keepends=True):
+        stripped = line.rstrip(b"\n")
+        if state == 0 and stripped == start_marker:
+            state = 1
+        elif state == 1 and stripped == end_marker:
+            state = 2
+        elif state == 0:
+            before.append(line)
+        elif state == 2 and stripped not in (start_marker, end_marker):
+            after.append(line)
+    return b"".join(before), b"".join(after)
+
+
+def update_handoff(path: str, snapshot: str) -> None:
+    """
+    Replace the snapshot section of the handoff file.
+
+    When the snapshot is the last thing in the file (the usual case) the
+    file is truncated where the old snapshot began and the new one is
+    appended, so the rest of the handoff is never rewritten. Otherwise the
+    file is rebuilt atomically with the snapshot moved to the end.
+    """
+    encoded = snapshot.encode("utf-8")
+    try:
+        handle = open(path, "r+b")
+    except FileNotFoundError:
+        with open(path, "wb") as handle:
+            handle.write(MINIMAL_HANDOFF.encode("utf-8") + b"\n" + encoded)
+        return
+
+    with handle:
+        data = handle.read()
+        before, after = _split_snapshot(data)
+        head = before.rstrip(b"\n") + b"\n\n"
+        if not after.strip():
+            if data.startswith(head):
+                handle.seek(len(head))
+            else:
+                handle.seek(0)
+                handle.write(head)
+            handle.truncate()
+            handle.write(encoded)
+            return
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(before.rstrip(b"\n") + b"\n" + after.rstrip(b"\n") + b"\n\n" + encoded)
+    os.replace(tmp_path, path)
+
+
+def read_trigger() -> str:
+    if sys.stdin is None or sys.stdin.isatty():
+        return "unknown"
+    try:
+        data = json.loads(sys.stdin.read() or "{}")
+        trigger = data.get("trigger")
+    except (ValueError, AttributeError):
+        return "unknown"
+    if trigger is None or trigger is False:
+        return "unknown"
+    return trigger if isinstance(trigger, str) else json.dumps(trigger)
+
+
+def capture() -> None:
+    trigger = read_trigger()
+    state = collect(_env_float("AIX_COMPACT_BUDGET", DEFAULT_BUDGET))
+    update_handoff(HANDOFF_FILE, render_snapshot(state, trigger))
+    print(f"Handoff updated: {HANDOFF_FILE}", file=sys.stderr)
+
+
+def restore() -> None:
+    parts = [RECOVERY_NOTICE]
+    if os.path.isfile(HANDOFF_FILE):
+        try:
+            with open(HANDOFF_FILE, encoding="utf-8", errors="replace") as handle:
+                handoff = handle.read()
+        except OSError:
+            handoff = "(Failed to read handoff file)\n"
+        parts.append("---\n\n" + handoff)
+    else:
+        parts.append(MISSING_HANDOFF)
+    context = "\n".join(parts).rstrip("\n")
+    output = {"hookSpecificOutput": {"hookEventName": "SessionStart", "additionalContext": context}}
+    sys.stdout.write(json.dumps(output, ensure_ascii=False, separators=(",", ":")))
+
+
+def main() -> None:
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    # Hooks must never fail the session; report and exit 0
+    try:
+        if command == "capture":
+            capture()
+        elif command == "restore":
+            restore()
+        else:
+            print("Usage: compact_state.py capture|restore", file=sys.stderr)
+    except Exception as e:
+        print(f"compact_state: {type(e).__name__}: {e}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,79 +18,50 @@
 #   "deny"  = block tool execution with reason
 #   "ask"   = prompt user for confirmation
 #
+# Rules live in validate-bash.rules.json and are evaluated by validate_bash.py.
+# This wrapper spawns nothing when a warm policy server is running:
+#
+#   python3 .aix/hooks/validate_bash.py --serve &   # publishes .aix/state/validate-bash.port
+#
+# Otherwise it runs the engine once per call. Set AIX_VALIDATE_BASH_SERVER=auto
+# to start the server in the background on first use.
+#
+# The port file (ours, mode 0600) also holds a per-session token, and only a
+# reply that starts with it is trusted; any other answer on that port falls
+# back to the one-shot engine.
+#
 
-set -euo pipefail
+set -uo pipefail
 
-# Read hook input from stdin
-INPUT=$(cat)
-COMMAND=$(echo "$INPUT" | jq -r '.tool_input.command // ""' 2>/dev/null || echo "")
+HOOK_DIR="${BASH_SOURCE[0]%/*}"
+[ "$HOOK_DIR" = "${BASH_SOURCE[0]}" ] && HOOK_DIR="."
+ENGINE="$HOOK_DIR/validate_bash.py"
+PORT_FILE="${AIX_VALIDATE_BASH_PORT_FILE:-$HOOK_DIR/../state/validate-bash.port}"
 
-# Output JSON response in Claude Code's expected format
-respond() {
-    local decision="$1"
-    local reason="${2:-}"
+# Read hook input from stdin without forking
+IFS= read -r -d '' INPUT || true
 
-    if [ -n "$reason" ]; then
-        jq -n --arg d "$decision" --arg r "$reason" \
-            '{
-                "hookSpecificOutput": {
-                    "hookEventName": "PreToolUse",
-                    "permissionDecision": $d,
-                    "permissionDecisionReason": $r
-                }
-            }'
-    else
-        jq -n --arg d "$decision" \
-            '{
-                "hookSpecificOutput": {
-                    "hookEventName": "PreToolUse",
-                    "permissionDecision": $d
-                }
-            }'
-    fi
+# Ask the warm server: send input + NUL, read the decision until it closes
+ask_server() {
+    printf '%s\0' "$INPUT" >&3 || return 1
+    IFS= read -r -d '' -t 2 RESPONSE <&3
+    return 0
 }
 
-# =============================================================================
-# BLOCKED - Destructive database operations
-# =============================================================================
-
-# Prisma migrate reset (drops and recreates database)
-if echo "$COMMAND" | grep -qiE 'prisma\s+migrate\s+reset'; then
-    respond "deny" "BLOCKED: prisma migrate reset detected. This drops the entire database. Get explicit user approval first."
-    exit 0
-fi
-
-# Prisma db push with destructive flags
-if echo "$COMMAND" | grep -qiE 'prisma\s+db\s+push' && echo "$COMMAND" | grep -qiE '(--force-reset|--accept-data-loss)'; then
-    respond "deny" "BLOCKED: Destructive prisma db push flag detected. Get explicit user approval first."
-    exit 0
-fi
-
-# Raw SQL destructive commands (only in SQL execution contexts)
-if echo "$COMMAND" | grep -qiE '(psql|mysql|prisma\s+db\s+execute)' && echo "$COMMAND" | grep -qiE '(DROP\s+(DATABASE|TABLE|SCHEMA)|TRUNCATE\s+TABLE)'; then
-    respond "deny" "BLOCKED: Destructive SQL command detected. Get explicit user approval first."
-    exit 0
-fi
-
-# =============================================================================
-# WARNED - Allow but inform Claude of concerns
-# =============================================================================
-
-# Non-migration schema changes
-if echo "$COMMAND" | grep -qiE 'prisma\s+db\s+push' && ! echo "$COMMAND" | grep -qiE '(--force-reset|--accept-data-loss)'; then
-    respond "allow" "WARNING: prisma db push without migrations. Consider using 'prisma migrate dev' instead for reproducible schema changes."
-    exit 0
+RESPONSE=""
+TOKEN=""
+if [ -O "$PORT_FILE" ] && read -r PORT TOKEN < "$PORT_FILE" && [ -n "$PORT" ] && [ -n "$TOKEN" ]; then
+    { ask_server; } 2>/dev/null 3<>"/dev/tcp/127.0.0.1/$PORT"
+    if [[ "$RESPONSE" == "$TOKEN"$'\n'*'"permissionDecision"'* ]]; then
+        printf '%s' "${RESPONSE#"$TOKEN"$'\n'}"
+        exit 0
+    fi
 fi
 
-# Direct package.json edits (should use package manager commands)
-if echo "$COMMAND" | grep -qiE '(cat|echo|sed|awk).*package\.json'; then
-    respond "allow" "WARNING: Appears to modify package.json directly. Use 'npm/pnpm add/remove' commands instead to keep lockfile in sync."
-    exit 0
+if [ "${AIX_VALIDATE_BASH_SERVER:-}" = "auto" ]; then
+    python3 -I -S "$ENGINE" --serve --port-file "$PORT_FILE" > /dev/null 2>&1 < /dev/null &
+    disown 2>/dev/null || true
 fi
 
-# =============================================================================
-# DEFAULT - Allow all other commands
-# =============================================================================
-
-respond "allow"
-exit 0
+# One-shot evaluation (prints the decision JSON)
+exec python3 -I -S "$ENGINE" <<< "$INPUT"
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Policy engine for the validate-bash PreToolUse hook.
+
+Rules live in validate-bash.rules.json next to this file. Every rule's
+patterns are precompiled, and their union forms one combined matcher: a
+command that matches none of them (the common case) is allowed without
+evaluating individual rules. Patterns are matched per line, case-insensitive,
+to keep the decisions of the original `echo | grep -qiE` checks.
+
+Usage:
+    python3 validate_bash.py < hook-input.json
+    python3 validate_bash.py --serve [--port-file PATH] [--idle-timeout SECONDS]
+    python3 validate_bash.py --check-cases validate-bash.cases.json
+    python3 validate_bash.py --bench 20000
+"""
+
+from __future__ import annotations
+
+# Only json/os/re/sys load on the one-shot hook path; everything else is
+# imported where used so interpreter startup stays minimal.
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+HOOK_DIR = os.path.dirname(os.path.abspath(__file__))
+RULES_FILE = os.path.join(HOOK_DIR, "validate-bash.rules.json")
+CASES_FILE = os.path.join(HOOK_DIR, "validate-bash.cases.json")
+DEFAULT_PORT_FILE = os.path.join(os.path.dirname(HOOK_DIR), "state", "validate-bash.port")
+
+# Request terminator for the warm server (JSON never contains a raw NUL)
+FRAME_END = b"\0"
+
+Rule = namedtuple("Rule", ["id", "decision", "reason", "match", "unless"])
+
+
+def _compile(pattern: str) -> re.Pattern:
+    return re.compile(pattern, re.IGNORECASE)
+
+
+class Policy:
+    """Compiled rule set with a combined prefilter."""
+
+    def __init__(self, data: dict) -> None:
+        default = data.get("default") or {}
+        self.default_decision = default.get("decision", "allow")
+        self.default_reason = default.get("reason")
+        self.rules: list[Rule] = []
+        match_patterns: list[str] = []
+        for item in data.get("rules", []):
+            if not item.get("match"):
+                raise ValueError(f"Rule {item.get('id')!r} has no match patterns")
+            match_patterns.extend(item["match"])
+            self.rules.append(Rule(
+                id=item["id"],
+                decision=item["decision"],
+                reason=item.get("reason"),
+                match=tuple(_compile(p) for p in item["match"]),
+                unless=tuple(_compile(p) for p in item.get("unless", [])),
+            ))
+        # A rule can only fire if one of its match patterns matches, so the
+        # union of all match patterns is a safe single-pass prefilter.
+        self.prefilter = _compile("|".join(f"(?:{p})" for p in match_patterns)) if match_patterns else None
+
+    @classmethod
+    def load(cls, path: str = RULES_FILE) -> Policy:
+        with open(path) as handle:
+            return cls(json.load(handle))
+
+    def decide(self, command: str) -> tuple[str, str | None, str | None]:
+        """
+        Decide on a command.
+
+        Returns:
+            (decision, reason, rule id) - rule id is None for the default
+        """
+        if not command or self.prefilter is None or not self.prefilter.search(command):
+            return self.default_decision, self.default_reason, None
+
+        lines = command.split("\n")
+
+        def matches(pattern: re.Pattern) -> bool:
+            return any(pattern.search(line) for line in lines)
+
+        for rule in self.rules:
+            if all(matches(p) for p in rule.match) and not any(matches(p) for p in rule.unless):
+                return rule.decision, rule.reason, rule.id
+        return self.default_decision, self.default_reason, None
+
+
+def command_from_input(raw: str) -> str:
+    """Extract .tool_input.command the way `jq -r '... // ""'` did."""
+    try:
+        data = json.loads(raw)
+        value = data["tool_input"].get("command")
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return ""
+    if value is None or value is False:
+        return ""
+    if not isinstance(value, str):
+        value = json.dumps(value, indent=2)
+    # $(...) stripped trailing newlines before the grep checks
+    return value.rstrip("\n")
+
+
+def render(decision: str, reason: str | None) -> str:
+    output: dict = {
+        "hookEventName": "PreToolUse",
+        "permissionDecision": decision,
+    }
+    if reason:
+        output["permissionDecisionReason"] = reason
+    return json.dumps({"hookSpecificOutput": output}, indent=2)
+
+
+def handle(policy: Policy, raw: str) -> str:
+    decision, reason, _ = policy.decide(command_from_input(raw))
+    return render(decision, reason)
+
+
+class _ReloadingPolicy:
+    """Policy that recompiles when the rules file changes (for --serve)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.signature: tuple[int, int] | None = None
+        self.policy: Policy | None = None
+
+    def get(self) -> Policy:
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self.policy is None or signature != self.signature:
+            self.policy = Policy.load(self.path)
+            self.signature = signature
+        return self.policy
+
+
+def serve(rules_path: str, port_file: str, idle_timeout: float) -> None:
+    """
+    Serve decisions on 127.0.0.1 until idle for idle_timeout seconds.
+
+    Protocol: the client sends the hook input followed by a NUL byte; the
+    server replies with a line holding its session token, then the
+    decision JSON, and closes the connection. "<port> <token>" is written
+    to port_file (mode 0600) for validate-bash.sh, which only trusts a
+    reply that starts with that token: anything else listening on the
+    port (another user's process, or whatever reused a stale port) can't
+    answer for the hook.
+    """
+    import secrets
+    import signal
+    import socket
+    import socketserver
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    policies = _ReloadingPolicy(rules_path)
+    policies.get()
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self) -> None:
+            self.request.settimeout(2)
+            chunks = []
+            try:
+                while True:
+                    chunk = self.request.recv(65536)
+                    if not chunk:
+                        break
+                    if chunk.endswith(FRAME_END):
+                        chunks.append(chunk[:-1])
+                        break
+                    chunks.append(chunk)
+            except socket.timeout:
+                return
+            raw = b"".join(chunks).decode("utf-8", errors="replace")
+            self.request.sendall(f"{token}\n{handle(policies.get(), raw)}\n".encode())
+
+    token = secrets.token_hex(16)
+    server = socketserver.TCPServer(("127.0.0.1", 0), Handler)
+    server.timeout = idle_timeout
+    port = str(server.server_address[1])
+    os.makedirs(os.path.dirname(port_file), mode=0o700, exist_ok=True)
+    tmp_path = f"{port_file}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, "w") as out:
+        out.write(f"{port} {token}\n")
+    os.replace(tmp_path, port_file)
+
+    idle = {"timed_out": False}
+
+    def on_timeout() -> None:
+        idle["timed_out"] = True
+
+    server.handle_timeout = on_timeout
+    try:
+        while not idle["timed_out"]:
+            server.handle_request()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        try:
+            with open(port_file) as published:
+                current = published.read().split()
+            if current[:1] == [port]:
+                os.unlink(port_file)
+        except OSError:
+            pass
+
+
+def _load_cases(cases_path: str) -> list[dict]:
+    with open(cases_path) as handle:
+        return json.load(handle)["cases"]
+
+
+def _case_input(case: dict) -> str:
+    if "input" in case:
+        return case["input"]
+    return json.dumps({"tool_input": {"command": case["command"]}})
+
+
+def check_cases(policy: Policy, cases_path: str) -> int:
+    """
+    Replay the parity corpus; each case gives a command (or raw input) and
+    the decision and rule the original shell hook produced.
+
+    Returns:
+        Number of mismatches
+    """
+    cases = _load_cases(cases_path)
+    failures = 0
+    for case in cases:
+        decision, reason, rule = policy.decide(command_from_input(_case_input(case)))
+        if decision != case["decision"] or rule != case.get("rule"):
+            failures += 1
+            label = case.get("command", case.get("input"))
+            print(f"FAIL {label!r}: got {decision}/{rule}, expected {case['decision']}/{case.get('rule')}")
+    print(f"{len(cases) - failures}/{len(cases)} cases match")
+    return failures
+
+
+def bench(policy: Policy, cases_path: str, iterations: int) -> None:
+    """Time full request handling (parse, decide, render) over the corpus."""
+    import time
+
+    inputs = [_case_input(case) for case in _load_cases(cases_path)]
+    start = time.perf_counter()
+    count = 0
+    while count < iterations:
+        for raw in inputs:
+            handle(policy, raw)
+            count += 1
+    elapsed = time.perf_counter() - start
+    print(f"{count} decisions in {elapsed * 1000:.1f} ms ({elapsed / count * 1e6:.1f} us/decision)")
+
+
+def main() -> None:
+    # Hook invocation: no arguments, input on stdin
+    if len(sys.argv) == 1:
+        print(handle(Policy.load(), sys.stdin.read()))
+        return
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="validate-bash policy engine")
+    parser.add_argument("--rules", default=RULES_FILE, help="Rules file")
+    parser.add_argument("--serve", action="store_true", help="Run as a warm local decision server")
+    parser.add_argument("--port-file", help="Where --serve publishes its port")
+    parser.add_argument("--idle-timeout", type=float, default=1800, help="Seconds before an idle server exits")
+    parser.add_argument("--check-cases", nargs="?", const=CASES_FILE, help="Replay the parity corpus")
+    parser.add_argument("--bench", type=int, metavar="N", help="Time N decisions over the parity corpus")
+    args = parser.parse_args()
+
+    if args.serve:
+        port_file = args.port_file or os.environ.get("AIX_VALIDATE_BASH_PORT_FILE") or DEFAULT_PORT_FILE
+        serve(args.rules, port_file, args.idle_timeout)
+        return
+
+    policy = Policy.load(args.rules)
+
+    if args.check_cases:
+        sys.exit(1 if check_cases(policy, args.check_cases) else 0)
+    if args.bench:
+        bench(policy, CASES_FILE, args.bench)
+        return
+
+    print(handle(policy, sys.stdin.read()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1224 @@
+#!/usr/bin/env python3
+"""
+Worktree provisioning engine behind worktree-setup.sh and worktree-validate.sh.
+
+Parses worktree.yaml once, builds indexed service/port/env maps, plans every
+symlink and env file before the worktree is created, then applies the plan
+in one process (env files for independent services are written in parallel).
+
+Ports come from a lease table in the git common dir shared by all worktrees
+of the repo; worktree-cleanup.sh releases the lease through `release`.
+
+Usage:
+    python3 .aix/scripts/aix_worktree.py setup <feature-name> [--dry-run]
+    python3 .aix/scripts/aix_worktree.py validate <feature-name> [--allow-missing-config]
+    python3 .aix/scripts/aix_worktree.py ports <feature-name>
+    python3 .aix/scripts/aix_worktree.py release <feature-name>
+"""
+
+import argparse
+import contextlib
+import fcntl
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+RED = "\033[0;31m"
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+NC = "\033[0m"
+
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+BRANCH_PREFIX_PATTERN = re.compile(r"^[A-Za-z0-9._/-]+$")
+PORT_REF_PATTERN = re.compile(r"\{\{([A-Za-z0-9_-]+)\.port\}\}")
+UNRESOLVED_PATTERN = re.compile(r"\{\{.*\}\}", re.DOTALL)
+
+DEFAULT_ENV_FILE = ".env.local"
+PORT_SLOTS = 100
+PORT_STRIDE = 10
+
+LEASE_VERSION = 1
+LEASE_DIR = "aix"
+LEASE_FILE = "worktree-ports.json"
+# A lease is recorded before `git worktree add` creates its directory; until
+# setup confirms it, a missing directory only makes it stale after this long
+LEASE_PENDING_GRACE = 600
+
+
+class ConfigError(Exception):
+    """Raised when worktree.yaml is invalid for provisioning."""
+
+
+class PortsExhausted(ConfigError):
+    """Raised when no port block is free for a new lease."""
+
+
+def error(message: str) -> None:
+    print(f"{RED}Error: {message}{NC}", file=sys.stderr)
+
+
+def warn(message: str) -> None:
+    print(f"{YELLOW}Warning: {message}{NC}", file=sys.stderr)
+
+
+def info(message: str) -> None:
+    print(f"{GREEN}{message}{NC}")
+
+
+def _within(path: str, root: str) -> bool:
+    try:
+        return os.path.commonpath([path, root]) == root
+    except ValueError:
+        return False
+
+
+# =============================================================================
+# Config
+# =============================================================================
+
+def find_config(repo_root: Path) -> Optional[Path]:
+    for candidate in (repo_root / ".aix" / "config" / "worktree.yaml", repo_root / ".aix" / "worktree.yaml"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def find_schema(repo_root: Path) -> Optional[Path]:
+    for candidate in (repo_root / ".aix" / "config" / "worktree.schema.json", repo_root / ".aix" / "worktree.schema.json"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def load_config(config_path: Path) -> Dict[str, Any]:
+    """
+    Parse worktree.yaml.
+
+    Raises:
+        ConfigError: If PyYAML is missing or the file isn't a mapping
+    """
+    try:
+        import yaml
+    except ImportError as e:
+        raise ConfigError(f"Missing PyYAML; install with: python3 -m pip install pyyaml ({e})")
+    with config_path.open("r", encoding="utf-8") as handle:
+        data = yaml.safe_load(handle) or {}
+    if not isinstance(data, dict):
+        raise ConfigError(f"{config_path} must contain a mapping")
+    return data
+
+
+def port_offset(name: str) -> int:
+    """FNV-1a style offset for a feature name; the preferred lease slot."""
+    h = 2166136261
+    for ch in name:
+        h &= 0x7FFFFFFF
+        h = (h ^ ord(ch)) * 16777619
+        h &= 0x7FFFFFFF
+    return ((h & 0x7FFFFFFF) % PORT_SLOTS) * PORT_STRIDE
+
+
+def sanitize(name: str) -> str:
+    return "".join(ch for ch in name if ch.isascii() and (ch.isalnum() or ch in "_-"))
+
+
+class Service(NamedTuple):
+    name: str
+    path: str
+    port_env: str
+    base_port: int
+    env_file: str
+    shared_env: str
+    env_refs: Dict[str, Any]
+
+
+def parse_services(data: Dict[str, Any], repo_root: Path) -> List[Service]:
+    """
+    Parse and check the services list.
+
+    Raises:
+        ConfigError: On the first invalid service
+    """
+    services = data.get("services") or []
+    if not isinstance(services, list):
+        raise ConfigError("services must be a list")
+
+    repo_real = os.path.realpath(repo_root)
+    parsed: List[Service] = []
+    for svc in services:
+        if not isinstance(svc, dict):
+            raise ConfigError("each service must be a mapping")
+        name = svc.get("name")
+        path = svc.get("path")
+        port_env = svc.get("port_env")
+        base_port = svc.get("base_port")
+        if not name or not path or not port_env or base_port is None:
+            raise ConfigError("service missing required fields (name, path, port_env, base_port)")
+        if not NAME_PATTERN.match(str(name)):
+            raise ConfigError(f"service name contains invalid characters: {name}")
+        if os.path.isabs(path):
+            raise ConfigError(f"service path must be relative: {path}")
+        if not _within(os.path.realpath(os.path.join(repo_root, path)), repo_real):
+            raise ConfigError(f"service path escapes repo root: {path}")
+        try:
+            base_port = int(base_port)
+        except (TypeError, ValueError):
+            raise ConfigError(f"base_port must be an integer for {name}")
+        env_refs = svc.get("env_refs") or {}
+        if not isinstance(env_refs, dict):
+            raise ConfigError(f"env_refs must be a mapping for {name}")
+        parsed.append(Service(
+            name=str(name),
+            path=str(path),
+            port_env=str(port_env),
+            base_port=base_port,
+            env_file=svc.get("env_file") or DEFAULT_ENV_FILE,
+            shared_env=svc.get("shared_env") or "",
+            env_refs=env_refs,
+        ))
+    return parsed
+
+
+def assign_ports(services: List[Service], offset: int) -> Dict[str, int]:
+    """
+    Map service name -> port for a feature offset.
+
+    Raises:
+        ConfigError: On out-of-range ports or collisions
+    """
+    ports: Dict[str, int] = {}
+    owners: Dict[int, str] = {}
+    for svc in services:
+        port = svc.base_port + offset
+        if port < 1 or port > 65535:
+            raise ConfigError(f"Port out of range for {svc.name}: {port}")
+        if port in owners:
+            raise ConfigError(f"Port collision detected: {port} used by {owners[port]} and {svc.name}")
+        owners[port] = svc.name
+        ports[svc.name] = port
+    return ports
+
+
+def env_target(service_dir: str, env_file: str) -> str:
+    """
+    Resolve a service's env file, which must stay inside the service dir.
+
+    Raises:
+        ConfigError: If the env file escapes the service directory
+    """
+    service_real = os.path.realpath(service_dir)
+    if os.path.isabs(env_file):
+        target = os.path.realpath(env_file)
+    else:
+        target = os.path.realpath(os.path.join(service_real, env_file))
+    if not _within(target, service_real):
+        raise ConfigError(f"env_file escapes service directory: {env_file}")
+    return target
+
+
+def render_env_refs(svc: Service, ports: Dict[str, int]) -> List[Tuple[str, str]]:
+    """
+    Expand {{service.port}} placeholders in env_refs.
+
+    Raises:
+        ConfigError: If a placeholder can't be resolved
+    """
+    rendered = []
+    for key, value in svc.env_refs.items():
+        value = PORT_REF_PATTERN.sub(
+            lambda match: str(ports[match.group(1)]) if match.group(1) in ports else match.group(0),
+            str(value),
+        )
+        if UNRESOLVED_PATTERN.search(value):
+            raise ConfigError(f"Unresolved env_refs for {svc.name}: {key}")
+        rendered.append((str(key), value))
+    return rendered
+
+
+# =============================================================================
+# Port leases
+# =============================================================================
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _age_seconds(stamp: str) -> float:
+    """Seconds since a _now() timestamp; unparseable stamps count as ancient."""
+    try:
+        then = datetime.strptime(stamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return float("inf")
+    return (datetime.now(timezone.utc) - then).total_seconds()
+
+
+class PortLeases:
+    """
+    Port blocks leased to worktrees, shared by every worktree of a repo.
+
+    The table lives in the git common dir, so all worktrees see the same
+    leases; open() holds an flock for the duration of the with-block. Each
+    lease owns one slot (offset = slot * PORT_STRIDE) and the concrete ports
+    its services got. A port -> owner index makes conflict checks O(1) per
+    port, so allocation probes from the feature's hash slot and normally
+    takes the first slot it tries.
+    """
+
+    def __init__(self, path: Path, data: Dict[str, Any]) -> None:
+        self.path = path
+        self.leases: Dict[str, Dict[str, Any]] = data.get("leases") or {}
+        self.dirty = False
+        self._owners: Dict[int, str] = {}
+        self._slots: Dict[int, str] = {}
+        for name, lease in self.leases.items():
+            self._index(name, lease)
+
+    def _index(self, name: str, lease: Dict[str, Any]) -> None:
+        self._slots[lease["slot"]] = name
+        for port in lease["ports"].values():
+            self._owners[port] = name
+
+    def _unindex(self, name: str, lease: Dict[str, Any]) -> None:
+        if self._slots.get(lease["slot"]) == name:
+            del self._slots[lease["slot"]]
+        for port in lease["ports"].values():
+            if self._owners.get(port) == name:
+                del self._owners[port]
+
+    @staticmethod
+    def table_path(repo_root: Path) -> Path:
+        result = _git("rev-parse", "--git-common-dir", cwd=repo_root)
+        if result.returncode != 0:
+            raise ConfigError("Unable to locate git common dir for port leases")
+        return (repo_root / result.stdout.strip()).resolve() / LEASE_DIR / LEASE_FILE
+
+    @classmethod
+    @contextlib.contextmanager
+    def open(cls, repo_root: Path, exclusive: bool = True) -> Iterator["PortLeases"]:
+        """Lock and load the lease table; saves on exit if it changed."""
+        path = cls.table_path(repo_root)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path.with_suffix(".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            data: Dict[str, Any] = {}
+            if path.exists():
+                try:
+                    data = json.loads(path.read_text(encoding="utf-8"))
+                except ValueError:
+                    warn(f"Ignoring unreadable port lease table: {path}")
+            table = cls(path, data)
+            yield table
+            if table.dirty and exclusive:
+                table.save()
+
+    def save(self) -> None:
+        data = {"version": LEASE_VERSION, "stride": PORT_STRIDE, "leases": self.leases}
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.leases.get(name)
+
+    def owner(self, port: int, exclude: Optional[str] = None) -> Optional[str]:
+        owner = self._owners.get(port)
+        return None if owner == exclude else owner
+
+    def _fits(self, name: str, services: List[Service], slot: int) -> Optional[Dict[str, int]]:
+        """Ports for services at slot, or None if the block isn't free."""
+        # Slot 0 (the base ports) belongs to the main worktree
+        if slot == 0:
+            return None
+        held = self._slots.get(slot)
+        if held is not None and held != name:
+            return None
+        offset = slot * PORT_STRIDE
+        base_ports = {svc.base_port for svc in services}
+        ports: Dict[str, int] = {}
+        for svc in services:
+            port = svc.base_port + offset
+            if port < 1 or port > 65535 or port in base_ports or self.owner(port, exclude=name):
+                return None
+            ports[svc.name] = port
+        return ports
+
+    def find(self, name: str, services: List[Service]) -> Tuple[int, Dict[str, int]]:
+        """
+        Pick the slot a feature would get, without recording it.
+
+        An existing lease is kept while its ports still fit the config.
+
+        Raises:
+            ConfigError: On colliding service ports or a full table
+        """
+        assign_ports(services, 0)  # same offset for all, so collisions are config errors
+        lease = self.leases.get(name)
+        if lease is not None:
+            ports = self._fits(name, services, lease["slot"])
+            if ports is not None:
+                return lease["slot"], ports
+        start = port_offset(name) // PORT_STRIDE
+        for step in range(PORT_SLOTS):
+            slot = (start + step) % PORT_SLOTS
+            ports = self._fits(name, services, slot)
+            if ports is not None:
+                return slot, ports
+        raise PortsExhausted(f"No free port block for {name} ({len(self.leases)} leases in {self.path})")
+
+    def allocate(self, name: str, services: List[Service], path: Path, branch: str) -> Dict[str, Any]:
+        """
+        Lease a port block to a feature worktree.
+
+        The lease is pending until confirm(): its directory doesn't exist
+        yet, and reclaim_stale() must not take it back in the meantime.
+
+        Raises:
+            ConfigError: If no slot is free
+        """
+        slot, ports = self.find(name, services)
+        previous = self.leases.get(name)
+        if previous is not None:
+            self._unindex(name, previous)
+        lease = {
+            "slot": slot,
+            "offset": slot * PORT_STRIDE,
+            "ports": ports,
+            "path": str(path),
+            "branch": branch,
+            "created": previous["created"] if previous else _now(),
+            "pending": _now(),
+        }
+        self.leases[name] = lease
+        self._index(name, lease)
+        self.dirty = True
+        return lease
+
+    def confirm(self, name: str) -> None:
+        """Mark a lease's worktree as created."""
+        lease = self.leases.get(name)
+        if lease is not None and lease.pop("pending", None) is not None:
+            self.dirty = True
+
+    def release(self, name: str) -> Optional[Dict[str, Any]]:
+        lease = self.leases.pop(name, None)
+        if lease is not None:
+            self._unindex(name, lease)
+            self.dirty = True
+        return lease
+
+    def reclaim_stale(self, keep: Optional[str] = None) -> List[str]:
+        """
+        Release leases whose worktree directory no longer exists.
+
+        Pending leases (setup still running) are kept for
+        LEASE_PENDING_GRACE seconds even though their directory is missing.
+        """
+        stale = [
+            name for name, lease in self.leases.items()
+            if name != keep
+            and not os.path.isdir(lease.get("path", ""))
+            and ("pending" not in lease or _age_seconds(lease["pending"]) > LEASE_PENDING_GRACE)
+        ]
+        for name in stale:
+            self.release(name)
+        return stale
+
+
+def preview_offset(leases: PortLeases, name: str, data: Dict[str, Any], repo_root: Path) -> Tuple[int, Optional[str]]:
+    """
+    Offset a feature has (or would be leased) without recording anything.
+
+    Returns:
+        (offset, error) - error is set only when the table is full; other
+        config errors fall back to the hash offset and surface in validate()
+    """
+    lease = leases.get(name)
+    if lease is not None:
+        return lease["offset"], None
+    try:
+        slot, _ = leases.find(name, parse_services(data, repo_root))
+    except PortsExhausted as e:
+        return port_offset(name), str(e)
+    except ConfigError:
+        return port_offset(name), None
+    return slot * PORT_STRIDE, None
+
+
+# =============================================================================
+# Validation
+# =============================================================================
+
+def validate(
+    data: Dict[str, Any],
+    schema_path: Optional[Path],
+    repo_root: Path,
+    offset: int,
+    leases: Optional["PortLeases"] = None,
+    lease_name: Optional[str] = None,
+) -> Tuple[List[str], List[str]]:
+    """
+    Check config, ports and paths for a feature without touching the disk.
+
+    Ports are the base ports plus offset; when a lease table is given they
+    are also checked against ports leased to other worktrees.
+
+    Returns:
+        (errors, warnings)
+    """
+    errors: List[str] = []
+    warnings: List[str] = []
+
+    if schema_path and schema_path.exists():
+        try:
+            import jsonschema
+        except ImportError:
+            warnings.append("jsonschema not installed; skipping schema validation")
+        else:
+            schema = json.loads(schema_path.read_text(encoding="utf-8"))
+            try:
+                jsonschema.validate(instance=data, schema=schema)
+            except jsonschema.ValidationError as exc:
+                location = ".".join(str(part) for part in exc.absolute_path)
+                if location:
+                    errors.append(f"Schema validation failed at {location}: {exc.message}")
+                else:
+                    errors.append(f"Schema validation failed: {exc.message}")
+
+    branch_prefix = data.get("branch_prefix")
+    if branch_prefix is not None:
+        if not isinstance(branch_prefix, str):
+            errors.append("branch_prefix must be a string")
+        elif not BRANCH_PREFIX_PATTERN.match(branch_prefix) or ".." in branch_prefix:
+            errors.append(f"Invalid branch_prefix: {branch_prefix}")
+
+    services = data.get("services") or []
+    if not isinstance(services, list):
+        errors.append("services must be a list")
+        services = []
+
+    repo_abs = os.path.abspath(repo_root)
+    declared = {str(svc.get("name")) for svc in services if isinstance(svc, dict) and svc.get("name")}
+    port_owners: Dict[int, str] = {}
+
+    for svc in services:
+        if not isinstance(svc, dict):
+            errors.append("each service must be a mapping")
+            continue
+        name = svc.get("name")
+        path = svc.get("path")
+        port_env = svc.get("port_env")
+        base_port = svc.get("base_port")
+        env_file = svc.get("env_file") or DEFAULT_ENV_FILE
+        env_refs = svc.get("env_refs") or {}
+
+        if not name or not path or not port_env or base_port is None:
+            errors.append("service missing required fields (name, path, port_env, base_port)")
+            continue
+        if not NAME_PATTERN.match(str(name)):
+            errors.append(f"service name contains invalid characters: {name}")
+            continue
+        if os.path.isabs(path):
+            errors.append(f"service path must be relative: {path}")
+            continue
+        resolved = os.path.abspath(os.path.join(repo_abs, path))
+        if not _within(resolved, repo_abs):
+            errors.append(f"service path escapes repo root: {path}")
+            continue
+        try:
+            base_port = int(base_port)
+        except (TypeError, ValueError):
+            errors.append(f"base_port must be an integer for {name}")
+            continue
+
+        port = base_port + offset
+        if port < 1 or port > 65535:
+            errors.append(f"port out of range for {name}: {port}")
+        if port in port_owners:
+            errors.append(f"port collision detected: {port}")
+        port_owners.setdefault(port, str(name))
+        owner = leases.owner(port, exclude=lease_name) if leases else None
+        if owner:
+            errors.append(f"port {port} for {name} is leased by worktree {owner}")
+
+        try:
+            env_target(resolved, env_file)
+        except ConfigError:
+            errors.append(f"env_file escapes service directory for {name}: {env_file}")
+
+        if not isinstance(env_refs, dict):
+            errors.append(f"env_refs must be a mapping for {name}")
+            env_refs = {}
+        for key, value in env_refs.items():
+            if not isinstance(value, str):
+                errors.append(f"env_refs value must be string for {name}.{key}")
+                continue
+            for ref in PORT_REF_PATTERN.findall(value):
+                if ref not in declared:
+                    errors.append(f"env_refs for {name} references unknown service: {ref}")
+
+    symlinks = data.get("symlinks") or []
+    if symlinks and not isinstance(symlinks, list):
+        errors.append("symlinks must be a list")
+        symlinks = []
+
+    repo_real = os.path.realpath(repo_root)
+    for entry in symlinks:
+        if isinstance(entry, str):
+            matches = glob.glob(os.path.join(repo_abs, entry))
+            if not matches:
+                warnings.append(f"symlink source not found for pattern: {entry}")
+                continue
+            for match in matches:
+                if not _within(os.path.realpath(match), repo_real):
+                    warnings.append(f"symlink target outside repo: {match}")
+            continue
+        if isinstance(entry, dict):
+            source = entry.get("source")
+            target = entry.get("target")
+            if not source or not target:
+                errors.append("symlink mapping requires source and target")
+                continue
+            source_path = source if os.path.isabs(source) else os.path.join(repo_abs, source)
+            target_path = target if os.path.isabs(target) else os.path.join(repo_abs, target)
+            if not _within(os.path.realpath(target_path), repo_real):
+                warnings.append(f"symlink target outside repo: {target}")
+            if not _within(os.path.realpath(source_path), repo_real):
+                warnings.append(f"symlink source outside repo: {source}")
+            if not os.path.exists(source_path):
+                warnings.append(f"symlink source not found: {source}")
+            continue
+        errors.append("symlink entries must be strings or mappings")
+
+    return errors, warnings
+
+
+# =============================================================================
+# Planning
+# =============================================================================
+
+class SharedEnv(NamedTuple):
+    service: Service
+    main_env_path: str
+
+
+class EnvFile(NamedTuple):
+    service: Service
+    port: int
+    refs: List[Tuple[str, str]]
+    seed_source: Optional[str]
+
+
+class SetupPlan(NamedTuple):
+    services: List[Service]
+    ports: Dict[str, int]
+    shared_envs: List[SharedEnv]
+    links: List[Tuple[str, str]]
+    env_files: List[EnvFile]
+    post_setup: List[str]
+    warnings: List[str]
+
+
+def _plan_symlinks(
+    data: Dict[str, Any],
+    repo_root: Path,
+    env_targets: Dict[str, str],
+) -> Tuple[List[Tuple[str, str]], Dict[str, str], List[str]]:
+    """
+    Expand symlink entries into (source, relpath) links and env seeds.
+
+    An entry whose target is a service env file seeds that file instead of
+    being linked. Returns (links, seeds by relpath, warnings).
+
+    Raises:
+        ConfigError: On malformed entries (the whole symlink step is skipped)
+    """
+    symlinks = data.get("symlinks") or []
+    if not isinstance(symlinks, list):
+        raise ConfigError("symlinks must be a list")
+
+    repo_abs = os.path.abspath(repo_root)
+    repo_real = os.path.realpath(repo_root)
+    links: List[Tuple[str, str]] = []
+    seeds: Dict[str, str] = {}
+    warnings: List[str] = []
+
+    def emit(source_path: str, target_path: str) -> None:
+        source_real = os.path.realpath(source_path)
+        target_real = os.path.realpath(target_path)
+        if not _within(target_real, repo_real):
+            warnings.append(f"target outside repo: {target_path}")
+            return
+        rel = os.path.relpath(target_real, repo_abs)
+        if not _within(source_real, repo_real):
+            if rel in env_targets:
+                warnings.append(f"env seed source outside repo: {source_path}")
+            else:
+                warnings.append(f"skipping symlink outside repo: {source_path}")
+                return
+        if rel in env_targets:
+            if rel in seeds:
+                if seeds[rel] != source_real:
+                    warnings.append(f"Multiple env seed sources for {rel}; using first")
+                return
+            seeds[rel] = source_real
+        else:
+            links.append((source_real, rel))
+
+    for entry in symlinks:
+        if isinstance(entry, str):
+            matches = glob.glob(os.path.join(repo_abs, entry))
+            if not matches:
+                warnings.append(f"symlink source not found for pattern: {entry}")
+                continue
+            for match in matches:
+                emit(match, match)
+            continue
+        if isinstance(entry, dict):
+            source = entry.get("source")
+            target = entry.get("target")
+            if not source or not target:
+                raise ConfigError("symlink mapping requires source and target")
+            source_path = source if os.path.isabs(source) else os.path.join(repo_abs, source)
+            target_path = target if os.path.isabs(target) else os.path.join(repo_abs, target)
+            if not os.path.exists(source_path):
+                warnings.append(f"symlink source not found: {source}")
+                continue
+            emit(source_path, target_path)
+            continue
+        raise ConfigError("symlink entries must be strings or mappings")
+
+    return links, seeds, warnings
+
+
+def plan_setup(data: Dict[str, Any], repo_root: Path, main_repo: Path, offset: int) -> SetupPlan:
+    """
+    Plan every link and env file for a feature worktree.
+
+    Raises:
+        ConfigError: On invalid services, ports, env paths or env_refs
+    """
+    services = parse_services(data, repo_root)
+    ports = assign_ports(services, offset)
+    repo_real = os.path.realpath(repo_root)
+    warnings: List[str] = []
+
+    # Service env file relpaths, indexed for seed lookups
+    env_relpaths: Dict[str, str] = {}
+    env_targets: Dict[str, str] = {}
+    for svc in services:
+        try:
+            target = env_target(os.path.join(repo_real, svc.path), svc.env_file)
+        except ConfigError as e:
+            raise ConfigError(f"Invalid env_file for {svc.name}: {e}")
+        rel = os.path.relpath(target, repo_real)
+        env_relpaths[svc.name] = rel
+        env_targets.setdefault(rel, svc.name)
+
+    shared_envs: List[SharedEnv] = []
+    main_real = os.path.realpath(main_repo)
+    for svc in services:
+        if not svc.shared_env:
+            continue
+        if os.path.isabs(svc.shared_env):
+            raise ConfigError(f"Invalid shared_env for {svc.name}: must be relative, not absolute: {svc.shared_env}")
+        if ".." in svc.shared_env.split(os.sep):
+            raise ConfigError(f"Invalid shared_env for {svc.name}: cannot contain '..': {svc.shared_env}")
+        main_service_dir = os.path.realpath(os.path.join(main_real, svc.path))
+        main_env_path = os.path.realpath(os.path.join(main_service_dir, svc.shared_env))
+        if not _within(main_env_path, main_service_dir):
+            raise ConfigError(f"Invalid shared_env for {svc.name}: escapes service directory: {svc.shared_env}")
+        shared_envs.append(SharedEnv(svc, main_env_path))
+
+    try:
+        links, seeds, link_warnings = _plan_symlinks(data, repo_root, env_targets)
+        warnings.extend(link_warnings)
+    except ConfigError as e:
+        warnings.append(f"Symlink setup skipped due to config errors: {e}")
+        links, seeds = [], {}
+
+    env_files = [
+        EnvFile(svc, ports[svc.name], render_env_refs(svc, ports), seeds.get(env_relpaths[svc.name]))
+        for svc in services
+    ]
+
+    post_setup = data.get("post_setup") or []
+    if not isinstance(post_setup, list):
+        warnings.append("Failed to parse post_setup commands")
+        post_setup = []
+    post_setup = [item for item in post_setup if isinstance(item, str) and item.strip()]
+
+    return SetupPlan(services, ports, shared_envs, links, env_files, post_setup, warnings)
+
+
+# =============================================================================
+# Apply
+# =============================================================================
+
+def _env_content(env: EnvFile) -> Tuple[bytes, List[str]]:
+    warnings = []
+    content = b""
+    if env.seed_source:
+        try:
+            with open(env.seed_source, "rb") as handle:
+                seed = handle.read().rstrip(b"\n")
+        except OSError:
+            warnings.append(f"Env seed source not found: {env.seed_source}")
+            seed = b""
+        if seed:
+            content += seed + b"\n\n"
+    content += f"{env.service.port_env}={env.port}\n".encode()
+    for key, value in env.refs:
+        content += f"{key}={value}\n".encode()
+    return content, warnings
+
+
+def _write_env(env: EnvFile, env_path: str) -> List[str]:
+    content, warnings = _env_content(env)
+    os.makedirs(os.path.dirname(env_path), exist_ok=True)
+    fd = os.open(env_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(content)
+    os.chmod(env_path, 0o600)
+    return warnings
+
+
+def apply_setup(plan: SetupPlan, worktree_path: Path, workers: Optional[int] = None) -> None:
+    """
+    Create shared-env links, symlinks and env files inside a new worktree.
+
+    Raises:
+        ConfigError: If an env file resolves outside its service directory
+    """
+    worktree = str(worktree_path)
+
+    for shared in plan.shared_envs:
+        svc = shared.service
+        worktree_env_path = os.path.join(os.path.realpath(os.path.join(worktree, svc.path)), svc.shared_env)
+        if not os.path.isfile(shared.main_env_path):
+            warn(f"shared_env not found in main worktree: {shared.main_env_path}")
+            warn("  Create it with your secrets, then it will be symlinked to new worktrees")
+            continue
+        if os.path.lexists(worktree_env_path):
+            warn(f"shared_env already exists in worktree, skipping: {worktree_env_path}")
+            continue
+        os.makedirs(os.path.dirname(worktree_env_path), exist_ok=True)
+        os.symlink(shared.main_env_path, worktree_env_path)
+        info(f"  Symlinked {svc.path}/{svc.shared_env} → main worktree")
+
+    for message in plan.warnings:
+        warn(message)
+
+    for source, rel in plan.links:
+        dest = os.path.join(worktree, rel)
+        if os.path.exists(dest) and not os.path.islink(dest):
+            warn(f"Skipping symlink, destination exists: {dest}")
+            continue
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        if os.path.islink(dest):
+            os.unlink(dest)
+        os.symlink(source, dest)
+
+    # Resolve env targets first (sequential, may fail), then write the
+    # independent ones in parallel; later services sharing a target skip.
+    jobs: List[Tuple[EnvFile, str]] = []
+    claimed = set()
+    for env in plan.env_files:
+        service_dir = os.path.join(worktree, env.service.path)
+        if not os.path.isdir(service_dir):
+            warn(f"Service directory not found: {service_dir}")
+            continue
+        try:
+            env_path = env_target(service_dir, env.service.env_file)
+        except ConfigError as e:
+            raise ConfigError(f"Invalid env_file for {env.service.name}: {e}")
+        if os.path.islink(env_path):
+            warn(f"Env file is a symlink, skipping: {env_path}")
+            continue
+        if os.path.exists(env_path) or env_path in claimed:
+            warn(f"Env file exists, skipping: {env_path}")
+            continue
+        claimed.add(env_path)
+        jobs.append((env, env_path))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for warnings in pool.map(lambda job: _write_env(*job), jobs):
+            for message in warnings:
+                warn(message)
+
+
+def detect_package_manager(service_dir: Path, configured: str) -> str:
+    if configured and configured not in ("auto", "none"):
+        return configured
+    for lockfile, manager in (
+        ("bun.lockb", "bun"),
+        ("pnpm-lock.yaml", "pnpm"),
+        ("yarn.lock", "yarn"),
+        ("package-lock.json", "npm"),
+    ):
+        if (service_dir / lockfile).is_file():
+            return manager
+    return "none"
+
+
+# =============================================================================
+# Git
+# =============================================================================
+
+def _git(*args: str, cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+
+
+def _main_worktree(cwd: Path) -> Optional[Path]:
+    result = _git("worktree", "list", "--porcelain", cwd=cwd)
+    for line in result.stdout.splitlines():
+        if line.startswith("worktree "):
+            return Path(line[len("worktree "):])
+    return None
+
+
+def _branch_exists(repo_root: Path, ref: str) -> bool:
+    return _git("show-ref", "--verify", "--quiet", ref, cwd=repo_root).returncode == 0
+
+
+def _repo_root() -> Optional[Path]:
+    result = _git("rev-parse", "--show-toplevel")
+    if result.returncode != 0:
+        return None
+    return Path(result.stdout.strip())
+
+
+# =============================================================================
+# Commands
+# =============================================================================
+
+def _print_next_steps(worktree_path: Path, name: str, with_services: bool) -> None:
+    print("")
+    info("✅ Worktree created successfully")
+    print("")
+    print("Next steps:")
+    print(f"  cd {worktree_path}")
+    if with_services:
+        print("  # Install dependencies for each service")
+    else:
+        print("  # Install dependencies (npm install, pip install, etc.)")
+    print("  # Start working on your feature")
+    print("")
+    print("When done:")
+    print("  # From main repo:")
+    print(f"  ./.aix/scripts/worktree-cleanup.sh {name}")
+
+
+def run_validate(repo_root: Path, feature: str, allow_missing: bool) -> int:
+    config_path = find_config(repo_root)
+    if config_path is None:
+        if allow_missing:
+            warn("No worktree config found; skipping validation")
+            return 0
+        error("Missing worktree config (.aix/config/worktree.yaml)")
+        return 1
+    try:
+        data = load_config(config_path)
+        with PortLeases.open(repo_root, exclusive=False) as leases:
+            return report_validation(data, repo_root, feature, leases)
+    except ConfigError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+
+def report_validation(data: Dict[str, Any], repo_root: Path, name: str, leases: PortLeases) -> int:
+    """Validate a parsed config against the lease table, printing like worktree-validate.sh."""
+    offset, lease_error = preview_offset(leases, name, data, repo_root)
+    errors, warnings = validate(data, find_schema(repo_root), repo_root, offset, leases, name)
+    if lease_error:
+        errors.append(lease_error)
+    lease = leases.get(name)
+    if lease is not None and not errors:
+        configured = assign_ports(parse_services(data, repo_root), offset)
+        if configured != lease["ports"]:
+            warnings.append(f"leased ports for {name} differ from config; re-run cleanup and setup to refresh")
+    for message in warnings:
+        print(f"Warning: {message}")
+    if errors:
+        for message in errors:
+            print(f"Error: {message}", file=sys.stderr)
+        return 1
+    print("Validation passed.")
+    return 0
+
+
+def run_setup(feature: str, dry_run: bool = False) -> int:
+    repo_root = _repo_root()
+    if repo_root is None:
+        error("Not inside a git repository")
+        return 1
+
+    main_repo = _main_worktree(repo_root)
+    current_dir = Path(os.getcwd())
+    if main_repo is None or os.path.realpath(current_dir) != os.path.realpath(main_repo):
+        error("Must run from main worktree")
+        print("")
+        print(f"You are in: {current_dir}")
+        print(f"Main repo:  {main_repo}")
+        return 1
+
+    name = sanitize(feature)
+    if not name:
+        error("Feature name contains no valid characters")
+        return 1
+
+    config_path = find_config(repo_root)
+    data: Dict[str, Any] = {}
+    if config_path is not None:
+        try:
+            data = load_config(config_path)
+        except ConfigError as e:
+            print(str(e), file=sys.stderr)
+            error(f"Failed to parse {config_path}")
+            return 1
+
+    worktree_root_set = data.get("worktree_root") is not None
+    worktree_root = str(data.get("worktree_root", ".."))
+    branch_prefix = str(data.get("branch_prefix", "feat/"))
+    package_manager = data.get("package_manager") or ""
+    if isinstance(package_manager, bool):
+        package_manager = "true" if package_manager else "false"
+
+    if not BRANCH_PREFIX_PATTERN.match(branch_prefix) or ".." in branch_prefix:
+        error(f"Invalid branch_prefix: {branch_prefix}")
+        return 1
+
+    worktree_root_abs = Path(os.path.realpath(os.path.join(repo_root, worktree_root)))
+    if not worktree_root_set and not _within(str(worktree_root_abs), os.path.realpath(repo_root)):
+        warn("worktree_root defaults outside repo; set worktree_root to acknowledge")
+
+    worktree_path = worktree_root_abs / name
+    branch_name = f"{branch_prefix}{name}"
+
+    plan: Optional[SetupPlan] = None
+    offset = 0
+    if config_path is not None:
+        try:
+            with PortLeases.open(repo_root, exclusive=False) as leases:
+                # Keep stdout clean for the --dry-run JSON plan
+                with contextlib.redirect_stdout(sys.stderr if dry_run else sys.stdout):
+                    print("Validating worktree config...")
+                    if report_validation(data, repo_root, name, leases) != 0:
+                        error("Worktree config validation failed")
+                        return 1
+                    info("Validation complete")
+                offset, _ = preview_offset(leases, name, data, repo_root)
+            # Plan everything up front so config errors never leave a half-made worktree
+            plan = plan_setup(data, repo_root, main_repo, offset)
+        except ConfigError as e:
+            error(str(e))
+            return 1
+
+    if dry_run:
+        print(json.dumps(_plan_dict(plan, offset, worktree_path, branch_name), indent=2))
+        return 0
+
+    if worktree_path.is_dir():
+        error(f"Directory already exists: {worktree_path}")
+        return 1
+
+    if _branch_exists(repo_root, f"refs/heads/{branch_name}"):
+        error(f"Branch already exists: {branch_name}")
+        print(f"Delete it first with: git branch -D {branch_name}")
+        return 1
+
+    if subprocess.run(["git", "fetch", "origin"], cwd=repo_root).returncode != 0:
+        return 1
+    if _branch_exists(repo_root, "refs/remotes/origin/dev"):
+        base_branch = "origin/dev"
+    elif _branch_exists(repo_root, "refs/remotes/origin/main"):
+        base_branch = "origin/main"
+    else:
+        error("Neither origin/dev nor origin/main found")
+        return 1
+
+    worktree_root_abs.mkdir(parents=True, exist_ok=True)
+
+    if plan is not None and plan.services:
+        # Lease under the exclusive lock; another setup may have taken the
+        # previewed slot since validation.
+        try:
+            with PortLeases.open(repo_root) as leases:
+                for stale in leases.reclaim_stale(keep=name):
+                    warn(f"Reclaimed port lease of removed worktree: {stale}")
+                lease = leases.allocate(name, plan.services, worktree_path, branch_name)
+            if lease["offset"] != offset:
+                plan = plan_setup(data, repo_root, main_repo, lease["offset"])
+        except ConfigError as e:
+            error(str(e))
+            return 1
+
+    print("Creating worktree...")
+    print(f"  Path: {worktree_path}")
+    print(f"  Branch: {branch_name}")
+    print(f"  Base: {base_branch}")
+    if plan is not None and plan.ports:
+        print("  Ports: " + ", ".join(f"{svc}={port}" for svc, port in plan.ports.items()))
+    print("")
+    sys.stdout.flush()
+
+    result = subprocess.run(
+        ["git", "worktree", "add", "-b", branch_name, str(worktree_path), base_branch],
+        cwd=repo_root,
+    )
+    if result.returncode != 0:
+        if plan is not None and plan.services:
+            with PortLeases.open(repo_root) as leases:
+                leases.release(name)
+        return result.returncode
+
+    if plan is not None and plan.services:
+        with PortLeases.open(repo_root) as leases:
+            leases.confirm(name)
+
+    if plan is None:
+        _print_next_steps(worktree_path, name, with_services=False)
+        return 0
+
+    try:
+        apply_setup(plan, worktree_path)
+    except ConfigError as e:
+        error(str(e))
+        return 1
+
+    if plan.post_setup:
+        print("")
+        print("Running post-setup commands...")
+        for cmd in plan.post_setup:
+            print(f"  {cmd}")
+            sys.stdout.flush()
+            code = subprocess.run(["bash", "-c", cmd], cwd=worktree_path).returncode
+            if code != 0:
+                return code
+
+    if plan.services:
+        print("")
+        print("Detected services:")
+        for svc in plan.services:
+            detected = detect_package_manager(worktree_path / svc.path, package_manager)
+            print(f"  - {svc.name} ({svc.path}): {detected}")
+
+    _print_next_steps(worktree_path, name, with_services=True)
+    return 0
+
+
+def _plan_dict(plan: Optional[SetupPlan], offset: int, worktree_path: Path, branch_name: str) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"worktree_path": str(worktree_path), "branch": branch_name}
+    if plan is None:
+        return result
+    result.update({
+        "port_offset": offset,
+        "ports": plan.ports,
+        "shared_envs": [
+            {"service": shared.service.name, "source": shared.main_env_path} for shared in plan.shared_envs
+        ],
+        "links": [{"source": source, "path": rel} for source, rel in plan.links],
+        "env_files": [
+            {
+                "service": env.service.name,
+                "path": os.path.join(env.service.path, env.service.env_file),
+                "port": env.port,
+                "refs": dict(env.refs),
+                "seed": env.seed_source,
+            }
+            for env in plan.env_files
+        ],
+        "post_setup": plan.post_setup,
+        "warnings": plan.warnings,
+    })
+    return result
+
+
+def run_ports(repo_root: Path, feature: str) -> int:
+    """Print "service<TAB>port" for a feature: its lease, else the legacy hash ports."""
+    name = sanitize(feature)
+    with PortLeases.open(repo_root, exclusive=False) as leases:
+        lease = leases.get(name)
+    if lease is not None:
+        ports = lease["ports"]
+    else:
+        config_path = find_config(repo_root)
+        if config_path is None:
+            return 0
+        try:
+            ports = assign_ports(parse_services(load_config(config_path), repo_root), port_offset(name))
+        except ConfigError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+    for service, port in ports.items():
+        print(f"{service}\t{port}")
+    return 0
+
+
+def run_release(repo_root: Path, feature: str) -> int:
+    name = sanitize(feature)
+    with PortLeases.open(repo_root) as leases:
+        lease = leases.release(name)
+    if lease is not None:
+        info(f"✓ Port lease released (offset {lease['offset']})")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AIX worktree provisioning")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    setup_parser = subparsers.add_parser(
+        "setup",
+        help="Create and provision a feature worktree",
+        description="Creates a git worktree at ../<feature-name> (default) on branch "
+                    "feat/<feature-name> from origin/dev (or origin/main). If "
+                    ".aix/config/worktree.yaml exists, ports/env/symlinks are configured.",
+    )
+    setup_parser.add_argument("feature", nargs="?")
+    setup_parser.add_argument("--dry-run", action="store_true", help="Print the plan as JSON without creating anything")
+
+    validate_parser = subparsers.add_parser("validate", help="Validate worktree config and port allocation")
+    validate_parser.add_argument("feature", nargs="?")
+    validate_parser.add_argument("--allow-missing-config", action="store_true",
+                                 help="Exit successfully when config is missing")
+
+    ports_parser = subparsers.add_parser("ports", help="Print the ports leased to a feature worktree")
+    ports_parser.add_argument("feature", nargs="?")
+
+    release_parser = subparsers.add_parser("release", help="Release a feature worktree's port lease")
+    release_parser.add_argument("feature", nargs="?")
+
+    args = parser.parse_args()
+
+    if not args.feature:
+        error("Feature name required")
+        subparsers.choices[args.command].print_help()
+        sys.exit(1)
+
+    if args.command == "setup":
+        sys.exit(run_setup(args.feature, dry_run=args.dry_run))
+
+    repo_root = _repo_root()
+    if repo_root is None:
+        error("Not inside a git repository")
+        sys.exit(1)
+    if args.command == "ports":
+        sys.exit(run_ports(repo_root, args.feature))
+    if args.command == "release":
+        sys.exit(run_release(repo_root, args.feature))
+    code = run_validate(repo_root, args.feature, args.allow_missing_config)
+    if code == 0 and find_config(repo_root) is not None:
+        info("Validation complete")
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
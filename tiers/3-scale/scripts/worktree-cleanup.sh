@@ -41,21 +41,6 @@ print_help() {
     echo "  ./.aix/scripts/worktree-cleanup.sh add-search --keep-branch"
 }
 
-get_port_offset() {
-    local name="$1"
-    local hash=2166136261
-    local i char ascii
-    for (( i=0; i<${#name}; i++ )); do
-        char="${name:$i:1}"
-        ascii=$(printf '%d' "'$char")
-        hash=$(( hash & 0x7FFFFFFF ))
-        hash=$(( (hash ^ ascii) * 16777619 ))
-        hash=$(( hash & 0x7FFFFFFF ))
-    done
-    local slot=$(( (hash & 0x7FFFFFFF) % 100 ))
-    echo $((slot * 10))
-}
-
 load_config_json() {
     local config_path="$1"
     local output_path="$2"
@@ -117,6 +102,9 @@ cleanup() {
 }
 trap cleanup EXIT
 
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+ENGINE="$SCRIPT_DIR/aix_worktree.py"
+
 if [[ "${1:-}" == "-h" || "${1:-}" == "--help" ]]; then
     print_help
     exit 0
@@ -216,61 +204,15 @@ WORKTREE_ROOT_ABS=$(resolve_path "$REPO_ROOT" "$WORKTREE_ROOT")
 WORKTREE_PATH="$WORKTREE_ROOT_ABS/$SANITIZED_NAME"
 BRANCH_NAME="${BRANCH_PREFIX}${SANITIZED_NAME}"
 
-PORT_OFFSET=$(get_port_offset "$SANITIZED_NAME")
+# Ports come from the worktree's lease (legacy worktrees fall back to the hash offset)
 PORTS=()
 
 if [ -n "$CONFIG_JSON" ]; then
-    SERVICES_TMP=$(mktemp)
-    register_temp "$SERVICES_TMP"
-    if python3 - "$CONFIG_JSON" "$REPO_ROOT" >"$SERVICES_TMP" <<'PY'
-import json
-import os
-import re
-import sys
-
-data = json.load(open(sys.argv[1], "r", encoding="utf-8"))
-repo_root = os.path.abspath(sys.argv[2])
-services = data.get("services") or []
-
-if not isinstance(services, list):
-    print("services must be a list", file=sys.stderr)
-    sys.exit(2)
-
-for svc in services:
-    if not isinstance(svc, dict):
-        print("each service must be a mapping", file=sys.stderr)
-        sys.exit(2)
-    name = svc.get("name")
-    path = svc.get("path")
-    base_port = svc.get("base_port")
-
-    if not name or not path or base_port is None:
-        print("service missing required fields (name, path, base_port)", file=sys.stderr)
-        sys.exit(2)
-    if not re.match(r"^[A-Za-z0-9_-]+$", str(name)):
-        print(f"service name contains invalid characters: {name}", file=sys.stderr)
-        sys.exit(2)
-    if os.path.isabs(path):
-        print(f"service path must be relative: {path}", file=sys.stderr)
-        sys.exit(2)
-    resolved = os.path.abspath(os.path.join(repo_root, path))
-    if os.path.commonpath([resolved, repo_root]) != repo_root:
-        print(f"service path escapes repo root: {path}", file=sys.stderr)
-        sys.exit(2)
-
-    try:
-        base_port = int(base_port)
-    except Exception:
-        print(f"base_port must be an integer for {name}", file=sys.stderr)
-        sys.exit(2)
-
-    print(f"{name}\t{base_port}")
-PY
-    then
-        while IFS=$'\t' read -r _ base_port; do
-            [ -z "$base_port" ] && continue
-            PORTS+=("$base_port")
-        done < "$SERVICES_TMP"
+    if PORT_LINES=$(python3 "$ENGINE" ports "$SANITIZED_NAME"); then
+        while IFS=$'\t' read -r _ port; do
+            [ -z "$port" ] && continue
+            PORTS+=("$port")
+        done <<< "$PORT_LINES"
     else
         warn "Failed to parse services from config"
     fi
@@ -299,8 +241,7 @@ cleanup_ports() {
 PORT_CLEANED=false
 if [ "${#PORTS[@]}" -gt 0 ]; then
     if [ "$KILL_PORTS" = true ]; then
-        for base_port in "${PORTS[@]}"; do
-            port=$((base_port + PORT_OFFSET))
+        for port in "${PORTS[@]}"; do
             if [ "$port" -lt 1 ] || [ "$port" -gt 65535 ]; then
                 warn "Skipping invalid port: $port"
                 continue
@@ -396,6 +337,10 @@ else
     warn "Keeping branch $BRANCH_NAME as requested"
 fi
 
+if ! python3 "$ENGINE" release "$SANITIZED_NAME"; then
+    warn "Failed to release port lease for $SANITIZED_NAME"
+fi
+
 git worktree prune
 
 echo ""